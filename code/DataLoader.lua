@@ -16,7 +16,106 @@ function DataLoader.getActiveVersion()
     return DataLoader.activeVersion
 end
 
+-- =============================================================================
+-- DATA BUNDLES (built by tools/python/build_data_bundle.py)
+-- =============================================================================
+-- data/<version>/bundle.json holds every JSON file of a version, minified, so a
+-- launch or hot reload decodes one file. A file is taken from the bundle only
+-- while its size and modtime match the ones recorded at build time; a file
+-- edited since then is read directly. Callers get their own copy, as they
+-- would from a fresh decode.
+
+local BUNDLE_FORMAT = 1
+
+DataLoader.bundles = {}  -- version -> { modtime = bundle file modtime, bundle = table or false }
+
+local function copyTable(value)
+    if type(value) ~= "table" then
+        return value
+    end
+    local copy = {}
+    for k, v in pairs(value) do
+        copy[k] = copyTable(v)
+    end
+    return copy
+end
+
+function DataLoader.getBundle(version)
+    local path = "data/" .. version .. "/bundle.json"
+    local info = love.filesystem.getInfo(path)
+    local modtime = info and info.modtime or nil
+    local cached = DataLoader.bundles[version]
+    if cached and cached.modtime == modtime then
+        return cached.bundle
+    end
+
+    local bundle = false
+    if info then
+        local success, data = pcall(function()
+            return json.decode(love.filesystem.read(path))
+        end)
+        if success and type(data) == "table" and data.format == BUNDLE_FORMAT then
+            bundle = data
+            print("DataLoader: Using data bundle " .. path)
+        else
+            print("  WARNING: Ignoring unreadable data bundle " .. path)
+        end
+    end
+    DataLoader.bundles[version] = { modtime = modtime, bundle = bundle }
+    return bundle
+end
+
+-- The bundle and relative path of a file whose bundled copy is still current
+local function freshBundleEntry(filepath)
+    local version, relPath = filepath:match("^data/([^/]+)/(.+)$")
+    if not version then
+        return nil
+    end
+    local bundle = DataLoader.getBundle(version)
+    local source = bundle and bundle.sources[relPath]
+    if not source or bundle.files[relPath] == nil then
+        return nil
+    end
+    local info = love.filesystem.getInfo(filepath)
+    if not info or info.size ~= source.size or info.modtime ~= source.modtime then
+        return nil
+    end
+    return bundle, relPath
+end
+
+function DataLoader.loadFromBundle(filepath)
+    local bundle, relPath = freshBundleEntry(filepath)
+    if not bundle then
+        return nil
+    end
+    return copyTable(bundle.files[relPath])
+end
+
+-- Entry of a file's list by id, via the bundle's prebuilt index when available,
+-- e.g. DataLoader.lookup("building_types.json", "buildingTypes", "farm")
+function DataLoader.lookup(relPath, collection, id)
+    local filepath = "data/" .. DataLoader.activeVersion .. "/" .. relPath
+    local bundle = freshBundleEntry(filepath)
+    local index = bundle and bundle.index[relPath] and bundle.index[relPath][collection]
+    if index then
+        local position = index[id]
+        return position and copyTable(bundle.files[relPath][collection][position + 1]) or nil
+    end
+    local data = DataLoader.loadJSON(filepath)
+    for _, entry in ipairs(data and data[collection] or {}) do
+        if entry.id == id then
+            return entry
+        end
+    end
+    return nil
+end
+
 function DataLoader.loadJSON(filepath)
+    local bundled = DataLoader.loadFromBundle(filepath)
+    if bundled ~= nil then
+        return bundled
+    end
+
     local contents, size = love.filesystem.read(filepath)
     if not contents then
         error("Failed to load file: " .. filepath)
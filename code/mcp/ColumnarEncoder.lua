@@ -0,0 +1,100 @@
+--
+-- ColumnarEncoder.lua - Column-oriented encoding for homogeneous arrays
+-- Large arrays like citizens/buildings repeat the same keys in every row.
+-- Encoding them as columns sends each key once:
+--
+--   {__columnar__ = true, length = 2, columns = {"id", "name"},
+--    values = {{1, 2}, {"Ada", "Bo"}}}
+--
+-- A missing value leaves a hole in its column; json.lua then emits that
+-- column as an object keyed by 1-based row index, which clients expand.
+--
+
+local ColumnarEncoder = {}
+
+-- Top-level response keys that are eligible for columnar encoding
+ColumnarEncoder.SECTIONS = {
+    citizens = true,
+    buildings = true,
+    characters = true,
+    events = true,
+    event_log = true,
+    events_since_last = true
+}
+
+-- Arrays shorter than this are cheaper to send as rows
+local MIN_ROWS = 2
+
+local function isRowArray(value)
+    if type(value) ~= "table" or #value < MIN_ROWS then
+        return false
+    end
+    for i = 1, #value do
+        local row = value[i]
+        -- Rows must be objects, not nested arrays
+        if type(row) ~= "table" or row[1] ~= nil then
+            return false
+        end
+    end
+    return true
+end
+
+-- Encode one array of row tables, or return it unchanged if not eligible
+function ColumnarEncoder.encode(rows)
+    if not isRowArray(rows) then
+        return rows
+    end
+
+    local seen = {}
+    local columns = {}
+    for _, row in ipairs(rows) do
+        for key in pairs(row) do
+            if not seen[key] then
+                seen[key] = true
+                table.insert(columns, key)
+            end
+        end
+    end
+    table.sort(columns, function(a, b) return tostring(a) < tostring(b) end)
+
+    local values = {}
+    for c, key in ipairs(columns) do
+        local column = {}
+        for i, row in ipairs(rows) do
+            column[i] = row[key]
+        end
+        values[c] = column
+    end
+
+    return {
+        __columnar__ = true,
+        length = #rows,
+        columns = columns,
+        values = values
+    }
+end
+
+-- Encode eligible sections of a response in place
+-- sections: true for all eligible sections, or a list of section names
+function ColumnarEncoder.encodeResponse(result, sections)
+    if type(result) ~= "table" or not sections then
+        return result
+    end
+
+    local wanted = ColumnarEncoder.SECTIONS
+    if type(sections) == "table" then
+        wanted = {}
+        for _, name in ipairs(sections) do
+            wanted[name] = true
+        end
+    end
+
+    for key, value in pairs(result) do
+        if wanted[key] then
+            result[key] = ColumnarEncoder.encode(value)
+        end
+    end
+    return result
+end
+
+return ColumnarEncoder
@@ -16,6 +16,8 @@ function EventLogger:init(bridge)
     self.logs = {}
     self.lastReadFrame = 0
     self.enabled = true
+    self.seq = 0       -- Sequence number of the newest event
+    self.dropped = 0   -- Events trimmed from the front of the log
     return self
 end
 
@@ -27,11 +29,13 @@ end
 function EventLogger:log(eventType, data)
     if not self.enabled then return end
 
+    self.seq = self.seq + 1
     local event = {
         type = eventType,
         data = data or {},
         frame = self.bridge.frameCount,
-        timestamp = love.timer.getTime()
+        timestamp = love.timer.getTime(),
+        seq = self.seq
     }
 
     table.insert(self.logs, event)
@@ -39,11 +43,12 @@ function EventLogger:log(eventType, data)
     -- Trim old logs if needed
     while #self.logs > MAX_LOG_SIZE do
         table.remove(self.logs, 1)
+        self.dropped = self.dropped + 1
     end
 
     -- Send event to connected client immediately
     if self.bridge.connected then
-        self.bridge:sendEvent(eventType, data)
+        self.bridge:sendEvent(eventType, data, event.seq)
     end
 
     -- Also print to console for debugging
@@ -64,9 +69,27 @@ function EventLogger:dataToString(data)
     return "{" .. table.concat(parts, ", ") .. "}"
 end
 
+-- Check an event against an optional list of event types
+local function matchesTypes(event, eventTypes)
+    if not eventTypes or #eventTypes == 0 then
+        return true
+    end
+    for _, et in ipairs(eventTypes) do
+        if event.type == et then
+            return true
+        end
+    end
+    return false
+end
+
 -- Get logs with filtering
+-- With after_seq, pages forward from a cursor instead (see getLogsAfter)
 function EventLogger:getLogs(params)
     params = params or {}
+    if params.after_seq ~= nil then
+        return self:getLogsAfter(params)
+    end
+
     local sinceFrame = params.since_frame or 0
     local eventTypes = params.event_types
     local limit = params.limit or 50
@@ -78,20 +101,7 @@ function EventLogger:getLogs(params)
         local event = self.logs[i]
 
         if event.frame > sinceFrame then
-            local include = true
-
-            -- Filter by event type if specified
-            if eventTypes and #eventTypes > 0 then
-                include = false
-                for _, et in ipairs(eventTypes) do
-                    if event.type == et then
-                        include = true
-                        break
-                    end
-                end
-            end
-
-            if include then
+            if matchesTypes(event, eventTypes) then
                 -- Insert at beginning to maintain chronological order
                 table.insert(filtered, 1, event)
                 if #filtered >= limit then
@@ -106,7 +116,52 @@ function EventLogger:getLogs(params)
         count = #filtered,
         from_frame = sinceFrame,
         current_frame = self.bridge.frameCount,
-        total_logged = #self.logs
+        total_logged = #self.logs,
+        latest_seq = self.seq,
+        dropped = self.dropped
+    }
+end
+
+-- Page forward, oldest first, through events with seq > after_seq.
+-- next_seq is the cursor for the following page: it advances past events
+-- skipped by the type filter, so a filtered tail never rescans them.
+-- missed counts events after the cursor that were trimmed before they
+-- could be read (the caller fell more than MAX_LOG_SIZE events behind).
+function EventLogger:getLogsAfter(params)
+    local afterSeq = params.after_seq or 0
+    local eventTypes = params.event_types
+    local limit = params.limit or 50
+
+    local oldestSeq = self.seq - #self.logs + 1
+    local missed = math.max(0, oldestSeq - afterSeq - 1)
+
+    -- Sequence numbers are contiguous, so the cursor maps straight to an index
+    local start = math.max(1, afterSeq - oldestSeq + 2)
+    local events = {}
+    local nextSeq = math.max(afterSeq, oldestSeq - 1)
+
+    for i = start, #self.logs do
+        if #events >= limit then
+            break
+        end
+        local event = self.logs[i]
+        if matchesTypes(event, eventTypes) then
+            table.insert(events, event)
+        end
+        nextSeq = event.seq
+    end
+
+    return {
+        events = events,
+        count = #events,
+        after_seq = afterSeq,
+        next_seq = nextSeq,
+        oldest_seq = oldestSeq,
+        latest_seq = self.seq,
+        has_more = nextSeq < self.seq,
+        missed = missed,
+        dropped = self.dropped,
+        current_frame = self.bridge.frameCount
     }
 end
 
@@ -126,7 +181,9 @@ function EventLogger:getRecentEvents()
 end
 
 -- Clear all logs
+-- Sequence numbers keep counting so cursors held by clients stay valid
 function EventLogger:clear()
+    self.dropped = self.dropped + #self.logs
     self.logs = {}
     self.lastReadFrame = 0
 end
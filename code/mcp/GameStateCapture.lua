@@ -12,9 +12,45 @@ function GameStateCapture:init(bridge)
     return self
 end
 
+-- Envelope keys that survive field projection
+local ENVELOPE_KEYS = {
+    frame = true,
+    timestamp = true,
+    dt = true,
+    mode = true,
+    phase = true,
+    error = true
+}
+
+-- Section names the client may use for another one, per capture mode:
+-- {alias = section key the mode actually returns}
+local SECTION_ALIASES = {
+    alpha = {characters = "citizens"},
+    consumption = {citizens = "characters"},
+    default = {citizens = "characters"}
+}
+
 -- Main capture function - returns full or partial game state
+-- params.fields (optional) is a sparse fieldset such as
+-- {"citizens[].average_satisfaction", "citizens[].is_housed", "time.day"}.
+-- Only the named sections are captured, and capture code skips fields
+-- that weren't asked for.
 function GameStateCapture:capture(params)
     params = params or {}
+    local fields = self:resolveSectionAliases(self:parseFields(params.fields))
+
+    if fields and not params.include then
+        local projected = {}
+        for k, v in pairs(params) do projected[k] = v end
+        projected.include = self:fieldSections(fields)
+        params = projected
+    end
+
+    local state = self:captureSections(params, fields)
+    return self:applyProjection(state, fields)
+end
+
+function GameStateCapture:captureSections(params, fields)
     local include = params.include or {"all"}
     local depth = params.depth or "summary"
 
@@ -31,12 +67,12 @@ function GameStateCapture:capture(params)
 
     -- Special handling for consumption prototype mode (test_cache)
     if gMode == "test_cache" and gTestCache and gTestCache.prototype then
-        return self:captureConsumptionPrototype(params, includeAll, depth)
+        return self:captureConsumptionPrototype(params, includeAll, depth, fields)
     end
 
     -- Special handling for alpha prototype mode
     if gMode == "alpha" and gAlphaPrototype then
-        return self:captureAlphaPrototype(params, includeAll, depth)
+        return self:captureAlphaPrototype(params, includeAll, depth, fields)
     end
 
     -- Screen info
@@ -104,6 +140,148 @@ function GameStateCapture:hasInclude(include, key)
     return false
 end
 
+-- ============================================================================
+-- FIELD PROJECTION
+-- Paths are dot-separated; "[]" marks an array and is optional, so
+-- "citizens[].name" and "citizens.name" are equivalent.
+-- Parsed into a tree where true means "the whole value".
+-- ============================================================================
+
+function GameStateCapture:parseFields(fields)
+    if type(fields) ~= "table" or #fields == 0 then
+        return nil
+    end
+
+    local tree = {}
+    for _, path in ipairs(fields) do
+        local parts = {}
+        for part in (tostring(path):gsub("%[%]", "")):gmatch("[^%.]+") do
+            table.insert(parts, part)
+        end
+
+        local node = tree
+        for i, part in ipairs(parts) do
+            if i == #parts then
+                node[part] = true
+            elseif node[part] == true then
+                break  -- Already selecting the whole parent
+            else
+                node[part] = node[part] or {}
+                node = node[part]
+            end
+        end
+    end
+
+    return tree
+end
+
+-- Combine two field trees
+local function mergeFields(a, b)
+    if a == nil then return b end
+    if a == true or b == true then return true end
+    for key, sub in pairs(b) do
+        a[key] = mergeFields(a[key], sub)
+    end
+    return a
+end
+
+-- Rewrite aliased section names (citizens/characters) to the key the
+-- current mode returns, so capture and projection agree on one name
+function GameStateCapture:resolveSectionAliases(fields)
+    if not fields then return nil end
+
+    local aliases = SECTION_ALIASES.default
+    if gMode == "test_cache" and gTestCache and gTestCache.prototype then
+        aliases = SECTION_ALIASES.consumption
+    elseif gMode == "alpha" and gAlphaPrototype then
+        aliases = SECTION_ALIASES.alpha
+    end
+
+    for alias, section in pairs(aliases) do
+        if fields[alias] ~= nil then
+            fields[section] = mergeFields(fields[section], fields[alias])
+            fields[alias] = nil
+        end
+    end
+    return fields
+end
+
+-- Section names to capture for a field tree
+function GameStateCapture:fieldSections(fields)
+    local sections = {}
+    for key in pairs(fields) do
+        table.insert(sections, key)
+    end
+    return sections
+end
+
+-- Sub-tree for a key: nil means "everything" (no projection)
+function GameStateCapture:subFields(fields, key)
+    if not fields then return nil end
+    local sub = fields[key]
+    if sub == true then return nil end
+    return sub
+end
+
+-- True if any of the given keys was asked for (or there is no projection)
+function GameStateCapture:wantsField(fields, ...)
+    if not fields then return true end
+    for _, key in ipairs({...}) do
+        if fields[key] ~= nil then return true end
+    end
+    return false
+end
+
+-- True if a block gated at `level` ("summary" or "full") should run.
+-- A projection runs every block, whatever the depth; wantsField then
+-- limits each block to the fields that were named
+function GameStateCapture:atDepth(depth, level, fields)
+    if fields then return true end
+    if level == "full" then return depth == "full" end
+    return depth ~= "minimal"
+end
+
+-- Trim a captured value down to the selected fields
+function GameStateCapture:project(value, fields)
+    if not fields or type(value) ~= "table" then
+        return value
+    end
+
+    -- Arrays project each element
+    if value[1] ~= nil then
+        local result = {}
+        for i, item in ipairs(value) do
+            result[i] = self:project(item, fields)
+        end
+        return result
+    end
+
+    local result = {}
+    for key, sub in pairs(fields) do
+        if value[key] ~= nil then
+            result[key] = self:project(value[key], sub ~= true and sub or nil)
+        end
+    end
+    return result
+end
+
+-- Project a full state snapshot, keeping the envelope keys
+function GameStateCapture:applyProjection(state, fields)
+    if not fields or type(state) ~= "table" then
+        return state
+    end
+
+    local result = {}
+    for key, value in pairs(state) do
+        if ENVELOPE_KEYS[key] then
+            result[key] = value
+        elseif fields[key] ~= nil then
+            result[key] = self:project(value, self:subFields(fields, key))
+        end
+    end
+    return result
+end
+
 function GameStateCapture:captureScreen()
     return {
         width = love.graphics.getWidth(),
@@ -505,7 +683,18 @@ function GameStateCapture:getControlsReference()
 end
 
 -- Query specific entities
+-- params.fields projects the result the same way as capture();
+-- error results are returned as they are
 function GameStateCapture:query(params)
+    local fields = self:parseFields(params.fields)
+    local result = self:runQuery(params, fields)
+    if type(result) == "table" and result.error ~= nil then
+        return result
+    end
+    return self:project(result, fields)
+end
+
+function GameStateCapture:runQuery(params, fields)
     local queryType = params.query_type
     local id = params.id
     local filter = params.filter
@@ -564,12 +753,12 @@ function GameStateCapture:query(params)
 
     -- Consumption prototype queries
     if gMode == "test_cache" and gTestCache and gTestCache.prototype then
-        return self:queryConsumptionPrototype(queryType, id, params)
+        return self:queryConsumptionPrototype(queryType, id, params, fields)
     end
 
     -- Alpha prototype queries
     if gMode == "alpha" and gAlphaPrototype then
-        return self:queryAlphaPrototype(queryType, id, params)
+        return self:queryAlphaPrototype(queryType, id, params, fields)
     end
 
     return {error = "Unknown query type: " .. tostring(queryType)}
@@ -580,7 +769,7 @@ end
 -- For game balance analysis and AI observation
 -- ============================================================================
 
-function GameStateCapture:captureConsumptionPrototype(params, includeAll, depth)
+function GameStateCapture:captureConsumptionPrototype(params, includeAll, depth, fields)
     local proto = gTestCache.prototype
     local include = params.include or {"all"}
 
@@ -606,7 +795,7 @@ function GameStateCapture:captureConsumptionPrototype(params, includeAll, depth)
 
     -- Characters
     if includeAll or self:hasInclude(include, "characters") then
-        state.characters = self:captureConsumptionCharacters(proto, depth)
+        state.characters = self:captureConsumptionCharacters(proto, depth, self:subFields(fields, "characters"))
     end
 
     -- Inventory
@@ -717,7 +906,7 @@ function GameStateCapture:captureConsumptionStats(proto)
     }
 end
 
-function GameStateCapture:captureConsumptionCharacters(proto, depth)
+function GameStateCapture:captureConsumptionCharacters(proto, depth, fields)
     local characters = {}
 
     for i, char in ipairs(proto.characters or {}) do
@@ -736,23 +925,32 @@ function GameStateCapture:captureConsumptionCharacters(proto, depth)
             has_emigrated = char.hasEmigrated,
 
             -- Key metrics
-            average_satisfaction = char:GetAverageSatisfaction(),
             productivity = char.productivityMultiplier or 1.0,
-            allocation_success_rate = char.allocationSuccessRate or 0,
-            critical_craving_count = char:GetCriticalCravingCount()
+            allocation_success_rate = char.allocationSuccessRate or 0
         }
 
-        if depth ~= "minimal" then
+        if self:wantsField(fields, "average_satisfaction") then
+            c.average_satisfaction = char:GetAverageSatisfaction()
+        end
+        if self:wantsField(fields, "critical_craving_count") then
+            c.critical_craving_count = char:GetCriticalCravingCount()
+        end
+
+        if self:atDepth(depth, "summary", fields) then
             -- Satisfaction by dimension (9D coarse)
-            c.satisfaction = {}
-            if char.satisfaction then
-                for dim, value in pairs(char.satisfaction) do
-                    c.satisfaction[dim] = value
+            if self:wantsField(fields, "satisfaction") then
+                c.satisfaction = {}
+                if char.satisfaction then
+                    for dim, value in pairs(char.satisfaction) do
+                        c.satisfaction[dim] = value
+                    end
                 end
             end
 
             -- Coarse cravings (9D aggregated)
-            c.coarse_cravings = char:AggregateCurrentCravingsToCoarse()
+            if self:wantsField(fields, "coarse_cravings") then
+                c.coarse_cravings = char:AggregateCurrentCravingsToCoarse()
+            end
 
             -- Fairness penalty
             c.fairness_penalty = char.fairnessPenalty or 0
@@ -760,32 +958,38 @@ function GameStateCapture:captureConsumptionCharacters(proto, depth)
             c.consecutive_low_satisfaction_cycles = char.consecutiveLowSatisfactionCycles or 0
         end
 
-        if depth == "full" then
+        if self:atDepth(depth, "full", fields) then
             -- Fine-grained cravings (49D) - stored as object with string keys for JSON compatibility
-            c.current_cravings = {}
-            if char.currentCravings then
-                for idx = 0, 48 do
-                    c.current_cravings[tostring(idx)] = char.currentCravings[idx] or 0
+            if self:wantsField(fields, "current_cravings") then
+                c.current_cravings = {}
+                if char.currentCravings then
+                    for idx = 0, 48 do
+                        c.current_cravings[tostring(idx)] = char.currentCravings[idx] or 0
+                    end
                 end
             end
 
             -- Base cravings - stored as object with string keys for JSON compatibility
-            c.base_cravings = {}
-            if char.baseCravings then
-                for idx = 0, 48 do
-                    c.base_cravings[tostring(idx)] = char.baseCravings[idx] or 0
+            if self:wantsField(fields, "base_cravings") then
+                c.base_cravings = {}
+                if char.baseCravings then
+                    for idx = 0, 48 do
+                        c.base_cravings[tostring(idx)] = char.baseCravings[idx] or 0
+                    end
                 end
             end
 
             -- Commodity multipliers (fatigue)
-            c.commodity_multipliers = {}
-            if char.commodityMultipliers then
-                for commodity, data in pairs(char.commodityMultipliers) do
-                    c.commodity_multipliers[commodity] = {
-                        multiplier = data.multiplier,
-                        consecutive_count = data.consecutiveCount,
-                        last_consumed = data.lastConsumed
-                    }
+            if self:wantsField(fields, "commodity_multipliers") then
+                c.commodity_multipliers = {}
+                if char.commodityMultipliers then
+                    for commodity, data in pairs(char.commodityMultipliers) do
+                        c.commodity_multipliers[commodity] = {
+                            multiplier = data.multiplier,
+                            consecutive_count = data.consecutiveCount,
+                            last_consumed = data.lastConsumed
+                        }
+                    end
                 end
             end
 
@@ -870,14 +1074,14 @@ function GameStateCapture:getConsumptionControlsReference()
     }
 end
 
-function GameStateCapture:queryConsumptionPrototype(queryType, id, params)
+function GameStateCapture:queryConsumptionPrototype(queryType, id, params, fields)
     local proto = gTestCache.prototype
 
     if queryType == "character" and id then
         -- Find character by ID or name
         for i, char in ipairs(proto.characters or {}) do
             if i == tonumber(id) or char.name == id then
-                return self:captureConsumptionCharacters({prototype = proto, characters = {char}}, "full")[1]
+                return self:captureConsumptionCharacters({prototype = proto, characters = {char}}, "full", fields)[1]
             end
         end
         return {error = "Character not found: " .. tostring(id)}
@@ -933,7 +1137,7 @@ end
 -- For town building simulation with production and consumption
 -- ============================================================================
 
-function GameStateCapture:captureAlphaPrototype(params, includeAll, depth)
+function GameStateCapture:captureAlphaPrototype(params, includeAll, depth, fields)
     local include = params.include or {"all"}
     local alpha = gAlphaPrototype
     local phase = alpha.mPhase
@@ -981,12 +1185,12 @@ function GameStateCapture:captureAlphaPrototype(params, includeAll, depth)
 
     -- Buildings
     if includeAll or self:hasInclude(include, "buildings") then
-        state.buildings = self:captureAlphaBuildings(world, depth)
+        state.buildings = self:captureAlphaBuildings(world, depth, self:subFields(fields, "buildings"))
     end
 
     -- Citizens/Characters
     if includeAll or self:hasInclude(include, "characters") or self:hasInclude(include, "citizens") then
-        state.citizens = self:captureAlphaCitizens(world, depth)
+        state.citizens = self:captureAlphaCitizens(world, depth, self:subFields(fields, "citizens"))
     end
 
     -- Inventory
@@ -1107,7 +1311,7 @@ function GameStateCapture:captureAlphaCamera(ui)
     }
 end
 
-function GameStateCapture:captureAlphaBuildings(world, depth)
+function GameStateCapture:captureAlphaBuildings(world, depth, fields)
     local buildings = {}
 
     for i, building in ipairs(world.buildings or {}) do
@@ -1121,28 +1325,32 @@ function GameStateCapture:captureAlphaBuildings(world, depth)
             level = building.level or 0
         }
 
-        if depth ~= "minimal" then
+        if self:atDepth(depth, "summary", fields) then
             -- Worker info
-            b.workers = {}
             b.worker_count = #(building.workers or {})
             b.max_workers = building.maxWorkers or 0
-            for _, worker in ipairs(building.workers or {}) do
-                table.insert(b.workers, {
-                    id = worker.id,
-                    name = worker.name
-                })
+            if self:wantsField(fields, "workers") then
+                b.workers = {}
+                for _, worker in ipairs(building.workers or {}) do
+                    table.insert(b.workers, {
+                        id = worker.id,
+                        name = worker.name
+                    })
+                end
             end
 
             -- Station/production info
-            b.stations = {}
-            for si, station in ipairs(building.stations or {}) do
-                table.insert(b.stations, {
-                    id = station.id or si,
-                    state = station.state or "IDLE",
-                    progress = station.progress or 0,
-                    recipe = station.recipe and station.recipe.name or nil,
-                    recipe_id = station.recipe and station.recipe.id or nil
-                })
+            if self:wantsField(fields, "stations") then
+                b.stations = {}
+                for si, station in ipairs(building.stations or {}) do
+                    table.insert(b.stations, {
+                        id = station.id or si,
+                        state = station.state or "IDLE",
+                        progress = station.progress or 0,
+                        recipe = station.recipe and station.recipe.name or nil,
+                        recipe_id = station.recipe and station.recipe.id or nil
+                    })
+                end
             end
 
             -- Housing info
@@ -1160,7 +1368,7 @@ function GameStateCapture:captureAlphaBuildings(world, depth)
             b.storage_capacity = building.storageCapacity or 0
         end
 
-        if depth == "full" then
+        if self:atDepth(depth, "full", fields) then
             -- Building type info
             if building.type then
                 b.category = building.type.category
@@ -1175,7 +1383,7 @@ function GameStateCapture:captureAlphaBuildings(world, depth)
     return buildings
 end
 
-function GameStateCapture:captureAlphaCitizens(world, depth)
+function GameStateCapture:captureAlphaCitizens(world, depth, fields)
     local citizens = {}
 
     for i, citizen in ipairs(world.citizens or {}) do
@@ -1188,13 +1396,13 @@ function GameStateCapture:captureAlphaCitizens(world, depth)
             vocation = citizen.vocation
         }
 
-        if depth ~= "minimal" then
+        if self:atDepth(depth, "summary", fields) then
             -- Position
             c.x = citizen.x
             c.y = citizen.y
 
             -- Satisfaction
-            if citizen.GetAverageSatisfaction then
+            if citizen.GetAverageSatisfaction and self:wantsField(fields, "average_satisfaction") then
                 c.average_satisfaction = citizen:GetAverageSatisfaction()
             end
 
@@ -1204,7 +1412,7 @@ function GameStateCapture:captureAlphaCitizens(world, depth)
             c.is_employed = citizen.workplace ~= nil
 
             -- Housing (get from housing system if available)
-            if world.housingSystem then
+            if world.housingSystem and self:wantsField(fields, "housing_id", "is_housed") then
                 local assignment = world.housingSystem:GetHousingAssignment(citizen.id)
                 if assignment then
                     c.housing_id = assignment.buildingId
@@ -1218,14 +1426,14 @@ function GameStateCapture:captureAlphaCitizens(world, depth)
             c.traits = citizen.traits or {}
 
             -- Status indicators
-            if citizen.GetCriticalCravingCount then
+            if citizen.GetCriticalCravingCount and self:wantsField(fields, "critical_cravings") then
                 c.critical_cravings = citizen:GetCriticalCravingCount()
             end
         end
 
-        if depth == "full" then
+        if self:atDepth(depth, "full", fields) then
             -- Detailed satisfaction breakdown
-            if citizen.satisfaction then
+            if citizen.satisfaction and self:wantsField(fields, "satisfaction_breakdown") then
                 c.satisfaction_breakdown = {}
                 for dim, value in pairs(citizen.satisfaction) do
                     c.satisfaction_breakdown[dim] = value
@@ -1233,12 +1441,12 @@ function GameStateCapture:captureAlphaCitizens(world, depth)
             end
 
             -- Cravings
-            if citizen.AggregateCurrentCravingsToCoarse then
+            if citizen.AggregateCurrentCravingsToCoarse and self:wantsField(fields, "coarse_cravings") then
                 c.coarse_cravings = citizen:AggregateCurrentCravingsToCoarse()
             end
 
             -- Wealth (from economics system)
-            if world.economicsSystem then
+            if world.economicsSystem and self:wantsField(fields, "wealth") then
                 c.wealth = world.economicsSystem:GetWealth(citizen.id) or 0
             end
 
@@ -1491,7 +1699,7 @@ function GameStateCapture:getAlphaControlsReference()
     }
 end
 
-function GameStateCapture:queryAlphaPrototype(queryType, id, params)
+function GameStateCapture:queryAlphaPrototype(queryType, id, params, fields)
     local alpha = gAlphaPrototype
     local world = alpha.mWorld
 
@@ -1503,7 +1711,7 @@ function GameStateCapture:queryAlphaPrototype(queryType, id, params)
         -- Find building by ID or index
         for i, building in ipairs(world.buildings or {}) do
             if building.id == id or i == tonumber(id) then
-                return self:captureAlphaBuildings({buildings = {building}}, "full")[1]
+                return self:captureAlphaBuildings({buildings = {building}}, "full", fields)[1]
             end
         end
         return {error = "Building not found: " .. tostring(id)}
@@ -1514,7 +1722,7 @@ function GameStateCapture:queryAlphaPrototype(queryType, id, params)
             -- Find citizen by ID or name
             for i, citizen in ipairs(world.citizens or {}) do
                 if citizen.id == id or citizen.name == id or i == tonumber(id) then
-                    return self:captureAlphaCitizens({citizens = {citizen}}, "full")[1]
+                    return self:captureAlphaCitizens({citizens = {citizen}}, "full", fields)[1]
                 end
             end
             return {error = "Citizen not found: " .. tostring(id)}
@@ -11,6 +11,7 @@ local GameStateCapture = require("code.mcp.GameStateCapture")
 local InputRelay = require("code.mcp.InputRelay")
 local ActionHandler = require("code.mcp.ActionHandler")
 local EventLogger = require("code.mcp.EventLogger")
+local ColumnarEncoder = require("code.mcp.ColumnarEncoder")
 
 local MCPBridge = {}
 MCPBridge.__index = MCPBridge
@@ -34,6 +35,13 @@ function MCPBridge:init(config)
     self.connected = false
     self.buffer = ""
 
+    -- Outbound priority lanes (see Protocol.Priority)
+    self:resetOutbox()
+
+    -- Per-message compression (negotiated in handshake)
+    self.compression = nil
+    self.compressionThreshold = Protocol.DEFAULT_COMPRESSION_THRESHOLD
+
     -- Game state
     self.frameCount = 0
     self.paused = false
@@ -105,6 +113,8 @@ function MCPBridge:update(dt)
             self.client:settimeout(0)
             self.connected = true
             self.buffer = ""
+            self.compression = nil
+            self:resetOutbox()
             print("[MCP] Client connected")
 
             -- Install input hooks when client connects
@@ -120,6 +130,9 @@ function MCPBridge:update(dt)
         self:readMessages()
     end
 
+    -- Continue writing queued responses
+    self:flushOutbox()
+
     -- Update subsystems
     self.inputRelay:update(dt)
     self.eventLogger:update(dt)
@@ -135,26 +148,66 @@ function MCPBridge:readMessages()
         self.buffer = self.buffer .. partial
     elseif err == "closed" then
         print("[MCP] Client disconnected")
-        self.connected = false
-        self.client = nil
-        self.buffer = ""
+        self:dropClient()
         return
     end
 
-    -- Process complete messages (newline-delimited JSON)
+    -- Collect complete messages (newline-delimited JSON)
+    local batch = {}
     while true do
         local newlinePos = self.buffer:find("\n")
         if not newlinePos then
             break
         end
 
-        local message = self.buffer:sub(1, newlinePos - 1)
+        local data = self.buffer:sub(1, newlinePos - 1)
         self.buffer = self.buffer:sub(newlinePos + 1)
 
-        if #message > 0 then
-            self:handleMessage(message)
+        if #data > 0 then
+            local success, message = pcall(json.decode, data)
+            if success and type(message) == "table" then
+                table.insert(batch, {
+                    message = message,
+                    priority = self:requestPriority(message),
+                    seq = #batch
+                })
+            else
+                self:sendError(nil, "Invalid JSON: " .. tostring(message))
+            end
+        end
+    end
+
+    -- Control and input first, then actions, bulk queries last
+    -- (stable within a lane)
+    table.sort(batch, function(a, b)
+        if a.priority ~= b.priority then
+            return a.priority < b.priority
         end
+        return a.seq < b.seq
+    end)
+
+    for _, entry in ipairs(batch) do
+        self:dispatchMessage(entry.message)
+    end
+end
+
+function MCPBridge:dropClient()
+    self.connected = false
+    self.client = nil
+    self.buffer = ""
+    self.compression = nil
+    self:resetOutbox()
+end
+
+function MCPBridge:requestPriority(message)
+    if message.type ~= Protocol.MessageTypes.REQUEST then
+        return Protocol.Priority.CONTROL
+    end
+    local requested = tonumber(message.priority)
+    if requested then
+        return math.max(Protocol.Priority.CONTROL, math.min(Protocol.Priority.BULK, requested))
     end
+    return Protocol.MethodPriority[message.method] or Protocol.Priority.ACTION
 end
 
 function MCPBridge:handleMessage(data)
@@ -163,7 +216,10 @@ function MCPBridge:handleMessage(data)
         self:sendError(nil, "Invalid JSON: " .. tostring(message))
         return
     end
+    self:dispatchMessage(message)
+end
 
+function MCPBridge:dispatchMessage(message)
     -- Handle handshake
     if message.type == Protocol.MessageTypes.HANDSHAKE then
         self:handleHandshake(message)
@@ -180,6 +236,8 @@ function MCPBridge:handleMessage(data)
 end
 
 function MCPBridge:handleHandshake(message)
+    self:negotiateCompression(message.compression)
+
     local response = {
         type = Protocol.MessageTypes.HANDSHAKE_ACK,
         version = Protocol.VERSION,
@@ -192,17 +250,84 @@ function MCPBridge:handleHandshake(message)
             "input_relay",
             "actions",
             "control",
-            "events"
-        }
+            "events",
+            "compression",
+            "columnar",
+            "fields",
+            "indexed_response"
+        },
+        compression = self.compression and {
+            format = self.compression,
+            threshold = self.compressionThreshold
+        } or nil
     }
-    self:send(response)
+    self:send(response, Protocol.Priority.CONTROL)
     print("[MCP] Handshake completed with client version: " .. tostring(message.version))
 end
 
+-- Pick the first client-offered format we can produce
+-- offer = {formats = {"zlib", "deflate"}, threshold = 16384}
+function MCPBridge:negotiateCompression(offer)
+    self.compression = nil
+    self.compressionThreshold = Protocol.DEFAULT_COMPRESSION_THRESHOLD
+
+    if type(offer) ~= "table" or type(offer.formats) ~= "table" then
+        return
+    end
+    if not (love.data and love.data.compress) then
+        return
+    end
+
+    for _, format in ipairs(offer.formats) do
+        for _, supported in pairs(Protocol.CompressionFormats) do
+            if format == supported then
+                self.compression = format
+                break
+            end
+        end
+        if self.compression then break end
+    end
+
+    if self.compression and tonumber(offer.threshold) then
+        self.compressionThreshold = math.max(0, tonumber(offer.threshold))
+    end
+
+    if self.compression then
+        print("[MCP] Compression enabled: " .. self.compression .. " (threshold " .. self.compressionThreshold .. " bytes)")
+    end
+end
+
+-- Wrap an encoded message in a compressed frame if it is large enough
+function MCPBridge:compressFrame(encoded)
+    if not self.compression or #encoded < self.compressionThreshold then
+        return encoded
+    end
+
+    local ok, compressed = pcall(love.data.compress, "string", self.compression, encoded)
+    if not ok then
+        print("[MCP] Compression failed, sending uncompressed: " .. tostring(compressed))
+        return encoded
+    end
+
+    -- Only worth it if the base64 payload is still smaller than the original
+    local payload = love.data.encode("string", "base64", compressed)
+    if #payload >= #encoded then
+        return encoded
+    end
+
+    return json.encode({
+        type = Protocol.MessageTypes.COMPRESSED,
+        encoding = self.compression,
+        size = #encoded,
+        payload = payload
+    })
+end
+
 function MCPBridge:handleRequest(message)
     local method = message.method
     local params = message.params or {}
     local id = message.id
+    local priority = self:requestPriority(message)
 
     -- Method handlers
     local handlers = {
@@ -235,13 +360,21 @@ function MCPBridge:handleRequest(message)
     if handler then
         local success, result = pcall(handler)
         if success then
-            self:sendResponse(id, true, result)
+            -- Opt-in column encoding for large homogeneous arrays
+            if params.columnar then
+                result = ColumnarEncoder.encodeResponse(result, params.columnar)
+            end
+            if params.lazy and type(result) == "table" then
+                self:sendIndexedResponse(id, result, priority)
+            else
+                self:sendResponse(id, true, result, priority)
+            end
         else
-            self:sendError(id, "Handler error: " .. tostring(result))
+            self:sendError(id, "Handler error: " .. tostring(result), priority)
             print("[MCP] Handler error for " .. method .. ": " .. tostring(result))
         end
     else
-        self:sendError(id, "Unknown method: " .. tostring(method))
+        self:sendError(id, "Unknown method: " .. tostring(method), priority)
     end
 end
 
@@ -284,21 +417,96 @@ function MCPBridge:handleControl(params)
     return {error = "Unknown command: " .. tostring(command)}
 end
 
-function MCPBridge:send(data)
+function MCPBridge:send(data, priority)
     if self.connected and self.client then
-        local encoded = json.encode(data) .. "\n"
-        local success, err = self.client:send(encoded)
-        if not success then
-            print("[MCP] Send error: " .. tostring(err))
+        self:queueMessage(self:compressFrame(json.encode(data)) .. "\n", priority)
+    end
+end
+
+-- ============================================================================
+-- OUTBOUND PRIORITY LANES
+-- Every message is queued on a lane and written by flushOutbox(). Frames are
+-- written whole (partial non-blocking sends resume on the next update), and
+-- messages above Protocol.CHUNK_SIZE go out as chunk frames, so a control
+-- response waits for at most one chunk of a large get_state.
+-- ============================================================================
+
+function MCPBridge:resetOutbox()
+    self.outbox = {}
+    for _, lane in pairs(Protocol.Priority) do
+        self.outbox[lane] = {}
+    end
+    self.inflight = nil
+    self.nextStreamId = 1
+end
+
+function MCPBridge:queueMessage(text, priority)
+    local lane = self.outbox[priority or Protocol.Priority.ACTION] or self.outbox[Protocol.Priority.ACTION]
+    table.insert(lane, {text = text, offset = 0, stream = nil})
+    self:flushOutbox()
+end
+
+-- Next frame to write: the head of the highest-priority non-empty lane
+function MCPBridge:nextFrame()
+    for lane = Protocol.Priority.CONTROL, Protocol.Priority.BULK do
+        local queue = self.outbox[lane]
+        local entry = queue[1]
+        if entry then
+            if entry.offset == 0 and #entry.text <= Protocol.CHUNK_SIZE then
+                table.remove(queue, 1)
+                return {data = entry.text, sent = 0}
+            end
+
+            if not entry.stream then
+                entry.stream = self.nextStreamId
+                self.nextStreamId = self.nextStreamId + 1
+            end
+
+            local piece = entry.text:sub(entry.offset + 1, entry.offset + Protocol.CHUNK_SIZE)
+            entry.offset = entry.offset + #piece
+            local final = entry.offset >= #entry.text
+            if final then
+                table.remove(queue, 1)
+            end
+
+            local header = json.encode({
+                type = Protocol.MessageTypes.CHUNK,
+                stream = entry.stream,
+                length = #piece,
+                final = final
+            })
+            return {data = header .. "\n" .. piece .. "\n", sent = 0}
+        end
+    end
+    return nil
+end
+
+function MCPBridge:flushOutbox()
+    while self.connected and self.client do
+        if not self.inflight then
+            self.inflight = self:nextFrame()
+            if not self.inflight then return end
+        end
+
+        local frame = self.inflight
+        local last, err, partial = self.client:send(frame.data, frame.sent + 1)
+        if last then
+            self.inflight = nil
+        else
+            frame.sent = partial or frame.sent
             if err == "closed" then
-                self.connected = false
-                self.client = nil
+                print("[MCP] Send error: closed")
+                self:dropClient()
+            elseif err ~= "timeout" then
+                print("[MCP] Send error: " .. tostring(err))
             end
+            -- Socket buffer full; resume on the next update
+            return
         end
     end
 end
 
-function MCPBridge:sendResponse(id, success, data)
+function MCPBridge:sendResponse(id, success, data, priority)
     self:send({
         id = id,
         type = Protocol.MessageTypes.RESPONSE,
@@ -306,10 +514,81 @@ function MCPBridge:sendResponse(id, success, data)
         data = data,
         frame = self.frameCount,
         timestamp = socket.gettime()
+    }, priority)
+end
+
+-- Encode data as a JSON object while recording where each section (and each
+-- row of row-array sections) starts, so clients can decode them lazily
+function MCPBridge:encodeIndexed(data)
+    local pieces = {}
+    local length = 0
+    local index = {}
+
+    local function emit(text)
+        pieces[#pieces + 1] = text
+        length = length + #text
+    end
+
+    emit("{")
+    local first = true
+    for key, value in pairs(data) do
+        if not first then emit(",") end
+        first = false
+        emit(json.encode(tostring(key)) .. ":")
+
+        local start = length
+        if ColumnarEncoder.SECTIONS[key] and type(value) == "table" and value[1] ~= nil then
+            local rows = {}
+            emit("[")
+            for i, row in ipairs(value) do
+                if i > 1 then emit(",") end
+                local encoded = json.encode(row)
+                rows[i] = {length, #encoded}
+                emit(encoded)
+            end
+            emit("]")
+            index[key] = {offset = start, length = length - start, rows = rows}
+        else
+            emit(json.encode(value))
+            index[key] = {offset = start, length = length - start}
+        end
+    end
+    emit("}")
+
+    return table.concat(pieces), index
+end
+
+-- Indexed responses bypass compression: they exist so the client can keep
+-- the raw bytes and decode only what it reads. A handler result carrying
+-- an error goes out as a failed response instead of an indexed payload.
+function MCPBridge:sendIndexedResponse(id, data, priority)
+    if not (self.connected and self.client) then return end
+
+    if data.error ~= nil then
+        self:sendError(id, tostring(data.error), priority)
+        return
+    end
+
+    local ok, encoded, index = pcall(self.encodeIndexed, self, data)
+    if not ok then
+        self:sendError(id, "Indexed encoding failed: " .. tostring(encoded), priority)
+        return
+    end
+
+    local header = json.encode({
+        id = id,
+        type = Protocol.MessageTypes.INDEXED_RESPONSE,
+        success = true,
+        length = #encoded,
+        index = index,
+        frame = self.frameCount,
+        timestamp = socket.gettime()
     })
+
+    self:queueMessage(header .. "\n" .. encoded .. "\n", priority)
 end
 
-function MCPBridge:sendError(id, message)
+function MCPBridge:sendError(id, message, priority)
     self:send({
         id = id,
         type = Protocol.MessageTypes.RESPONSE,
@@ -317,17 +596,18 @@ function MCPBridge:sendError(id, message)
         error = message,
         frame = self.frameCount,
         timestamp = socket.gettime()
-    })
+    }, priority)
 end
 
-function MCPBridge:sendEvent(eventType, data)
+function MCPBridge:sendEvent(eventType, data, seq)
     self:send({
         type = Protocol.MessageTypes.EVENT,
         event = eventType,
         data = data,
+        seq = seq,
         frame = self.frameCount,
         timestamp = socket.gettime()
-    })
+    }, Protocol.Priority.ACTION)
 end
 
 -- Getters for game control
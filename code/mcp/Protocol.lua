@@ -13,9 +13,31 @@ Protocol.MessageTypes = {
     HANDSHAKE_ACK = "handshake_ack",
     REQUEST = "request",
     RESPONSE = "response",
-    EVENT = "event"
+    EVENT = "event",
+    COMPRESSED = "compressed",
+    INDEXED_RESPONSE = "indexed_response",
+    CHUNK = "chunk"
 }
 
+-- Indexed responses (requested with params.lazy) are sent as two lines:
+--   {"type": "indexed_response", "id": ..., "length": N, "index": {...}}
+--   <N bytes of data JSON>
+-- index maps each top-level data key to {offset, length} (0-based byte
+-- offsets into the data line); row arrays also carry rows = {{offset, length}, ...}
+-- so clients can decode sections and individual rows on demand.
+
+-- Per-message compression (negotiated during handshake)
+-- Formats are LÖVE's love.data compressed formats; payloads are base64 so
+-- compressed frames stay newline-delimited JSON like every other message.
+Protocol.CompressionFormats = {
+    ZLIB = "zlib",
+    DEFLATE = "deflate",
+    GZIP = "gzip"
+}
+
+-- Messages smaller than this (in bytes of encoded JSON) are sent uncompressed
+Protocol.DEFAULT_COMPRESSION_THRESHOLD = 16384
+
 -- Available methods
 Protocol.Methods = {
     GET_STATE = "get_state",
@@ -26,6 +48,32 @@ Protocol.Methods = {
     GET_LOGS = "get_logs"
 }
 
+-- Priority lanes (lower number = sent first)
+-- Interactive control and input must stay responsive while large
+-- observation responses are still being written.
+Protocol.Priority = {
+    CONTROL = 1,
+    ACTION = 2,
+    BULK = 3
+}
+
+-- Default lane per method; requests may override with a "priority" field
+Protocol.MethodPriority = {
+    control = Protocol.Priority.CONTROL,
+    send_input = Protocol.Priority.CONTROL,
+    send_action = Protocol.Priority.ACTION,
+    get_state = Protocol.Priority.BULK,
+    query = Protocol.Priority.BULK,
+    get_logs = Protocol.Priority.BULK
+}
+
+-- Messages larger than this are split into chunk frames so higher-priority
+-- messages can be sent between chunks:
+--   {"type": "chunk", "stream": 7, "length": N, "final": false}
+--   <N bytes of the original message>
+-- Concatenating a stream's chunks yields the original message bytes.
+Protocol.CHUNK_SIZE = 65536
+
 -- Event types for logging (extend as game grows)
 Protocol.EventTypes = {
     -- Building events
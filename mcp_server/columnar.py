@@ -0,0 +1,132 @@
+"""
+Column-oriented tables for columnar game responses.
+
+When a request sets ``columnar``, the game encodes large homogeneous
+arrays (citizens, buildings, characters, events) as:
+
+    {"__columnar__": true, "length": N, "columns": ["id", ...], "values": [[...], ...]}
+
+Each key is sent once and values travel as parallel arrays. A column with
+missing values arrives as an object keyed by 1-based row index.
+"""
+
+from typing import Any, Iterator, Optional
+
+
+def _expand_column(raw: Any, length: int) -> list:
+    """Normalize a wire column to a list of exactly `length` values."""
+    if isinstance(raw, dict):
+        column = [None] * length
+        for key, value in raw.items():
+            index = int(key) - 1
+            if 0 <= index < length:
+                column[index] = value
+        return column
+    column = list(raw)
+    if len(column) < length:
+        column.extend([None] * (length - len(column)))
+    return column
+
+
+class ColumnTable:
+    """Lightweight column-oriented table with row access.
+
+    Columns are plain lists; ``to_numpy`` converts a column once and
+    caches the array, so repeated numeric analysis doesn't re-convert.
+    """
+
+    __slots__ = ("columns", "_data", "_length", "_arrays")
+
+    def __init__(self, columns: list[str], data: dict[str, list], length: int):
+        self.columns = columns
+        self._data = data
+        self._length = length
+        self._arrays: dict[tuple, Any] = {}
+
+    @classmethod
+    def from_wire(cls, encoded: dict) -> "ColumnTable":
+        """Build a table from a ``__columnar__`` response object."""
+        length = encoded.get("length", 0)
+        columns = list(encoded.get("columns", []))
+        values = encoded.get("values", [])
+        data = {
+            name: _expand_column(values[i] if i < len(values) else [], length)
+            for i, name in enumerate(columns)
+        }
+        return cls(columns, data, length)
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> "ColumnTable":
+        """Build a table from row dicts (the non-columnar response shape)."""
+        columns: list[str] = []
+        seen = set()
+        for row in rows:
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+        data = {name: [row.get(name) for row in rows] for name in columns}
+        return cls(columns, data, len(rows))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key):
+        """table[i] returns row i as a dict; table["name"] returns a column."""
+        if isinstance(key, str):
+            return self._data[key]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError(key)
+        return {name: self._data[name][key] for name in self.columns}
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.rows()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._data
+
+    def __repr__(self) -> str:
+        return f"ColumnTable(rows={self._length}, columns={self.columns})"
+
+    def column(self, name: str, default: Any = None) -> list:
+        """Get a column by name, or a column of `default` if it's absent."""
+        if name in self._data:
+            return self._data[name]
+        return [default] * self._length
+
+    def rows(self) -> Iterator[dict]:
+        """Iterate rows as dicts."""
+        for i in range(self._length):
+            yield {name: self._data[name][i] for name in self.columns}
+
+    def to_dicts(self) -> list[dict]:
+        """Materialize all rows (the shape a non-columnar response has)."""
+        return list(self.rows())
+
+    def to_numpy(self, name: str, dtype: Optional[Any] = None):
+        """Convert a column to a NumPy array (requires numpy).
+
+        Missing values become NaN for float dtypes.
+        """
+        import numpy as np
+
+        cache_key = (name, dtype)
+        if cache_key not in self._arrays:
+            column = self.column(name)
+            if dtype is not None and np.issubdtype(np.dtype(dtype), np.floating):
+                column = [np.nan if v is None else v for v in column]
+            self._arrays[cache_key] = np.asarray(column, dtype=dtype)
+        return self._arrays[cache_key]
+
+
+def decode_columnar(value: Any) -> Any:
+    """Replace every ``__columnar__`` object in a response with a ColumnTable."""
+    if isinstance(value, dict):
+        if value.get("__columnar__"):
+            return ColumnTable.from_wire(value)
+        return {k: decode_columnar(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_columnar(v) for v in value]
+    return value
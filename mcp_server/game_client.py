@@ -3,26 +3,120 @@ Game client for connecting to Cravetown TCP server.
 
 This module provides an async TCP client that communicates with
 the Lua game server using JSON-delimited messages.
+
+Large messages can be sent as compressed frames when both sides agree
+on a format during the handshake:
+
+    {"type": "compressed", "encoding": "zlib", "size": 123456, "payload": "<base64>"}
+
+The payload decompresses to the original JSON message.
 """
 
 import asyncio
+import base64
 import json
 import uuid
+import zlib
 from typing import Any, Optional, Callable
 
+from .columnar import decode_columnar
+from .log_tailer import LogTailer
+from .models import GameState
+
+# zlib wbits for each format the game can produce via love.data.compress
+COMPRESSION_WBITS = {
+    "zlib": zlib.MAX_WBITS,
+    "deflate": -zlib.MAX_WBITS,
+    "gzip": zlib.MAX_WBITS | 16,
+}
+
+DEFAULT_COMPRESSION_THRESHOLD = 16384
+
+# Priority lanes (match Protocol.Priority in code/mcp/Protocol.lua).
+# The game answers control/input first and sends large responses in
+# chunks, so a pause never waits behind a multi-megabyte get_state.
+PRIORITY_CONTROL = 1
+PRIORITY_ACTION = 2
+PRIORITY_BULK = 3
+
+METHOD_PRIORITY = {
+    "control": PRIORITY_CONTROL,
+    "send_input": PRIORITY_CONTROL,
+    "send_action": PRIORITY_ACTION,
+    "get_state": PRIORITY_BULK,
+    "query": PRIORITY_BULK,
+    "get_logs": PRIORITY_BULK,
+}
+
+# Bulk responses can be several megabytes, so they get more time
+PRIORITY_TIMEOUT = {
+    PRIORITY_CONTROL: 10.0,
+    PRIORITY_ACTION: 10.0,
+    PRIORITY_BULK: 30.0,
+}
+
+# Base64 characters decoded per step (multiple of 4 so chunks decode cleanly)
+_DECOMPRESS_CHUNK = 64 * 1024
+
+
+def decompress_frame(frame: dict) -> dict:
+    """Decode a compressed frame back into the message it wraps.
+
+    The base64 payload is decoded and inflated in chunks, so the full
+    compressed bytes never have to exist alongside the inflated text.
+    """
+    encoding = frame.get("encoding")
+    if encoding not in COMPRESSION_WBITS:
+        raise ValueError(f"Unsupported frame encoding: {encoding}")
+
+    payload = frame.get("payload", "")
+    inflater = zlib.decompressobj(COMPRESSION_WBITS[encoding])
+    parts = []
+    for start in range(0, len(payload), _DECOMPRESS_CHUNK):
+        chunk = base64.b64decode(payload[start:start + _DECOMPRESS_CHUNK])
+        parts.append(inflater.decompress(chunk))
+    parts.append(inflater.flush())
+
+    raw = b"".join(parts)
+    expected = frame.get("size")
+    if expected is not None and len(raw) != expected:
+        raise ValueError(f"Decompressed size mismatch: expected {expected}, got {len(raw)}")
+    return json.loads(raw)
+
 
 class GameClient:
     """Async TCP client for communicating with the Cravetown game."""
 
-    def __init__(self, host: str = "localhost", port: int = 9999):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 9999,
+        compression: Optional[str] = "zlib",
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        max_bulk_in_flight: int = 2,
+    ):
+        if compression is not None and compression not in COMPRESSION_WBITS:
+            raise ValueError(f"Unsupported compression: {compression}")
         self.host = host
         self.port = port
+        # Requested compression format (None disables it) and the format
+        # the game actually agreed to in its handshake_ack
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.negotiated_compression: Optional[str] = None
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         self.connected = False
         self.pending_requests: dict[str, asyncio.Future] = {}
         self.event_handlers: list[Callable] = []
+        # Active LogTailers, fed every pushed event
+        self._tailers: list[LogTailer] = []
         self._read_task: Optional[asyncio.Task] = None
+        # Caps concurrent bulk queries so a burst of observations can't
+        # crowd out the game's request batch; control and actions bypass it
+        self._bulk_slots = asyncio.Semaphore(max_bulk_in_flight)
+        # Partially received chunked messages, by stream id
+        self._streams: dict[int, bytearray] = {}
 
     async def connect(self) -> bool:
         """Connect to the game server."""
@@ -52,6 +146,15 @@ class GameClient:
             "version": "1.0",
             "client": "mcp-server"
         }
+        if self.compression:
+            # Offer the preferred format first, then the rest as fallbacks
+            formats = [self.compression] + [
+                f for f in COMPRESSION_WBITS if f != self.compression
+            ]
+            handshake["compression"] = {
+                "formats": formats,
+                "threshold": self.compression_threshold
+            }
         await self._send(handshake)
         # Handshake response handled in read loop
 
@@ -64,27 +167,20 @@ class GameClient:
 
     async def _read_loop(self):
         """Background task to read responses from server."""
-        buffer = ""
+        buffer = bytearray()
+        # Header of a length-prefixed frame whose body hasn't fully arrived
+        state: dict = {"header": None}
         try:
             while self.connected and self.reader:
                 try:
                     data = await asyncio.wait_for(
-                        self.reader.read(4096),
+                        self.reader.read(65536),
                         timeout=0.1
                     )
                     if not data:
                         break
-                    buffer += data.decode()
-
-                    # Process complete messages
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        if line.strip():
-                            try:
-                                message = json.loads(line)
-                                await self._handle_message(message)
-                            except json.JSONDecodeError as e:
-                                print(f"[GameClient] JSON decode error: {e}")
+                    buffer += data
+                    await self._consume(buffer, state)
 
                 except asyncio.TimeoutError:
                     continue
@@ -96,28 +192,79 @@ class GameClient:
             print(f"[GameClient] Read loop error: {e}")
         finally:
             self.connected = False
+            self._streams.clear()
             print("[GameClient] Disconnected")
 
+    async def _consume(self, buffer: bytearray, state: dict):
+        """Process every complete frame in buffer, leaving any partial one.
+
+        Most frames are one JSON line. Indexed responses and chunks are a
+        header line followed by a length-prefixed body; the header waits in
+        state["header"] until the body has arrived.
+        """
+        while True:
+            header = state["header"]
+            if header is not None:
+                length = header.get("length", 0)
+                if len(buffer) < length + 1:
+                    return
+                payload = bytes(buffer[:length])
+                del buffer[:length + 1]
+                state["header"] = None
+                if header.get("type") == "chunk":
+                    await self._handle_chunk(header, payload)
+                else:
+                    await self._handle_indexed(header, payload)
+                continue
+
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                return
+            line = bytes(buffer[:newline])
+            del buffer[:newline + 1]
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+                if message.get("type") == "compressed":
+                    message = decompress_frame(message)
+                if message.get("type") in ("indexed_response", "chunk"):
+                    state["header"] = message
+                    continue
+                await self._handle_message(message)
+            except (json.JSONDecodeError, ValueError, zlib.error) as e:
+                print(f"[GameClient] Message decode error: {e}")
+
+    async def _handle_chunk(self, header: dict, payload: bytes):
+        """Reassemble a chunked message and process it like wire data."""
+        stream = header.get("stream")
+        self._streams.setdefault(stream, bytearray()).extend(payload)
+        if header.get("final"):
+            message = self._streams.pop(stream)
+            await self._consume(message, {"header": None})
+
     async def _handle_message(self, message: dict):
         """Handle incoming message from server."""
         msg_type = message.get("type")
 
         if msg_type == "handshake_ack":
-            print(f"[GameClient] Handshake complete - game: {message.get('game')}, mode: {message.get('mode')}")
+            negotiated = message.get("compression") or {}
+            self.negotiated_compression = negotiated.get("format")
+            print(f"[GameClient] Handshake complete - game: {message.get('game')}, mode: {message.get('mode')}, "
+                  f"compression: {self.negotiated_compression or 'none'}")
             return
 
         if msg_type == "response":
-            request_id = message.get("id")
-            if request_id and request_id in self.pending_requests:
-                future = self.pending_requests.pop(request_id)
-                if not future.done():
-                    if message.get("success"):
-                        future.set_result(message.get("data"))
-                    else:
-                        future.set_result({"error": message.get("error")})
+            if message.get("success"):
+                self._resolve(message.get("id"), message.get("data"))
+            else:
+                self._resolve(message.get("id"), {"error": message.get("error")})
             return
 
         if msg_type == "event":
+            for tailer in list(self._tailers):
+                tailer._push(message)
+
             # Notify event handlers
             for handler in self.event_handlers:
                 try:
@@ -125,17 +272,55 @@ class GameClient:
                 except Exception as e:
                     print(f"[GameClient] Event handler error: {e}")
 
+    async def _handle_indexed(self, header: dict, payload: bytes):
+        """Resolve a lazy request with a view over the retained bytes."""
+        state = GameState(
+            payload,
+            header.get("index") or {},
+            frame=header.get("frame"),
+            timestamp=header.get("timestamp")
+        )
+        self._resolve(header.get("id"), state)
+
+    def _resolve(self, request_id: Optional[str], result: Any):
+        """Complete the pending request with this id, if any."""
+        if request_id and request_id in self.pending_requests:
+            future = self.pending_requests.pop(request_id)
+            if not future.done():
+                future.set_result(result)
+
     def add_event_handler(self, handler: Callable):
         """Add a handler for game events."""
         self.event_handlers.append(handler)
 
-    async def request(self, method: str, params: dict = None) -> Any:
-        """Send a request and wait for response."""
+    async def request(
+        self,
+        method: str,
+        params: dict = None,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Send a request and wait for response.
+
+        priority defaults to the method's lane (PRIORITY_CONTROL for control
+        and input, PRIORITY_ACTION for actions, PRIORITY_BULK for queries).
+        """
         if not self.connected:
             success = await self.connect()
             if not success:
                 return {"error": "Not connected to game"}
 
+        if priority is None:
+            priority = METHOD_PRIORITY.get(method, PRIORITY_ACTION)
+        if timeout is None:
+            timeout = PRIORITY_TIMEOUT.get(priority, 10.0)
+
+        if priority >= PRIORITY_BULK:
+            async with self._bulk_slots:
+                return await self._request(method, params, priority, timeout)
+        return await self._request(method, params, priority, timeout)
+
+    async def _request(self, method: str, params: Optional[dict], priority: int, timeout: float) -> Any:
         request_id = str(uuid.uuid4())
         future: asyncio.Future = asyncio.get_event_loop().create_future()
         self.pending_requests[request_id] = future
@@ -144,13 +329,14 @@ class GameClient:
             "id": request_id,
             "type": "request",
             "method": method,
+            "priority": priority,
             "params": params or {}
         }
 
         await self._send(request)
 
         try:
-            result = await asyncio.wait_for(future, timeout=10.0)
+            result = await asyncio.wait_for(future, timeout=timeout)
             return result
         except asyncio.TimeoutError:
             self.pending_requests.pop(request_id, None)
@@ -158,12 +344,41 @@ class GameClient:
 
     # Convenience methods for common operations
 
-    async def get_state(self, include: list = None, depth: str = "summary") -> dict:
-        """Get current game state."""
+    async def get_state(
+        self,
+        include: list = None,
+        depth: str = "summary",
+        fields: list = None,
+        columnar: bool = False,
+        lazy: bool = False
+    ) -> Any:
+        """Get current game state.
+
+        fields is an optional sparse fieldset, e.g.
+        ["citizens[].average_satisfaction", "citizens[].is_housed"]. Only
+        those fields are captured and returned; when include is omitted the
+        sections are taken from the field paths.
+
+        With columnar=True, arrays such as citizens and buildings come back
+        as ColumnTable objects instead of lists of dicts.
+
+        With lazy=True the result is a GameState view that keeps the raw
+        response bytes and decodes sections and rows only when read; a
+        failed capture still comes back as {"error": ...}.
+        """
         params = {"depth": depth}
         if include:
             params["include"] = include
-        return await self.request("get_state", params)
+        if fields:
+            params["fields"] = fields
+        if lazy:
+            params["lazy"] = True
+            result = await self.request("get_state", params)
+            if isinstance(result, dict) and "error" not in result:
+                # Older games ignore "lazy" and send a plain response
+                return GameState.from_dict(result)
+            return result
+        return await self._columnar_request("get_state", params, columnar)
 
     async def send_key(self, key: str, action: str = "tap", duration: float = 0.1) -> dict:
         """Send a keyboard input."""
@@ -195,20 +410,60 @@ class GameClient:
             params["value"] = value
         return await self.request("control", params)
 
-    async def query(self, query_type: str, **params) -> dict:
-        """Query game data."""
-        return await self.request("query", {"query_type": query_type, **params})
-
-    async def get_logs(self, since_frame: int = 0, event_types: list = None, limit: int = 50) -> dict:
-        """Get game event logs."""
+    async def query(self, query_type: str, fields: list = None, columnar: bool = False, **params) -> dict:
+        """Query game data, optionally projected to the given field paths."""
+        if fields:
+            params["fields"] = fields
+        return await self._columnar_request("query", {"query_type": query_type, **params}, columnar)
+
+    async def get_logs(
+        self,
+        since_frame: int = 0,
+        event_types: list = None,
+        limit: int = 50,
+        columnar: bool = False,
+        after_seq: Optional[int] = None
+    ) -> dict:
+        """Get game event logs.
+
+        By default returns the newest `limit` events after since_frame. With
+        after_seq, returns the oldest `limit` events whose seq is greater,
+        plus next_seq/has_more for paging and missed for trimmed events.
+        """
         params = {"since_frame": since_frame, "limit": limit}
         if event_types:
             params["event_types"] = event_types
-        return await self.request("get_logs", params)
+        if after_seq is not None:
+            params["after_seq"] = after_seq
+        return await self._columnar_request("get_logs", params, columnar)
+
+    def tail_logs(
+        self,
+        event_types: list = None,
+        after_seq: Optional[int] = 0,
+        page_size: int = 200,
+        idle_poll: float = 5.0
+    ) -> LogTailer:
+        """Follow the event log as an async iterator of LogBatch.
+
+        Each event is delivered once, in order. Pushed events are used
+        when contiguous; otherwise the tailer pages with get_logs until
+        caught up. See log_tailer.py.
+        """
+        return LogTailer(self, event_types, after_seq, page_size, idle_poll)
+
+    async def _columnar_request(self, method: str, params: dict, columnar: bool) -> Any:
+        """Send a request, asking for and decoding columnar arrays if enabled."""
+        if not columnar:
+            return await self.request(method, params)
+        params["columnar"] = True
+        return decode_columnar(await self.request(method, params))
 
     async def close(self):
         """Close the connection."""
         self.connected = False
+        for tailer in list(self._tailers):
+            tailer.close()
         if self._read_task:
             self._read_task.cancel()
             try:
@@ -0,0 +1,209 @@
+"""
+Incremental, gap-aware tailing of the game's event log.
+
+Every event the game logs carries a sequence number (``seq``) that only
+ever increases. ``LogTailer`` keeps a cursor on that number and delivers
+each event exactly once:
+
+- events pushed over the connection are used directly whenever they
+  continue the cursor without a hole, so a live tail costs no requests;
+- otherwise it pages forward with ``get_logs(after_seq=...)`` until it has
+  caught up, oldest first, so bursts larger than a page are never cut;
+- events the game trimmed before they could be read are reported as a gap
+  (``LogBatch.missed``) instead of disappearing silently.
+
+Usage::
+
+    async with client.tail_logs(event_types=["alpha_citizen_added"]) as tail:
+        async for batch in tail:
+            if batch.missed:
+                print(f"lost {batch.missed} events")
+            for event in batch.events:
+                ...
+"""
+
+import asyncio
+from typing import Optional
+
+
+class LogBatch:
+    """Events delivered by one step of a LogTailer."""
+
+    __slots__ = ("events", "after_seq", "last_seq", "missed", "reset")
+
+    def __init__(self, events: list, after_seq: int, last_seq: int,
+                 missed: int = 0, reset: bool = False):
+        self.events = events
+        # Cursor before and after this batch
+        self.after_seq = after_seq
+        self.last_seq = last_seq
+        # Events between the cursor and the oldest retained one that the
+        # game trimmed (or cleared) before they were read
+        self.missed = missed
+        # True when the game's sequence restarted (game relaunched), so the
+        # cursor was rewound to the beginning
+        self.reset = reset
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __repr__(self) -> str:
+        return (f"LogBatch(events={len(self.events)}, seq={self.after_seq}..{self.last_seq}, "
+                f"missed={self.missed}, reset={self.reset})")
+
+
+class LogTailer:
+    """Async iterator over new game events, in order and without duplicates.
+
+    after_seq=None starts at the newest event (only what happens from now
+    on); after_seq=0 starts at the oldest event the game still holds.
+    idle_poll is how long to wait for a pushed event before checking
+    with the game anyway.
+    """
+
+    def __init__(
+        self,
+        client,
+        event_types: Optional[list] = None,
+        after_seq: Optional[int] = 0,
+        page_size: int = 200,
+        idle_poll: float = 5.0,
+    ):
+        self.client = client
+        self.event_types = set(event_types) if event_types else None
+        self.cursor = after_seq
+        self.page_size = page_size
+        self.idle_poll = idle_poll
+        # Running totals across the whole tail
+        self.missed = 0
+        self.requests = 0
+        self._pushed: dict[int, dict] = {}
+        self._wakeup = asyncio.Event()
+        self._needs_fetch = True
+        self._closed = False
+        client._tailers.append(self)
+
+    async def __aenter__(self) -> "LogTailer":
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stop receiving pushed events and end iteration."""
+        if self._closed:
+            return
+        self._closed = True
+        if self in self.client._tailers:
+            self.client._tailers.remove(self)
+        self._wakeup.set()
+
+    def __aiter__(self) -> "LogTailer":
+        return self
+
+    async def __anext__(self) -> LogBatch:
+        while not self._closed:
+            if self.cursor is None:
+                await self._seek_latest()
+
+            batch = self._take_pushed()
+            if batch is not None and batch.events:
+                return batch
+
+            if self._needs_fetch:
+                batch = await self._fetch()
+                if batch.events or batch.missed or batch.reset:
+                    return batch
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.idle_poll)
+            except asyncio.TimeoutError:
+                self._needs_fetch = True
+                continue
+
+            # Pushes arrive in order, so a hole in front of the earliest
+            # one means events were logged before we started listening
+            if self._pushed and min(self._pushed) > self.cursor + 1:
+                self._needs_fetch = True
+
+        raise StopAsyncIteration
+
+    def _push(self, message: dict):
+        """Receive an event message pushed by the game (called by GameClient)."""
+        seq = message.get("seq")
+        if seq is None or (self.cursor is not None and seq <= self.cursor):
+            return
+        self._pushed[seq] = {
+            "type": message.get("event"),
+            "data": message.get("data"),
+            "frame": message.get("frame"),
+            "timestamp": message.get("timestamp"),
+            "seq": seq,
+        }
+        self._wakeup.set()
+
+    def _take_pushed(self) -> Optional[LogBatch]:
+        """Deliver pushed events that continue the cursor without a hole."""
+        start = self.cursor
+        events = []
+        while self.cursor + 1 in self._pushed:
+            self.cursor += 1
+            event = self._pushed.pop(self.cursor)
+            if self._wanted(event):
+                events.append(event)
+        if self.cursor == start:
+            return None
+        self._discard_seen()
+        return LogBatch(events, start, self.cursor)
+
+    async def _fetch(self) -> LogBatch:
+        """Read the next page after the cursor from the game's log."""
+        start = self.cursor
+        response = await self._get_logs(start, self.page_size)
+
+        reset = False
+        if response["latest_seq"] < start:
+            # The game restarted and its sequence began again from zero
+            self.cursor = start = 0
+            self._pushed.clear()
+            reset = True
+            response = await self._get_logs(0, self.page_size)
+
+        missed = response.get("missed", 0)
+        self.missed += missed
+        self.cursor = max(self.cursor, response["next_seq"])
+        self._needs_fetch = response.get("has_more", False)
+        self._discard_seen()
+
+        # The game already applied the type filter
+        return LogBatch(response.get("events") or [], start, self.cursor, missed, reset)
+
+    async def _seek_latest(self):
+        """Place the cursor at the newest event logged before the tailer started."""
+        response = await self._get_logs(0, 0)
+        self.cursor = response["latest_seq"]
+        if self._pushed:
+            # Events pushed since construction count as new
+            self.cursor = min(self.cursor, min(self._pushed) - 1)
+        self._needs_fetch = False
+        self._discard_seen()
+
+    async def _get_logs(self, after_seq: int, limit: int) -> dict:
+        self.requests += 1
+        response = await self.client.get_logs(
+            event_types=sorted(self.event_types) if self.event_types else None,
+            limit=limit,
+            after_seq=after_seq,
+        )
+        if "error" in response:
+            raise RuntimeError(f"get_logs failed: {response['error']}")
+        return response
+
+    def _wanted(self, event: dict) -> bool:
+        return self.event_types is None or event.get("type") in self.event_types
+
+    def _discard_seen(self):
+        for seq in [seq for seq in self._pushed if seq <= self.cursor]:
+            del self._pushed[seq]
@@ -0,0 +1,306 @@
+"""
+Typed, lazily decoded views over game state responses.
+
+``GameClient.get_state(lazy=True)`` asks the game for an indexed response:
+the data JSON plus byte offsets for every top-level section and for every
+row of the citizens/buildings/characters arrays. The raw bytes are kept and
+only the parts that are read get decoded, so reading one citizen's name
+from a 5,000-citizen snapshot costs one small ``json.loads``.
+
+All views use ``__slots__``; a row that is never touched costs nothing but
+its offset pair.
+"""
+
+import json
+from typing import Any, Generic, Iterator, Optional, TypeVar
+
+
+class _Field:
+    """Descriptor exposing one decoded key of a record."""
+
+    __slots__ = ("key", "default")
+
+    def __init__(self, key: str, default: Any = None):
+        self.key = key
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj._fields().get(self.key, self.default)
+
+
+class Record:
+    """A JSON object decoded from a byte range on first access."""
+
+    __slots__ = ("_buf", "_offset", "_length", "_data")
+
+    def __init__(self, buf: Optional[bytes] = None, offset: int = 0, length: int = 0,
+                 data: Optional[dict] = None):
+        self._buf = buf
+        self._offset = offset
+        self._length = length
+        self._data = data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Record":
+        return cls(data=data)
+
+    def _fields(self) -> dict:
+        if self._data is None:
+            self._data = json.loads(self._buf[self._offset:self._offset + self._length])
+            self._buf = None  # Decoded; the shared buffer is still owned by the GameState
+        return self._data
+
+    @property
+    def decoded(self) -> bool:
+        """Whether this record has been decoded yet."""
+        return self._data is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Any key, including ones without a typed attribute."""
+        return self._fields().get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._fields()[key]
+
+    def to_dict(self) -> dict:
+        return self._fields()
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"{type(self).__name__}(<{self._length} bytes, not decoded>)"
+        return f"{type(self).__name__}({self._data!r})"
+
+
+class Citizen(Record):
+    """Alpha prototype citizen (see GameStateCapture:captureAlphaCitizens)."""
+
+    __slots__ = ()
+
+    id = _Field("id")
+    index = _Field("index")
+    name = _Field("name")
+    social_class = _Field("class")
+    age = _Field("age")
+    vocation = _Field("vocation")
+    x = _Field("x")
+    y = _Field("y")
+    average_satisfaction = _Field("average_satisfaction")
+    workplace = _Field("workplace")
+    workplace_id = _Field("workplace_id")
+    is_employed = _Field("is_employed", False)
+    housing_id = _Field("housing_id")
+    is_housed = _Field("is_housed", False)
+    traits = _Field("traits", ())
+    critical_cravings = _Field("critical_cravings")
+    satisfaction_breakdown = _Field("satisfaction_breakdown")
+    coarse_cravings = _Field("coarse_cravings")
+    wealth = _Field("wealth")
+    possessions = _Field("possessions")
+
+
+class Building(Record):
+    """Alpha prototype building (see GameStateCapture:captureAlphaBuildings)."""
+
+    __slots__ = ()
+
+    id = _Field("id")
+    index = _Field("index")
+    type_id = _Field("type_id")
+    name = _Field("name")
+    x = _Field("x")
+    y = _Field("y")
+    level = _Field("level", 0)
+    workers = _Field("workers", ())
+    worker_count = _Field("worker_count", 0)
+    max_workers = _Field("max_workers", 0)
+    stations = _Field("stations", ())
+    is_housing = _Field("is_housing", False)
+    capacity = _Field("capacity")
+    residents = _Field("residents")
+    housing_class = _Field("housing_class")
+    resource_efficiency = _Field("resource_efficiency")
+    storage_capacity = _Field("storage_capacity")
+    category = _Field("category")
+    construction_cost = _Field("construction_cost")
+    efficiency_breakdown = _Field("efficiency_breakdown")
+
+
+class ConsumptionCharacter(Record):
+    """Consumption prototype character (see GameStateCapture:captureConsumptionCharacters)."""
+
+    __slots__ = ()
+
+    id = _Field("id")
+    name = _Field("name")
+    social_class = _Field("class")
+    age = _Field("age")
+    vocation = _Field("vocation")
+    traits = _Field("traits", ())
+    status = _Field("status")
+    status_message = _Field("status_message")
+    is_protesting = _Field("is_protesting", False)
+    has_emigrated = _Field("has_emigrated", False)
+    average_satisfaction = _Field("average_satisfaction")
+    productivity = _Field("productivity")
+    allocation_success_rate = _Field("allocation_success_rate")
+    critical_craving_count = _Field("critical_craving_count")
+    satisfaction = _Field("satisfaction")
+    coarse_cravings = _Field("coarse_cravings")
+    fairness_penalty = _Field("fairness_penalty")
+    consecutive_failed_allocations = _Field("consecutive_failed_allocations")
+    consecutive_low_satisfaction_cycles = _Field("consecutive_low_satisfaction_cycles")
+    current_cravings = _Field("current_cravings")
+    base_cravings = _Field("base_cravings")
+    commodity_multipliers = _Field("commodity_multipliers")
+    consumption_history = _Field("consumption_history")
+    enablement_state = _Field("enablement_state")
+
+
+R = TypeVar("R", bound=Record)
+
+
+class LazyRows(Generic[R]):
+    """Sequence of records decoded one row at a time."""
+
+    __slots__ = ("_cls", "_buf", "_spans", "_rows")
+
+    def __init__(self, cls: type, buf: Optional[bytes], spans: list, rows: Optional[list] = None):
+        self._cls = cls
+        self._buf = buf
+        self._spans = spans
+        # Record objects are created (and cached) only when a row is accessed
+        self._rows: list = rows if rows is not None else [None] * len(spans)
+
+    @classmethod
+    def from_dicts(cls, record_cls: type, rows: list) -> "LazyRows":
+        return cls(record_cls, None, rows, [record_cls.from_dict(r) for r in rows])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, i: int) -> R:
+        row = self._rows[i]
+        if row is None:
+            offset, length = self._spans[i]
+            row = self._cls(self._buf, offset, length)
+            self._rows[i] = row
+        return row
+
+    def __iter__(self) -> Iterator[R]:
+        for i in range(len(self._rows)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"LazyRows[{self._cls.__name__}](rows={len(self)})"
+
+    def to_dicts(self) -> list[dict]:
+        return [row.to_dict() for row in self]
+
+
+# Row-array sections and the record type each decodes to, by game mode
+_ROW_TYPES = {
+    "citizens": Citizen,
+    "buildings": Building,
+    "characters": ConsumptionCharacter,
+}
+
+
+class GameState:
+    """Lazy view over one get_state snapshot.
+
+    Sections decode on first access and are then cached. Row sections
+    (citizens, buildings, characters) return LazyRows of typed records.
+    Unknown sections are reachable with ``state["name"]``.
+    """
+
+    __slots__ = ("_buf", "_index", "_cache", "frame_sent", "timestamp_sent")
+
+    def __init__(self, buf: Optional[bytes], index: dict, cache: Optional[dict] = None,
+                 frame: Optional[int] = None, timestamp: Optional[float] = None):
+        self._buf = buf
+        self._index = index
+        self._cache: dict = cache if cache is not None else {}
+        # Frame/timestamp of the response envelope (when the game sent it)
+        self.frame_sent = frame
+        self.timestamp_sent = timestamp
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameState":
+        """Wrap an already-decoded response (e.g. from a game without indexed responses)."""
+        cache = {}
+        for key, value in data.items():
+            record_cls = cls._row_type(key, data.get("mode"))
+            if record_cls and isinstance(value, list):
+                value = LazyRows.from_dicts(record_cls, value)
+            cache[key] = value
+        return cls(None, {key: None for key in data}, cache)
+
+    @staticmethod
+    def _row_type(key: str, mode: Optional[str]) -> Optional[type]:
+        # The main game's characters have a different shape from the consumption prototype's
+        if key == "characters" and mode != "consumption_prototype":
+            return None
+        return _ROW_TYPES.get(key)
+
+    def sections(self) -> list[str]:
+        """Top-level keys present in the snapshot."""
+        return list(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        if key not in self._index:
+            raise KeyError(key)
+
+        span = self._index[key]
+        record_cls = self._row_type(key, self.mode if key != "mode" else None)
+        if record_cls and span.get("rows") is not None:
+            value = LazyRows(record_cls, self._buf, span["rows"])
+        else:
+            start = span["offset"]
+            value = json.loads(self._buf[start:start + span["length"]])
+            if record_cls and isinstance(value, list):
+                value = LazyRows.from_dicts(record_cls, value)
+        self._cache[key] = value
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._index else default
+
+    def to_dict(self) -> dict:
+        """Decode everything (the shape of a non-lazy get_state response)."""
+        result = {}
+        for key in self._index:
+            value = self[key]
+            result[key] = value.to_dicts() if isinstance(value, LazyRows) else value
+        return result
+
+    def __repr__(self) -> str:
+        size = len(self._buf) if self._buf is not None else 0
+        return f"GameState(mode={self.mode!r}, sections={self.sections()}, bytes={size})"
+
+    # Envelope
+    frame = property(lambda self: self.get("frame"))
+    timestamp = property(lambda self: self.get("timestamp"))
+    mode = property(lambda self: self.get("mode"))
+    phase = property(lambda self: self.get("phase"))
+
+    # Typed row sections
+    citizens = property(lambda self: self.get("citizens"))
+    buildings = property(lambda self: self.get("buildings"))
+    characters = property(lambda self: self.get("characters"))
+
+    # Plain sections
+    time = property(lambda self: self.get("time"))
+    town = property(lambda self: self.get("town"))
+    statistics = property(lambda self: self.get("statistics"))
+    inventory = property(lambda self: self.get("inventory"))
+    housing = property(lambda self: self.get("housing"))
+    production = property(lambda self: self.get("production"))
+    simulation = property(lambda self: self.get("simulation"))
+    metrics = property(lambda self: self.get("metrics"))
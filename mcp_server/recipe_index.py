@@ -0,0 +1,294 @@
+"""
+Compiled commodity/recipe dependency index.
+
+Answers "who produces flour", "what consumes timber", "everything bread
+depends on" and "what can a sawmill make" from lookup tables instead of
+re-parsing and scanning the recipe, commodity and building JSON.
+
+The index is built once from building_recipes.json, commodities.json and
+building_types.json and stored with marshal in .cache/recipe_index/ at the
+repository root. The cache records each source file's size, mtime and
+SHA-256. If size and mtime are unchanged the cache is trusted without
+reading the sources. If they changed, the files are hashed, and the index
+is rebuilt only when the content differs.
+
+Usage::
+
+    from mcp_server.recipe_index import load_index
+
+    index = load_index()
+    index.producers("flour")      # recipes that output flour
+    index.upstream("bread")       # every commodity bread transitively needs
+    index.query("consumers", "timber")
+
+    python -m mcp_server.recipe_index upstream bread
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = REPO_ROOT / ".cache" / "recipe_index"
+
+# Bump when the stored layout changes
+INDEX_FORMAT = 1
+
+SOURCE_FILES = ("building_recipes.json", "commodities.json", "building_types.json")
+
+QUERY_TYPES = (
+    "producers", "consumers", "upstream", "downstream",
+    "building_recipes", "recipe", "commodity", "building",
+)
+
+_loaded: dict = {}
+
+
+@lru_cache(maxsize=None)
+def resolve_data_dir(version: Optional[str] = None) -> Path:
+    """Return the data directory for a version listed in data/versions.json."""
+    versions = json.loads((REPO_ROOT / "data" / "versions.json").read_text(encoding="utf-8"))
+    version = version or versions.get("activeVersion", "alpha")
+    for entry in versions.get("versions", []):
+        if entry.get("id") == version:
+            return REPO_ROOT / entry.get("dataPath", f"data/{version}")
+    return REPO_ROOT / "data" / version
+
+
+class RecipeIndex:
+    """Lookup tables over recipes, commodities and buildings.
+
+    Recipes are identified by "buildingType:recipeName". Lookups return
+    tuples (empty for unknown names) so callers can use them directly.
+    """
+
+    def __init__(self, tables: dict):
+        self.recipes: dict = tables["recipes"]
+        self.commodities: dict = tables["commodities"]
+        self.buildings: dict = tables["buildings"]
+        self._producers: dict = tables["producers"]
+        self._consumers: dict = tables["consumers"]
+        self._upstream: dict = tables["upstream"]
+        self._downstream: dict = tables["downstream"]
+        self._building_recipes: dict = tables["building_recipes"]
+
+    def producers(self, commodity: str) -> tuple:
+        """Recipes with commodity among their outputs."""
+        return self._producers.get(commodity, ())
+
+    def consumers(self, commodity: str) -> tuple:
+        """Recipes with commodity among their inputs."""
+        return self._consumers.get(commodity, ())
+
+    def upstream(self, commodity: str) -> tuple:
+        """Every commodity needed, directly or not, by any recipe making commodity."""
+        return self._upstream.get(commodity, ())
+
+    def downstream(self, commodity: str) -> tuple:
+        """Every commodity that can be made, directly or not, from commodity."""
+        return self._downstream.get(commodity, ())
+
+    def building_recipes(self, building_type: str) -> tuple:
+        """Recipes a building type can run."""
+        return self._building_recipes.get(building_type, ())
+
+    def recipe(self, recipe_id: str) -> Optional[dict]:
+        return self.recipes.get(recipe_id)
+
+    def query(self, query_type: str, name: str) -> dict:
+        """Dispatch a query by name; the response shape used over MCP."""
+        if query_type not in QUERY_TYPES:
+            return {"error": f"Unknown query_type: {query_type}", "query_types": list(QUERY_TYPES)}
+        if query_type == "recipe":
+            result = self.recipe(name)
+        elif query_type == "commodity":
+            result = self.commodities.get(name)
+            if result is not None:
+                result = dict(result, producers=list(self.producers(name)),
+                              consumers=list(self.consumers(name)))
+        elif query_type == "building":
+            result = self.buildings.get(name)
+            if result is not None:
+                result = dict(result, recipes=list(self.building_recipes(name)))
+        else:
+            result = list(getattr(self, query_type)(name))
+        if result is None:
+            return {"error": f"Unknown {query_type}: {name}"}
+        return {"query_type": query_type, "name": name, "result": result}
+
+
+def build_tables(data_dir: Path) -> dict:
+    """Parse the source JSON and compute every lookup table."""
+    def load(name):
+        path = data_dir / name
+        if not path.exists():
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    recipes, producers, consumers, building_recipes = {}, {}, {}, {}
+    for entry in load("building_recipes.json").get("recipes", []):
+        recipe_id = f"{entry['buildingType']}:{entry['recipeName']}"
+        inputs = entry.get("inputs") or {}
+        outputs = entry.get("outputs") or {}
+        recipes[recipe_id] = {
+            "id": recipe_id,
+            "buildingType": entry["buildingType"],
+            "recipeName": entry["recipeName"],
+            "productionTime": entry.get("productionTime"),
+            "inputs": inputs,
+            "outputs": outputs,
+        }
+        building_recipes.setdefault(entry["buildingType"], []).append(recipe_id)
+        for commodity in outputs:
+            producers.setdefault(commodity, []).append(recipe_id)
+        for commodity in inputs:
+            consumers.setdefault(commodity, []).append(recipe_id)
+
+    # Commodity graph: input -> output for every recipe
+    feeds, fed_by = {}, {}
+    for recipe in recipes.values():
+        for source in recipe["inputs"]:
+            for product in recipe["outputs"]:
+                if source != product:
+                    feeds.setdefault(source, set()).add(product)
+                    fed_by.setdefault(product, set()).add(source)
+
+    commodities = {
+        c["id"]: {k: c.get(k) for k in ("id", "name", "category", "quality", "isRaw")}
+        for c in load("commodities.json").get("commodities", [])
+    }
+    buildings = {
+        b["id"]: {k: b.get(k) for k in ("id", "name", "category")}
+        for b in load("building_types.json").get("buildingTypes", [])
+    }
+
+    return {
+        "recipes": recipes,
+        "commodities": commodities,
+        "buildings": buildings,
+        "producers": _freeze(producers),
+        "consumers": _freeze(consumers),
+        "upstream": _closures(fed_by),
+        "downstream": _closures(feeds),
+        "building_recipes": _freeze(building_recipes),
+    }
+
+
+def _freeze(table: dict) -> dict:
+    return {key: tuple(values) for key, values in table.items()}
+
+
+def _closures(edges: dict) -> dict:
+    """Transitive reachability for every node, as sorted tuples."""
+    result = {}
+    for start in edges:
+        seen, stack = set(), list(edges[start])
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(edges.get(node, ()))
+        seen.discard(start)
+        result[start] = tuple(sorted(seen))
+    return result
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _source_stats(data_dir: Path) -> dict:
+    stats = {}
+    for name in SOURCE_FILES:
+        path = data_dir / name
+        if path.exists():
+            st = path.stat()
+            stats[name] = (st.st_size, st.st_mtime_ns)
+    return stats
+
+
+def load_index(version: Optional[str] = None, data_dir: Optional[Path] = None,
+               cache_dir: Optional[Path] = CACHE_DIR) -> RecipeIndex:
+    """Return the index for a data version, from memory, cache or source.
+
+    cache_dir=None skips the on-disk cache.
+    """
+    data_dir = Path(data_dir) if data_dir else resolve_data_dir(version)
+    stats = _source_stats(data_dir)
+    loaded = _loaded.get(data_dir)
+    if loaded is not None and loaded[0] == stats:
+        return loaded[1]
+
+    cache_path = None
+    cached = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"{data_dir.name}.marshal"
+        try:
+            with open(cache_path, "rb") as f:
+                cached = marshal.load(f)
+            if cached.get("format") != INDEX_FORMAT:
+                cached = None
+        except (OSError, EOFError, ValueError, TypeError):
+            cached = None
+
+    tables = None
+    if cached is not None:
+        sources = cached["sources"]
+        if {name: tuple(entry[:2]) for name, entry in sources.items()} == stats:
+            tables = cached["tables"]
+        elif set(sources) == set(stats) and all(
+                sources[name][2] == _file_hash(data_dir / name) for name in stats):
+            # Touched but unchanged: keep the tables, refresh the stat record
+            tables = cached["tables"]
+            _write_cache(cache_path, data_dir, stats, tables)
+
+    if tables is None:
+        tables = build_tables(data_dir)
+        if cache_path is not None:
+            _write_cache(cache_path, data_dir, stats, tables)
+
+    index = RecipeIndex(tables)
+    _loaded[data_dir] = (stats, index)
+    return index
+
+
+def _write_cache(cache_path: Path, data_dir: Path, stats: dict, tables: dict):
+    sources = {name: (*stats[name], _file_hash(data_dir / name)) for name in stats}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            marshal.dump({"format": INDEX_FORMAT, "sources": sources, "tables": tables}, f)
+        os.replace(tmp, cache_path)
+    except OSError:
+        # A read-only checkout still works, just without the cache
+        pass
+
+
+def main(argv: Optional[list] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the commodity/recipe dependency index")
+    parser.add_argument("query_type", choices=QUERY_TYPES)
+    parser.add_argument("name", help="Commodity, recipe id (buildingType:recipeName) or building type")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cache and rebuild it")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        data_dir = resolve_data_dir(args.version)
+        stats = _source_stats(data_dir)
+        _write_cache(CACHE_DIR / f"{data_dir.name}.marshal", data_dir, stats, build_tables(data_dir))
+    result = load_index(args.version).query(args.query_type, args.name)
+    print(json.dumps(result, indent=2))
+    return 1 if "error" in result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,7 @@ from mcp.types import Tool, TextContent
 from mcp.server.stdio import stdio_server
 
 from .game_client import GameClient
+from .recipe_index import QUERY_TYPES as RECIPE_QUERY_TYPES, load_index
 
 # Initialize MCP server
 app = Server("cravetown-mcp")
@@ -38,7 +39,15 @@ async def get_game_client() -> GameClient:
     if _game_client is None or not _game_client.connected:
         host = os.environ.get("CRAVETOWN_HOST", "localhost")
         port = int(os.environ.get("CRAVETOWN_PORT", "9999"))
-        _game_client = GameClient(host, port)
+        # Compression helps most when the game runs on another machine;
+        # set CRAVETOWN_COMPRESSION=none to disable it
+        compression = os.environ.get("CRAVETOWN_COMPRESSION", "zlib")
+        threshold = int(os.environ.get("CRAVETOWN_COMPRESSION_THRESHOLD", "16384"))
+        _game_client = GameClient(
+            host, port,
+            compression=None if compression == "none" else compression,
+            compression_threshold=threshold
+        )
         await _game_client.connect()
     return _game_client
 
@@ -92,7 +101,10 @@ When in consumption prototype mode (mode="consumption_prototype"), returns:
 - allocation_policy: Current allocation settings
 - available_actions: Consumption-specific actions
 
-Use depth="full" for detailed craving/fatigue data, "summary" for overview, "minimal" for just IDs.""",
+Use depth="full" for detailed craving/fatigue data, "summary" for overview, "minimal" for just IDs.
+
+Use fields to fetch only what you need, e.g. ["citizens[].average_satisfaction", "citizens[].is_housed", "time.day"].
+The game skips capturing fields that weren't requested, so this is much cheaper than depth="full" on large towns.""",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -106,6 +118,15 @@ Use depth="full" for detailed craving/fatigue data, "summary" for overview, "min
                         "enum": ["minimal", "summary", "full"],
                         "default": "summary",
                         "description": "Level of detail: minimal (IDs only), summary (key fields), full (all data including cravings/fatigue)"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Sparse fieldset of dot paths ('[]' marks arrays and is optional), e.g. citizens[].average_satisfaction, buildings[].stations, statistics. Sections are inferred from the paths when include is omitted. Named fields are captured whatever the depth."
+                    },
+                    "columnar": {
+                        "type": "boolean",
+                        "description": "Encode citizens/buildings/characters/events as {columns, values} with each key sent once. Much smaller for large towns."
                     }
                 }
             }
@@ -491,6 +512,11 @@ MAIN GAME QUERIES:
                     "limit": {
                         "type": "integer",
                         "description": "Limit results (e.g., history entries)"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Project the result to these dot paths, e.g. average_satisfaction, is_housed"
                     }
                 },
                 "required": ["query_type"]
@@ -552,6 +578,10 @@ CONSUMPTION PROTOTYPE EVENTS:
                         "type": "integer",
                         "description": "Get events since this frame number (0 for all)"
                     },
+                    "after_seq": {
+                        "type": "integer",
+                        "description": "Page forward from this event seq, oldest first (0 for the oldest retained). The response has next_seq to pass on the next call, has_more, and missed (events trimmed before they were read)"
+                    },
                     "event_types": {
                         "type": "array",
                         "items": {"type": "string"},
@@ -564,6 +594,44 @@ CONSUMPTION PROTOTYPE EVENTS:
                     }
                 }
             }
+        ),
+        Tool(
+            name="cravetown_recipe_index",
+            description="""Look up production dependencies in the game data (no running game needed).
+
+Answered from a precompiled index of building_recipes.json, commodities.json
+and building_types.json for the active data version.
+
+QUERY TYPES:
+- producers: Recipes that output a commodity (name = commodity id)
+- consumers: Recipes that take a commodity as input
+- upstream: Every commodity a commodity depends on, transitively
+- downstream: Every commodity that can be made from a commodity, transitively
+- building_recipes: Recipes a building type can run (name = building type)
+- recipe: Inputs, outputs and production time (name = "buildingType:recipeName")
+- commodity: Commodity details with its producers and consumers
+- building: Building details with its recipes
+
+Recipes are identified as "buildingType:recipeName", e.g. "bakery:Bread Baking".""",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query_type": {
+                        "type": "string",
+                        "enum": list(RECIPE_QUERY_TYPES),
+                        "description": "Type of lookup"
+                    },
+                    "name": {
+                        "type": "string",
+                        "description": "Commodity id, building type or recipe id"
+                    },
+                    "version": {
+                        "type": "string",
+                        "description": "Data version from data/versions.json (default: active)"
+                    }
+                },
+                "required": ["query_type", "name"]
+            }
         )
     ]
 
@@ -572,6 +640,12 @@ CONSUMPTION PROTOTYPE EVENTS:
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
     try:
+        if name == "cravetown_recipe_index":
+            # Served from the data files, so it works without a game connection
+            index = load_index(arguments.get("version"))
+            result = index.query(arguments.get("query_type", ""), arguments.get("name", ""))
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
         client = await get_game_client()
 
         if name == "cravetown_game_state":
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Balance Sweep
+
+Compares recipe balance candidates without touching the data files. Each
+candidate is a recipe_pipeline.py transform chain - a CATEGORY_RULES
+variant and a production time multiplier - applied to an in-memory copy
+of building_recipes.json:
+
+    variant x multiplier
+
+and is scored against the same consumption demand:
+
+    1. demand: every starting town (town_montecarlo.py) is played for
+       --warmup + --cycles cycles, its stations producing into the
+       inventory its citizens are served from by the consumption
+       simulator (consumption_sim.py); the units drawn per citizen per
+       cycle over the last --cycles, scaled to --population citizens and
+       6 cycles per 300 s day, form a basket of every commodity some
+       recipe makes. Measuring under the supply a designed town actually
+       has keeps the basket at what a citizen really gets through, rather
+       than the many units a fully stocked population would take.
+    2. throughput: the steady-state chain solver (production_solver.py)
+       finds the stations, buildings and raw inputs the candidate's recipes
+       need to make that basket; one worker per station
+
+Candidates are ranked by how close the resulting employment share
+(workers / population) is to --target-employment; candidates with
+unproducible loops rank last, and candidates whose recipes come out the
+same as an earlier one's (a variant already applied to the data, say)
+are listed once. Evaluation is spread across a process pool. The sweep
+fails if even the best candidate's employment is far outside [0, 1],
+which means the demand is off rather than the recipes. Nothing is
+written unless --apply picks a ranked candidate, which is then saved
+through recipe_pipeline.py (one backup, changelog entry).
+
+Variants: "current" (recipes as they are) and "rebalance" (caps +
+overrides, as recipe_pipeline.py --rebalance), plus any from --variants,
+a JSON file of
+
+    {"name": {"max_time": 1200, "overrides": true,
+              "rules": {"farm": {"max_time": 600, "output_factor": 0.2}}}}
+
+whose rules are merged over CATEGORY_RULES.
+
+Usage:
+    python tools/python/balance_sweep.py
+    python tools/python/balance_sweep.py --version base --multipliers 0.1,0.2,0.5,1 --population 500
+    python tools/python/balance_sweep.py --variants variants.json --output sweep.csv
+    python tools/python/balance_sweep.py --multipliers 0.2,0.5 --apply 1
+
+Requires NumPy.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from consumption_sim import CravingData, History, Policy, Population, Simulation
+from game_data import REPO_ROOT, active_version, data_path, load_path, resolve_data_dir
+from production_solver import PERIODS, ChainSolver, RecipeMatrix
+from recipe_pipeline import (
+    CATEGORY_RULES,
+    MAX_TIME,
+    RECIPE_OVERRIDES,
+    RECIPES_FILE,
+    apply_overrides,
+    cap_times,
+    log_change,
+    run,
+    scale_all_times,
+    write,
+)
+from town_montecarlo import SECONDS_PER_CYCLE, Town, load_templates
+
+BUILT_IN_VARIANTS = {
+    "current": None,
+    "rebalance": {"overrides": True},
+}
+
+# Employment share past which a sweep is not measuring a workable economy
+EMPLOYMENT_LIMIT = 2.0
+
+# Per-process state, filled by _init_worker
+_WORKER = {}
+
+
+def measure_demand(data_dir: Path, towns: list, warmup: int, cycles: int, seed: int) -> dict:
+    """Units consumed per citizen per cycle of each commodity across the starting towns."""
+    data = CravingData(data_dir)
+    templates = load_templates(data_dir)
+    building_types = {t["id"]: t for t in load_path(data_dir / "building_types.json").get("buildingTypes", [])}
+    M = len(data.commodity_ids)
+    used = np.zeros(M)
+    citizen_cycles = 0
+    for town_id in towns:
+        template = templates[town_id]
+        town = Town(data, template, {}, building_types)
+        population = Population.generate(data, max(template["population"], len(template["classes"])),
+                                         seed=seed, class_shares=template["class_shares"],
+                                         classes=template["classes"])
+        sim = Simulation(data, population, Policy(), np.zeros(M))
+        # Consumption draws straight from the town inventory
+        sim.inventory = town.inventory[:M]
+        for cycle in range(warmup + cycles):
+            town.produce()
+            stock = sim.inventory.copy()
+            metrics = sim.step()
+            if cycle >= warmup:
+                used += stock - sim.inventory
+                citizen_cycles += metrics["population"]
+    used /= max(citizen_cycles, 1)
+    return {data.commodity_ids[i]: float(used[i]) for i in np.flatnonzero(used > 1e-9)}
+
+
+def variant_chain(spec: Optional[dict], multiplier: float) -> list:
+    """[(name, transform)] for one candidate, in recipe_pipeline order."""
+    chain = []
+    if spec is not None:
+        rules = {category: dict(rule) for category, rule in CATEGORY_RULES.items()}
+        for category, changes in (spec.get("rules") or {}).items():
+            rules.setdefault(category, {}).update(changes)
+        overrides = spec.get("overrides", False)
+        chain.append(("caps", cap_times(rules, spec.get("max_time", MAX_TIME),
+                                         exclude=RECIPE_OVERRIDES if overrides else ())))
+        if overrides:
+            chain.append(("overrides", apply_overrides()))
+    if multiplier != 1.0:
+        chain.append((f"x{multiplier}", scale_all_times(multiplier)))
+    return chain
+
+
+def _init_worker(recipes_path: str, stations: dict, variants: dict, demand: dict, population: int):
+    _WORKER["recipes_path"] = Path(recipes_path)
+    _WORKER["stations"] = stations
+    _WORKER["variants"] = variants
+    _WORKER["demand"] = demand
+    _WORKER["population"] = population
+
+
+def evaluate(candidate: dict, target: float) -> dict:
+    """Transform a private copy of the recipes and solve for the demand basket."""
+    start = time.perf_counter()
+    recipes = load_path(_WORKER["recipes_path"], mutable=True)["recipes"]
+    original = load_path(_WORKER["recipes_path"])["recipes"]
+    chain = variant_chain(_WORKER["variants"][candidate["variant"]], candidate["multiplier"])
+    for recipe in recipes:
+        for _, transform in chain:
+            transform(recipe)
+
+    matrix = RecipeMatrix(recipes, _WORKER["stations"])
+    per_hour = PERIODS["hour"] / SECONDS_PER_CYCLE * _WORKER["population"]
+    basket = {c: units * per_hour for c, units in _WORKER["demand"].items() if matrix.producers.get(c)}
+    solution = ChainSolver(matrix).solve(basket, PERIODS["hour"])
+
+    row = dict(candidate)
+    row["recipes_hash"] = hashlib.sha1(json.dumps(recipes, sort_keys=True).encode()).hexdigest()
+    row["feasible"] = solution.feasible
+    row["recipes_changed"] = sum(1 for old, new in zip(original, recipes) if old != new)
+    row["max_time"] = max((r.get("productionTime", 0) for r in recipes), default=0)
+    row["workers"] = float(sum(solution.stations.values())) if solution.feasible else math.inf
+    row["buildings"] = int(sum(solution.buildings.values())) if solution.feasible else -1
+    row["employment"] = row["workers"] / _WORKER["population"]
+    row["raw_inputs"] = float(sum(solution.raw_inputs.values()))
+    row["surplus"] = float(sum(solution.surplus.values()))
+    row["score"] = abs(row["employment"] - target) if solution.feasible else math.inf
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+def load_variants(path: Optional[Path]) -> dict:
+    variants = dict(BUILT_IN_VARIANTS)
+    if path is not None:
+        variants.update(load_path(path))
+    return variants
+
+
+def _float_list(text: str) -> list:
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def _name_list(text: str) -> list:
+    return [v.strip() for v in text.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score recipe balance candidates in memory")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    parser.add_argument("--multipliers", type=_float_list, default=[0.1, 0.2, 0.25, 0.5, 1.0],
+                        help="Comma-separated production time multipliers")
+    parser.add_argument("--variants", type=Path, help="JSON file of extra CATEGORY_RULES variants")
+    parser.add_argument("--only", type=_name_list, help="Comma-separated variant names to sweep (default: all)")
+    parser.add_argument("--population", type=int, default=500, help="Citizens the economy must serve")
+    parser.add_argument("--target-employment", type=float, default=0.30,
+                        help="Employment share candidates are ranked against (default: 0.30)")
+    parser.add_argument("--level", type=int, default=0, help="Building upgrade level for station counts")
+    parser.add_argument("--towns", type=_name_list,
+                        help="Comma-separated starting towns the demand is measured in (default: all)")
+    parser.add_argument("--warmup", type=int, default=20, help="Cycles before demand is measured")
+    parser.add_argument("--cycles", type=int, default=60, help="Cycles demand is measured over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--output", type=Path, help="Also write every row (.npz, .csv or .json)")
+    parser.add_argument("--apply", type=int, metavar="RANK", help="Write the candidate at this rank to disk")
+    parser.add_argument("--no-backup", action="store_true", help="Skip the backup copy with --apply")
+    args = parser.parse_args()
+
+    version = args.version or active_version()
+    data_dir = resolve_data_dir(version)
+    variants = load_variants(args.variants)
+    names = args.only or list(variants)
+    unknown = [n for n in names if n not in variants]
+    if unknown:
+        print(f"❌ Unknown variant(s): {', '.join(unknown)}")
+        return 1
+    known_towns = load_templates(data_dir)
+    towns = args.towns or list(known_towns)
+    unknown = [t for t in towns if t not in known_towns]
+    if unknown:
+        print(f"❌ Unknown town(s): {', '.join(unknown)}")
+        return 1
+
+    start = time.perf_counter()
+    demand = measure_demand(data_dir, towns, args.warmup, args.cycles, args.seed)
+    print(f"📂 {data_path(RECIPES_FILE, version).relative_to(REPO_ROOT)}")
+    print(f"🍽️  Demand: {sum(demand.values()):.2f} units per citizen per cycle over "
+          f"{len(demand)} commodities in {len(towns)} towns ({time.perf_counter() - start:.1f}s)")
+
+    stations = RecipeMatrix.load(data_dir, args.level).stations_per_building
+    grid = [{"variant": v, "multiplier": m} for v, m in itertools.product(names, args.multipliers)]
+    print(f"🧮 {len(grid)} candidates on {args.workers} workers")
+
+    rows: list[Optional[dict]] = [None] * len(grid)
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(str(data_path(RECIPES_FILE, version)), stations, variants, demand, args.population),
+    ) as pool:
+        futures = {pool.submit(evaluate, candidate, args.target_employment): i
+                   for i, candidate in enumerate(grid)}
+        for future in as_completed(futures):
+            rows[futures[future]] = future.result()
+
+    # A candidate whose recipes match an earlier one's is listed once
+    first = {}
+    for row in rows:
+        same = first.setdefault(row["recipes_hash"], row)
+        row["same_as"] = "" if same is row else f"{same['variant']} x{same['multiplier']:g}"
+    ranked = sorted((r for r in rows if not r["same_as"]), key=lambda r: (r["score"], r["recipes_changed"]))
+    print(f"\n✅ Scored in {time.perf_counter() - start:.1f}s "
+          f"(target employment {args.target_employment:.0%} of {args.population} citizens)\n")
+    print(f"{'rank':>4}  {'variant':14s} {'mult':>6}  {'changed':>7}  {'max time':>8}  "
+          f"{'workers':>10}  {'buildings':>9}  {'employment':>10}")
+    for rank, row in enumerate(ranked, 1):
+        if not row["feasible"]:
+            print(f"{rank:4d}  {row['variant']:14s} {row['multiplier']:6g}  {row['recipes_changed']:7d}  "
+                  f"{row['max_time']:7d}s  {'unproducible loops':>33s}")
+            continue
+        print(f"{rank:4d}  {row['variant']:14s} {row['multiplier']:6g}  {row['recipes_changed']:7d}  "
+              f"{row['max_time']:7d}s  {row['workers']:10.1f}  {row['buildings']:9d}  {row['employment']:10.1%}")
+    for name in names:
+        same = [r["same_as"] for r in rows if r["variant"] == name and r["same_as"]]
+        if not same:
+            continue
+        if len(same) == len(args.multipliers) and len({s.split(" x")[0] for s in same}) == 1:
+            print(f"ℹ️  {name}: same recipes as {same[0].split(' x')[0]} at every multiplier "
+                  f"(its transforms are already applied to {version})")
+        else:
+            print(f"ℹ️  {name}: " + ", ".join(f"x{r['multiplier']:g} same as {r['same_as']}"
+                                             for r in rows if r["variant"] == name and r["same_as"]))
+
+    if args.output:
+        results = History()
+        for row in rows:
+            results.append(row)
+        results.save(args.output)
+        print(f"💾 Results written to {args.output}")
+
+    feasible = [r for r in ranked if r["feasible"]]
+    if feasible and not 0 <= feasible[0]["employment"] <= EMPLOYMENT_LIMIT:
+        print(f"\n❌ Best candidate needs {feasible[0]['employment']:.0%} employment; "
+              f"that far outside [0, 1] means the demand basket or the multipliers are off")
+        return 1
+
+    if args.apply is None:
+        return 0
+    if not 1 <= args.apply <= len(ranked):
+        print(f"❌ --apply must be a rank from 1 to {len(ranked)}")
+        return 1
+    chosen = ranked[args.apply - 1]
+    chain = variant_chain(variants[chosen["variant"]], chosen["multiplier"])
+    if not chain:
+        print(f"\n✅ Rank {args.apply} keeps the recipes as they are; nothing to write")
+        return 0
+    results = run(chain, [version])
+    written = write(results, backup=not args.no_backup)
+    for path, backup_path in written:
+        print(f"\n💾 Applied {chosen['variant']} x{chosen['multiplier']:g} to {path.relative_to(REPO_ROOT)}"
+              + (f" (backup: {backup_path.name})" if backup_path else ""))
+    if written:
+        log_change(chain, results, written)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Incremental Artifact Builder
+
+Reruns only the generators whose inputs changed since their last run. Each
+target names a generator script, the files it reads and the files it
+writes; .cache/build_manifest.json records, per target and data version,
+the SHA-256 of every input and output at the end of its last successful
+run:
+
+    commodity_cache       data/<version>/craving_system/commodity_cache.json
+                          (active version, and any version that has one)
+    fulfillment_matrices  .cache/matrices/<version>/*.npy
+    data_bundle           data/<version>/bundle.json (after commodity_cache)
+    building_sprites      assets/buildings/*.png
+    building_atlas        assets/atlas/buildings_*.png + buildings.json (after building_sprites)
+
+A job is stale when it was never recorded, an input was added, removed or
+changed (the generator script counts as an input), or an output is missing
+or differs from what the generator wrote. Files whose size and mtime match
+the manifest are not re-hashed, so a run with nothing to do takes a few
+milliseconds. Stale jobs without dependencies on each other run in
+parallel, each in its own process; a target listed in another's "after"
+runs first, and its dependents are skipped if it fails.
+
+The generators keep their own freshness checks; a job rerun because its
+script or outputs changed is passed the generator's --force arguments.
+
+Usage:
+    python tools/python/build_artifacts.py                    # rebuild what is stale
+    python tools/python/build_artifacts.py --dry-run          # list stale jobs and why
+    python tools/python/build_artifacts.py --only data_bundle --versions alpha
+    python tools/python/build_artifacts.py --force            # rerun every job
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from build_data_bundle import source_files
+from game_data import REPO_ROOT, active_version, load_path, resolve_data_dir, save_path, version_ids
+from generate_building_sprites import DATA_VERSION as SPRITE_VERSION
+
+TOOLS_DIR = Path(__file__).resolve().parent
+MANIFEST_PATH = REPO_ROOT / ".cache" / "build_manifest.json"
+
+# Bump when the manifest layout changes
+MANIFEST_FORMAT = 1
+
+
+def _commodity_cache_versions() -> list:
+    active = active_version()
+    return [v for v in version_ids()
+            if v == active or (resolve_data_dir(v) / "craving_system" / "commodity_cache.json").exists()]
+
+
+# inputs/outputs are glob patterns relative to the repository root, with
+# {data} standing for the version's data directory and {version} for its id
+TARGETS = {
+    "commodity_cache": {
+        "script": "build_commodity_cache.py",
+        "versions": _commodity_cache_versions,
+        "inputs": [
+            "{data}/craving_system/fulfillment_vectors.json",
+            "{data}/craving_system/dimension_definitions.json",
+            "{data}/substitution_rules.json",
+        ],
+        "outputs": ["{data}/craving_system/commodity_cache.json"],
+        "args": ["--version", "{version}"],
+        "force_args": ["--force"],
+        "after": [],
+    },
+    "fulfillment_matrices": {
+        "script": "compile_fulfillment_matrices.py",
+        "versions": version_ids,
+        "inputs": [
+            "{data}/craving_system/dimension_definitions.json",
+            "{data}/craving_system/fulfillment_vectors.json",
+            "{data}/craving_system/character_traits.json",
+            "{data}/craving_system/character_classes.json",
+        ],
+        "outputs": [".cache/matrices/{version}/*.npy", ".cache/matrices/{version}/index.json"],
+        "args": ["--version", "{version}"],
+        "force_args": ["--force"],
+        "after": [],
+    },
+    "data_bundle": {
+        "script": "build_data_bundle.py",
+        "versions": version_ids,
+        # Every source the bundle holds, as build_data_bundle.source_files lists them
+        "inputs": source_files,
+        "outputs": ["{data}/bundle.json", "{data}/bundle.manifest.json"],
+        "args": ["--version", "{version}"],
+        "force_args": ["--force"],
+        "after": ["commodity_cache"],
+        "stat_inputs": True,
+    },
+    "building_sprites": {
+        "script": "generate_building_sprites.py",
+        "versions": lambda: [SPRITE_VERSION],
+        "inputs": ["{data}/building_types.json"],
+        "outputs": ["assets/buildings/*.png"],
+        "args": [],
+        "force_args": ["--force"],
+        "after": [],
+    },
+    "building_atlas": {
+        "script": "build_sprite_atlas.py",
+        "versions": lambda: [SPRITE_VERSION],
+        "inputs": ["assets/buildings/*.png"],
+        "outputs": ["assets/atlas/buildings_*.png", "assets/atlas/buildings.json"],
+        "args": [],
+        "force_args": [],
+        "after": ["building_sprites"],
+    },
+}
+
+
+def _expand(patterns, version: str) -> list:
+    """Repository-relative paths matching a target's patterns for one version."""
+    data_dir = resolve_data_dir(version)
+    if callable(patterns):
+        return sorted(path.relative_to(REPO_ROOT).as_posix() for path in patterns(data_dir))
+    data = data_dir.relative_to(REPO_ROOT).as_posix()
+    paths = set()
+    for pattern in patterns:
+        pattern = pattern.format(data=data, version=version)
+        if glob.has_magic(pattern):
+            paths.update(Path(p).relative_to(REPO_ROOT).as_posix()
+                         for p in glob.glob(str(REPO_ROOT / pattern), recursive=True))
+        else:
+            paths.add(pattern)
+    return sorted(paths)
+
+
+def fingerprint(rel: str, previous: Optional[dict]) -> Optional[dict]:
+    """{size, mtime_ns, sha256} of a file, reusing the recorded hash while its stat is unchanged."""
+    try:
+        st = os.stat(REPO_ROOT / rel)
+    except OSError:
+        return None
+    if previous and (previous["size"], previous["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+        return previous
+    sha = hashlib.sha256((REPO_ROOT / rel).read_bytes()).hexdigest()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+
+
+def _hashes(paths: list, previous: dict) -> dict:
+    return {rel: fingerprint(rel, previous.get(rel)) for rel in paths}
+
+
+def _changed(current: dict, recorded: dict) -> list:
+    """Paths added, removed or with different contents."""
+    changed = [rel for rel, fp in current.items()
+               if rel not in recorded or fp is None or fp["sha256"] != recorded[rel]["sha256"]]
+    return changed + [rel for rel in recorded if rel not in current]
+
+
+class Job:
+    """One target for one data version."""
+
+    def __init__(self, name: str, version: str):
+        self.name = name
+        self.version = version
+        self.target = TARGETS[name]
+        self.key = f"{name}:{version}"
+        self.script = (TOOLS_DIR / self.target["script"]).relative_to(REPO_ROOT).as_posix()
+
+    def inputs(self) -> list:
+        return [self.script] + _expand(self.target["inputs"], self.version)
+
+    def outputs(self) -> list:
+        return _expand(self.target["outputs"], self.version)
+
+    def runnable(self) -> bool:
+        """False when the version has no data directory or lacks an input the target names."""
+        if not resolve_data_dir(self.version).is_dir():
+            return False
+        return all((REPO_ROOT / rel).exists() for rel in self.inputs() if not glob.has_magic(rel))
+
+    def staleness(self, record: dict) -> tuple:
+        """(reasons, input fingerprints, force); no reasons means the outputs are current.
+
+        force is set when the generator's own source check would not see the
+        reason (its code or its outputs changed, not its inputs).
+        """
+        record = record or {}
+        inputs = _hashes(self.inputs(), record.get("inputs", {}))
+        if not record:
+            return ["never built"], inputs, False
+        reasons, force = [], False
+        changed = _changed(inputs, record["inputs"])
+        if self.script in changed:
+            reasons.append("generator changed")
+            changed.remove(self.script)
+            force = True
+        if changed:
+            reasons.append(f"inputs changed: {', '.join(changed[:3])}"
+                           + (f" (+{len(changed) - 3})" if len(changed) > 3 else ""))
+        elif self.target.get("stat_inputs") and any(
+                (fp["size"], fp["mtime_ns"]) != (record["inputs"][rel]["size"], record["inputs"][rel]["mtime_ns"])
+                for rel, fp in inputs.items()):
+            # The output records input stats itself (data bundles), so a touch matters
+            reasons.append("inputs touched")
+        outputs = _hashes(self.outputs(), record["outputs"])
+        missing = [rel for rel in record["outputs"] if outputs.get(rel) is None]
+        modified = [rel for rel in _changed(outputs, record["outputs"]) if rel not in missing]
+        if missing:
+            reasons.append(f"{len(missing)} output(s) missing")
+        if modified:
+            reasons.append(f"{len(modified)} output(s) modified")
+        return reasons, inputs, force or bool(missing or modified)
+
+    def command(self, force: bool) -> list:
+        args = [a.format(version=self.version) for a in self.target["args"]]
+        if force:
+            args += self.target["force_args"]
+        return [sys.executable, str(REPO_ROOT / self.script)] + args
+
+
+def run_job(job: Job, force: bool) -> tuple:
+    """Run the generator in its own process; returns (exit code, output, seconds)."""
+    start = time.perf_counter()
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    result = subprocess.run(job.command(force), cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, encoding="utf-8")
+    return result.returncode, (result.stdout + result.stderr).rstrip(), time.perf_counter() - start
+
+
+def waves(jobs: list) -> list:
+    """Jobs grouped so every job comes after the jobs of the targets it names in "after"."""
+    remaining = list(jobs)
+    done, grouped = set(), []
+    while remaining:
+        selected = {job.name for job in remaining}
+        ready = [job for job in remaining
+                 if all(dep in done or dep not in selected for dep in job.target["after"])]
+        if not ready:
+            raise ValueError(f"Dependency cycle among: {', '.join(sorted(selected))}")
+        grouped.append(ready)
+        remaining = [job for job in remaining if job not in ready]
+        done.update(job.name for job in ready)
+    return grouped
+
+
+def load_manifest() -> dict:
+    if MANIFEST_PATH.exists():
+        manifest = load_path(MANIFEST_PATH, mutable=True)
+        if manifest.get("format") == MANIFEST_FORMAT:
+            return manifest
+    return {"format": MANIFEST_FORMAT, "jobs": {}}
+
+
+def _name_list(text: str) -> list:
+    return [v.strip() for v in text.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rerun the data generators whose inputs changed")
+    parser.add_argument("--only", type=_name_list, help=f"Comma-separated targets ({', '.join(TARGETS)})")
+    parser.add_argument("--versions", type=_name_list, help="Comma-separated data versions (default: per target)")
+    parser.add_argument("--force", action="store_true", help="Rerun every selected job")
+    parser.add_argument("--dry-run", action="store_true", help="Only list stale jobs and why")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Generators run at once")
+    args = parser.parse_args()
+
+    names = args.only or list(TARGETS)
+    unknown = [n for n in names if n not in TARGETS]
+    if unknown:
+        print(f"❌ Unknown target(s): {', '.join(unknown)}")
+        return 1
+
+    start = time.perf_counter()
+    manifest = load_manifest()
+    jobs = [Job(name, version) for name in names for version in TARGETS[name]["versions"]()
+            if args.versions is None or version in args.versions]
+    jobs = [job for job in jobs if job.runnable()]
+
+    failed, ran, current = set(), 0, 0
+    for wave in waves(jobs):
+        stale = []
+        for job in wave:
+            if any(dep in failed for dep in job.target["after"]):
+                print(f"⏭️  {job.key}: skipped, a dependency failed")
+                failed.add(job.name)
+                continue
+            reasons, inputs, force = job.staleness(manifest["jobs"].get(job.key))
+            if args.force:
+                reasons, force = ["forced"], True
+            if not reasons:
+                current += 1
+                continue
+            print(f"⚠️  {job.key}: {'; '.join(reasons)}")
+            stale.append((job, inputs, force))
+        if args.dry_run or not stale:
+            continue
+
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            results = list(pool.map(lambda s: run_job(s[0], s[2]), stale))
+        for (job, inputs, _), (code, output, seconds) in zip(stale, results):
+            ran += 1
+            if code != 0:
+                print(f"❌ {job.key} failed ({seconds:.1f}s):\n{output}")
+                failed.add(job.name)
+                continue
+            last = output.splitlines()[-1] if output else ""
+            print(f"✅ {job.key} ({seconds:.1f}s) {last}")
+            record = manifest["jobs"].get(job.key, {})
+            manifest["jobs"][job.key] = {
+                # Re-read in case the generator rewrote one of its own inputs
+                "inputs": _hashes(job.inputs(), inputs),
+                "outputs": _hashes(job.outputs(), record.get("outputs", {})),
+                "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+            save_path(MANIFEST_PATH, manifest)
+
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.dry_run:
+        print(f"\n{current} of {len(jobs)} jobs current ({elapsed:.0f} ms)")
+        return 0
+    print(f"\n{'❌' if failed else '✅'} {ran} job(s) run, {current} current, "
+          f"{len(failed)} failed ({elapsed:.0f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
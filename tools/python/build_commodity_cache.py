@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Commodity Cache Builder
+
+Regenerates data/<version>/craving_system/commodity_cache.json, the
+pre-computed cache CommodityCache.lua loads at startup, without opening the
+info-system. The output matches info-system's generateCommodityCache():
+
+- byFineDimension: every commodity with a positive value in that fine
+  dimension, highest first (ties keep fulfillment_vectors.json order)
+- byCoarseDimension: the same, using the sum of a commodity's positive
+  fine values under that coarse dimension
+- substitutionGroups: the categories of substitution_rules.json
+- sourceDataHashes: info-system's simpleHash of each source, so both tools
+  agree on whether the cache is current
+
+It is meant to run before launching the game:
+
+- nothing changed (all three hashes match): exits without writing;
+- only fulfillment vectors changed: recomputes just the dimensions whose
+  rankings involve a changed, added or removed commodity (the previous
+  values are read back from the cache itself) and keeps the rest;
+- dimension definitions changed: rebuilds every ranking;
+- only substitution rules changed: rebuilds the substitution groups.
+
+Usage:
+    python tools/python/build_commodity_cache.py
+    python tools/python/build_commodity_cache.py --check     # exit 1 if stale
+    python tools/python/build_commodity_cache.py --force     # full rebuild
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from game_data import REPO_ROOT, load_path, resolve_data_dir
+
+CACHE_VERSION = "1.0.0"
+
+
+def _js_value(value):
+    """Convert parsed JSON to what JavaScript would serialize (1.0 -> 1)."""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e21:
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _js_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_js_value(v) for v in value]
+    return value
+
+
+def js_stringify(value, indent: Optional[int] = None) -> str:
+    """JSON.stringify(value, null, indent) for the values these files hold."""
+    if indent is None:
+        return json.dumps(_js_value(value), separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(_js_value(value), indent=indent, ensure_ascii=False)
+
+
+def simple_hash(text: str) -> str:
+    """info-system's simpleHash: 32-bit string hash over UTF-16 code units, as |hash| in hex."""
+    h = 0
+    units = text.encode("utf-16-le")
+    for i in range(0, len(units), 2):
+        h = (h * 31 + (units[i] | units[i + 1] << 8)) & 0xFFFFFFFF
+    if h >= 0x80000000:
+        h -= 0x100000000
+    return format(abs(h), "x")
+
+
+class Sources:
+    """The three source files and their hashes."""
+
+    def __init__(self, data_dir: Path):
+        craving_dir = data_dir / "craving_system"
+        self.fulfillment = load_path(craving_dir / "fulfillment_vectors.json")
+        self.dimensions = load_path(craving_dir / "dimension_definitions.json")
+        self.substitution = load_path(data_dir / "substitution_rules.json")
+        self.hashes = {
+            "fulfillmentVectors": simple_hash(js_stringify(self.fulfillment)),
+            "dimensionDefinitions": simple_hash(js_stringify(self.dimensions)),
+            "substitutionRules": simple_hash(js_stringify(self.substitution)),
+        }
+
+        fine = self.dimensions.get("fineDimensions", [])
+        coarse = self.dimensions.get("coarseDimensions", [])
+        self.fine_ids = [d["id"] for d in fine]
+        self.coarse_ids = [d["id"] for d in coarse]
+        # fine id -> coarse id (dimensions whose parent is unknown roll up nowhere)
+        self.parent = {d["id"]: d["parentCoarse"] for d in fine if d.get("parentCoarse") in self.coarse_ids}
+
+        self.commodities = self.fulfillment.get("commodities", {})
+        self.order = {cid: i for i, cid in enumerate(self.commodities)}
+        self.vectors = {}
+        known = set(self.fine_ids)
+        for cid, data in self.commodities.items():
+            fine_vector = (data.get("fulfillmentVector") or {}).get("fine") or {}
+            self.vectors[cid] = {f: v for f, v in fine_vector.items() if v > 0 and f in known}
+
+    def coarse_values(self, cid: str) -> dict:
+        totals = {}
+        for fid, points in self.vectors[cid].items():
+            coarse = self.parent.get(fid)
+            if coarse is not None:
+                totals[coarse] = totals.get(coarse, 0) + points
+        return totals
+
+
+def _ranking(entries: list) -> dict:
+    entries.sort(key=lambda e: -e["value"])
+    return {"available": entries, "sortedByValue": [e["id"] for e in entries]}
+
+
+def rank_fine(sources: Sources, fid: str) -> dict:
+    return _ranking([{"id": cid, "value": vec[fid]} for cid, vec in sources.vectors.items() if fid in vec])
+
+
+def rank_coarse(sources: Sources, coarse_id: str) -> dict:
+    entries = []
+    for cid in sources.vectors:
+        value = sources.coarse_values(cid).get(coarse_id)
+        if value is not None:
+            entries.append({"id": cid, "value": value})
+    return _ranking(entries)
+
+
+def substitution_groups(sources: Sources) -> dict:
+    groups = {}
+    for category, members in (sources.substitution.get("substitutionHierarchies") or {}).items():
+        # All members count as available in the pre-computed cache
+        groups[category] = {"members": list(members), "available": list(members)}
+    return groups
+
+
+def _in_source_order(sources: Sources, ranking: dict) -> bool:
+    """True if equal values are still listed in fulfillment_vectors.json order."""
+    previous = None
+    for entry in ranking.get("available", []):
+        position = sources.order.get(entry["id"])
+        if position is None:
+            return False
+        if previous is not None and entry["value"] == previous[0] and position < previous[1]:
+            return False
+        previous = (entry["value"], position)
+    return True
+
+
+def changed_commodities(sources: Sources, cache: dict) -> set:
+    """Commodities whose positive fine values differ from those recorded in the cache."""
+    recorded = {}
+    for fid, ranking in cache.get("byFineDimension", {}).items():
+        for entry in ranking.get("available", []):
+            recorded.setdefault(entry["id"], {})[fid] = entry["value"]
+    return {cid for cid in set(recorded) | set(sources.vectors)
+            if recorded.get(cid, {}) != sources.vectors.get(cid, {})}
+
+
+def build(sources: Sources, cache: Optional[dict], force: bool = False) -> tuple:
+    """Return (new cache or None if current, description of what was rebuilt)."""
+    old_hashes = (cache or {}).get("sourceDataHashes", {})
+    stale = {key for key, value in sources.hashes.items() if old_hashes.get(key) != value}
+    if cache is not None and not stale and not force:
+        return None, "up to date"
+
+    full = (force or cache is None or "dimensionDefinitions" in stale
+            or set(cache.get("byFineDimension", {})) != set(sources.fine_ids)
+            or set(cache.get("byCoarseDimension", {})) != set(sources.coarse_ids))
+
+    by_fine, by_coarse = {}, {}
+    rebuilt_fine = rebuilt_coarse = 0
+    if full:
+        fine_dirty, coarse_dirty = set(sources.fine_ids), set(sources.coarse_ids)
+    elif "fulfillmentVectors" in stale:
+        changed = changed_commodities(sources, cache)
+        fine_dirty = set()
+        for fid, ranking in cache["byFineDimension"].items():
+            if any(e["id"] in changed for e in ranking.get("available", [])):
+                fine_dirty.add(fid)
+        for cid in changed:
+            fine_dirty.update(sources.vectors.get(cid, {}))
+        coarse_dirty = {sources.parent[f] for f in fine_dirty if f in sources.parent}
+    else:
+        fine_dirty, coarse_dirty = set(), set()
+
+    for fid in sources.fine_ids:
+        kept = None if fid in fine_dirty else cache["byFineDimension"].get(fid)
+        if kept is None or not _in_source_order(sources, kept):
+            by_fine[fid] = rank_fine(sources, fid)
+            rebuilt_fine += 1
+        else:
+            by_fine[fid] = kept
+    for coarse_id in sources.coarse_ids:
+        kept = None if coarse_id in coarse_dirty else cache["byCoarseDimension"].get(coarse_id)
+        if kept is None or not _in_source_order(sources, kept):
+            by_coarse[coarse_id] = rank_coarse(sources, coarse_id)
+            rebuilt_coarse += 1
+        else:
+            by_coarse[coarse_id] = kept
+
+    if full or "substitutionRules" in stale or "substitutionGroups" not in cache:
+        groups = substitution_groups(sources)
+        rebuilt_groups = True
+    else:
+        groups = cache["substitutionGroups"]
+        rebuilt_groups = False
+
+    generated = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    new_cache = {
+        "version": CACHE_VERSION,
+        "generatedAt": generated,
+        "sourceDataHashes": sources.hashes,
+        "byCoarseDimension": by_coarse,
+        "byFineDimension": by_fine,
+        "substitutionGroups": groups,
+        "metadata": {
+            "coarseCacheCount": len(by_coarse),
+            "fineCacheCount": len(by_fine),
+            "substitutionGroupCount": len(groups),
+            "totalCommodities": len(sources.commodities),
+        },
+    }
+    summary = (f"{'full rebuild' if full else 'incremental'}: "
+               f"{rebuilt_fine}/{len(by_fine)} fine, {rebuilt_coarse}/{len(by_coarse)} coarse rankings"
+               f"{', substitution groups' if rebuilt_groups else ''} (changed: {', '.join(sorted(stale)) or 'forced'})")
+    return new_cache, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate commodity_cache.json when its sources change")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    parser.add_argument("--force", action="store_true", help="Rebuild everything")
+    parser.add_argument("--check", action="store_true", help="Only report; exit 1 if the cache is stale")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data_dir = resolve_data_dir(args.version)
+    cache_path = data_dir / "craving_system" / "commodity_cache.json"
+    sources = Sources(data_dir)
+    cache = load_path(cache_path) if cache_path.exists() else None
+
+    new_cache, summary = build(sources, cache, args.force)
+    elapsed = (time.perf_counter() - start) * 1000
+    if new_cache is None:
+        print(f"✅ {cache_path.relative_to(REPO_ROOT)} is up to date ({elapsed:.0f} ms)")
+        return 0
+    if args.check:
+        print(f"⚠️  {cache_path.relative_to(REPO_ROOT)} is stale: {summary}")
+        return 1
+
+    with open(cache_path, "w", encoding="utf-8") as f:
+        f.write(js_stringify(new_cache, indent=2))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✅ Wrote {cache_path.relative_to(REPO_ROOT)} ({summary}, {elapsed:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
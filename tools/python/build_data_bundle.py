@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Data Bundle Builder
+
+Compiles every JSON file of a data version into one minified bundle so the
+game (DataLoader.lua) and the Python tools (game_data.py) read and decode a
+single file at launch and on hot reload instead of dozens:
+
+    data/<version>/bundle.json
+        format, version, hash     - hash is the SHA-256 over all sources
+        files                     - {relative path: parsed content}
+        index                     - {relative path: {collection: {id: position}}}
+                                    for every top-level list of objects with
+                                    ids (0-based; Lua adds 1)
+        sources                   - {relative path: {size, modtime}}
+    data/<version>/bundle.manifest.json
+        per source: size, mtime_ns and SHA-256; the bundle's size and hash
+
+A loader only takes a file from the bundle while its size and modification
+time still match the recorded ones, so a file edited after the build is
+read directly until the next build. The build is skipped while every
+source still matches the manifest.
+
+Usage:
+    python tools/python/build_data_bundle.py                  # every version
+    python tools/python/build_data_bundle.py --version alpha --force
+    python tools/python/build_data_bundle.py --check          # exit 1 if stale
+    python tools/python/build_data_bundle.py --bench          # decode times (needs lupa)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from game_data import BUNDLE_FILE, BUNDLE_FORMAT, BUNDLE_MANIFEST, REPO_ROOT, load_path, resolve_data_dir, version_ids
+
+LUA_JSON = REPO_ROOT / "code" / "json.lua"
+
+
+def source_files(data_dir: Path) -> list:
+    """Every JSON file of a version except the bundle itself and backups."""
+    return sorted(
+        path for path in data_dir.rglob("*.json")
+        if path.name not in (BUNDLE_FILE, BUNDLE_MANIFEST) and ".backup" not in path.name
+    )
+
+
+def _relative(data_dir: Path, path: Path) -> str:
+    return path.relative_to(data_dir).as_posix()
+
+
+def id_index(data) -> dict:
+    """{collection: {id: position}} for top-level lists whose entries all have string ids."""
+    index = {}
+    if not isinstance(data, dict):
+        return index
+    for key, value in data.items():
+        if (isinstance(value, list) and value
+                and all(isinstance(e, dict) and isinstance(e.get("id"), str) for e in value)):
+            positions = {}
+            for i, entry in enumerate(value):
+                # First occurrence wins, as a linear search would find it
+                positions.setdefault(entry["id"], i)
+            index[key] = positions
+    return index
+
+
+def is_current(data_dir: Path) -> bool:
+    manifest_path = data_dir / BUNDLE_MANIFEST
+    if not manifest_path.exists() or not (data_dir / BUNDLE_FILE).exists():
+        return False
+    manifest = json.loads(manifest_path.read_bytes())
+    sources = manifest.get("sources", {})
+    paths = source_files(data_dir)
+    if manifest.get("format") != BUNDLE_FORMAT or len(paths) != len(sources):
+        return False
+    for path in paths:
+        recorded = sources.get(_relative(data_dir, path))
+        st = path.stat()
+        # Same rule the loaders use: a touched file needs a fresh record even if unchanged
+        if recorded is None or (recorded["size"], recorded["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+            return False
+    return True
+
+
+def build(version: str) -> dict:
+    """Write the bundle and manifest of a version; returns the manifest."""
+    data_dir = resolve_data_dir(version)
+    files, index, sources, recorded = {}, {}, {}, {}
+    combined = hashlib.sha256()
+    for path in source_files(data_dir):
+        rel = _relative(data_dir, path)
+        raw = path.read_bytes()
+        st = os.stat(path)
+        data = load_path(path)
+        files[rel] = data
+        positions = id_index(data)
+        if positions:
+            index[rel] = positions
+        sha = hashlib.sha256(raw).hexdigest()
+        combined.update(rel.encode() + b"\0" + sha.encode())
+        # Integer seconds, as love.filesystem.getInfo reports them
+        sources[rel] = {"size": st.st_size, "modtime": int(st.st_mtime)}
+        recorded[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "hash": combined.hexdigest(),
+        "files": files,
+        "index": index,
+        "sources": sources,
+    }
+    text = json.dumps(bundle, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    bundle_path = data_dir / BUNDLE_FILE
+    tmp = bundle_path.with_name(f".{BUNDLE_FILE}.tmp")
+    tmp.write_bytes(text)
+    os.replace(tmp, bundle_path)
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "hash": bundle["hash"],
+        "bundle": {"size": len(text), "sha256": hashlib.sha256(text).hexdigest()},
+        "sourceBytes": sum(s["size"] for s in recorded.values()),
+        "sources": recorded,
+    }
+    manifest_path = data_dir / BUNDLE_MANIFEST
+    tmp = manifest_path.with_name(f".{BUNDLE_MANIFEST}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+    return manifest
+
+
+def bench(version: str):
+    """Decode times of the sources vs the bundle, in Python and with the game's json.lua."""
+    data_dir = resolve_data_dir(version)
+    texts = [path.read_text(encoding="utf-8") for path in source_files(data_dir)]
+    bundle_text = (data_dir / BUNDLE_FILE).read_text(encoding="utf-8")
+
+    def timed(decode) -> tuple:
+        start = time.perf_counter()
+        for text in texts:
+            decode(text)
+        files = time.perf_counter() - start
+        start = time.perf_counter()
+        decode(bundle_text)
+        return files * 1000, (time.perf_counter() - start) * 1000
+
+    files_ms, bundle_ms = timed(json.loads)
+    print(f"   Python json:   {len(texts)} files {files_ms:6.1f} ms, bundle {bundle_ms:6.1f} ms")
+    try:
+        from lupa import LuaRuntime
+    except ImportError:
+        print("   json.lua:      skipped (pip install lupa to time the game's decoder)")
+        return
+    lua_json = LuaRuntime().execute(LUA_JSON.read_text(encoding="utf-8"))
+    files_ms, bundle_ms = timed(lua_json.decode)
+    print(f"   json.lua:      {len(texts)} files {files_ms:6.1f} ms, bundle {bundle_ms:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build minified, indexed data bundles")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: all)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the sources are unchanged")
+    parser.add_argument("--check", action="store_true", help="Only report; exit 1 if a bundle is stale")
+    parser.add_argument("--bench", action="store_true", help="Time decoding the sources vs the bundle")
+    args = parser.parse_args()
+
+    stale = False
+    for version in [args.version] if args.version else version_ids():
+        data_dir = resolve_data_dir(version)
+        if not data_dir.is_dir():
+            print(f"❌ No data directory {data_dir}")
+            return 1
+        bundle_path = (data_dir / BUNDLE_FILE).relative_to(REPO_ROOT)
+        start = time.perf_counter()
+        if not args.force and is_current(data_dir):
+            print(f"✅ {bundle_path} is up to date ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        elif args.check:
+            print(f"⚠️  {bundle_path} is stale")
+            stale = True
+            continue
+        else:
+            manifest = build(version)
+            print(f"✅ Wrote {bundle_path}: {len(manifest['sources'])} files, "
+                  f"{manifest['sourceBytes'] / 1024:.0f} KB -> {manifest['bundle']['size'] / 1024:.0f} KB "
+                  f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        if args.bench:
+            bench(version)
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Sprite Atlas Builder
+
+Packs the building sprites in assets/buildings/ (<type>_lvl<N>.png), and
+optionally other sprite folders such as icons, into one or a few
+power-of-two atlas textures, so the game binds one texture for a whole
+town instead of one per building type and level:
+
+    assets/atlas/buildings_0.png, buildings_1.png ...
+    assets/atlas/buildings.json
+        atlases    [{file, width, height, sprites}]
+        buildings  {type id: {level: sprite}}
+        <folder>   {file stem: sprite}         (one per --extra folder)
+        sprite     {atlas, x, y, w, h, uv}     uv = [u0, v0, u1, v1],
+                                               as GenerateUVs / Sprite:SetUVs use
+
+Sprites are placed with a skyline bottom-left packer, largest first. Each
+gets --padding pixels of space on every side, and the outer --bleed of
+those repeat the sprite's edge pixels so filtering and mipmaps at the
+sprite's border do not pick up its neighbours. An atlas starts at the
+smallest power-of-two square that could hold the remaining sprites and
+doubles up to --max-size; what still does not fit starts another atlas.
+
+Usage:
+    python tools/python/build_sprite_atlas.py
+    python tools/python/build_sprite_atlas.py --extra assets/icons --padding 2 --bleed 2 --max-size 1024
+
+Requires NumPy.
+"""
+
+import argparse
+import math
+import re
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from game_data import REPO_ROOT, save_path
+from generate_building_sprites import write_png
+
+SPRITE_DIR = REPO_ROOT / "assets" / "buildings"
+OUTPUT_DIR = REPO_ROOT / "assets" / "atlas"
+ATLAS_NAME = "buildings"
+SPRITE_NAME = re.compile(r"^(?P<id>.+)_lvl(?P<level>\d+)$")
+
+# Bump when the manifest layout changes
+ATLAS_FORMAT = 1
+
+# PNG color type -> channels, for 8-bit images
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def read_png(path: Path) -> np.ndarray:
+    """Decode an 8-bit, non-interlaced PNG into an H x W x 4 uint8 array."""
+    data = Path(path).read_bytes()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"{path}: not a PNG file")
+    pos, idat, palette, transparency = 8, [], None, None
+    while pos < len(data):
+        length, tag = struct.unpack("!I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if tag == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack("!2I5B", body)
+        elif tag == b"PLTE":
+            palette = np.frombuffer(body, dtype=np.uint8).reshape(-1, 3)
+        elif tag == b"tRNS":
+            transparency = np.frombuffer(body, dtype=np.uint8)
+        elif tag == b"IDAT":
+            idat.append(body)
+        elif tag == b"IEND":
+            break
+    if depth != 8 or interlace or color_type not in _CHANNELS:
+        raise ValueError(f"{path}: only 8-bit, non-interlaced PNGs are supported")
+
+    channels = _CHANNELS[color_type]
+    stride = width * channels
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8).reshape(height, stride + 1)
+    rows = np.zeros((height, stride), dtype=np.uint8)
+    previous = np.zeros(stride, dtype=np.uint8)
+    for y in range(height):
+        kind, line = raw[y, 0], raw[y, 1:].astype(np.int32)
+        if kind == 0:
+            row = line
+        elif kind == 2:
+            row = line + previous
+        else:
+            # Sub, Average and Paeth depend on the pixel just decoded to the left
+            row = line.copy()
+            up = previous.astype(np.int32)
+            for x in range(stride):
+                left = row[x - channels] if x >= channels else 0
+                if kind == 1:
+                    row[x] = (row[x] + left) & 0xFF
+                elif kind == 3:
+                    row[x] = (row[x] + ((left + up[x]) >> 1)) & 0xFF
+                else:
+                    corner = up[x - channels] if x >= channels else 0
+                    p = left + up[x] - corner
+                    pa, pb, pc = abs(p - left), abs(p - up[x]), abs(p - corner)
+                    predictor = left if pa <= pb and pa <= pc else up[x] if pb <= pc else corner
+                    row[x] = (row[x] + predictor) & 0xFF
+        rows[y] = row & 0xFF
+        previous = rows[y]
+
+    pixels = rows.reshape(height, width, channels)
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    if color_type == 3:
+        rgba[..., :3] = palette[pixels[..., 0]]
+        alpha = np.full(len(palette), 255, dtype=np.uint8)
+        if transparency is not None:
+            alpha[:len(transparency)] = transparency
+        rgba[..., 3] = alpha[pixels[..., 0]]
+    elif channels <= 2:
+        rgba[..., :3] = pixels[..., :1]
+        rgba[..., 3] = pixels[..., 1] if channels == 2 else 255
+    else:
+        rgba[..., :channels] = pixels
+        if channels == 3:
+            rgba[..., 3] = 255
+    return rgba
+
+
+class Skyline:
+    """Bottom-left skyline packer for one atlas page."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.nodes = [[0, 0, width]]  # x, y, width of each skyline segment
+
+    def _fit(self, i: int, w: int, h: int) -> Optional[int]:
+        """Lowest y at which a w x h box can sit starting at segment i."""
+        x = self.nodes[i][0]
+        if x + w > self.width:
+            return None
+        y, remaining, j = 0, w, i
+        while remaining > 0:
+            y = max(y, self.nodes[j][1])
+            if y + h > self.height:
+                return None
+            remaining -= self.nodes[j][2]
+            j += 1
+        return y
+
+    def insert(self, w: int, h: int) -> Optional[tuple]:
+        best = None
+        for i, (x, _, _) in enumerate(self.nodes):
+            y = self._fit(i, w, h)
+            if y is not None and (best is None or (y + h, x) < (best[1] + h, best[2])):
+                best = (i, y, x)
+        if best is None:
+            return None
+        i, y, x = best
+        self.nodes.insert(i, [x, y + h, w])
+        # Trim the segments the box now covers
+        j = i + 1
+        while j < len(self.nodes):
+            end = self.nodes[j - 1][0] + self.nodes[j - 1][2]
+            nx, ny, nw = self.nodes[j]
+            if nx >= end:
+                break
+            if nx + nw <= end:
+                del self.nodes[j]
+                continue
+            self.nodes[j] = [end, ny, nx + nw - end]
+            break
+        # Merge neighbours at the same height
+        k = 0
+        while k < len(self.nodes) - 1:
+            if self.nodes[k][1] == self.nodes[k + 1][1]:
+                self.nodes[k][2] += self.nodes[k + 1][2]
+                del self.nodes[k + 1]
+            else:
+                k += 1
+        return x, y
+
+
+def _pow2(n: int) -> int:
+    return 1 << max(0, math.ceil(math.log2(max(n, 1))))
+
+
+def pack(sizes: dict, max_size: int, padding: int) -> list:
+    """[(width, height, {key: (x, y)})] pages; positions are of the unpadded sprite."""
+    for key, (w, h) in sizes.items():
+        if max(w, h) + 2 * padding > max_size:
+            raise ValueError(f"{key} ({w}x{h}) does not fit in a {max_size}x{max_size} atlas")
+    remaining = sorted(sizes, key=lambda k: (-sizes[k][1], -sizes[k][0], k))
+    pages = []
+    while remaining:
+        cells = [(sizes[k][0] + 2 * padding, sizes[k][1] + 2 * padding) for k in remaining]
+        side = min(max_size, max(_pow2(math.isqrt(sum(w * h for w, h in cells))),
+                                 _pow2(max(max(c) for c in cells))))
+        while True:
+            skyline, placed, left = Skyline(side, side), {}, []
+            for key, (w, h) in zip(remaining, cells):
+                spot = skyline.insert(w, h)
+                if spot is None:
+                    left.append(key)
+                else:
+                    placed[key] = (spot[0] + padding, spot[1] + padding)
+            if not left or side >= max_size:
+                break
+            side *= 2
+        used = max(y + sizes[k][1] + padding for k, (_, y) in placed.items())
+        pages.append((side, _pow2(used), placed))
+        remaining = left
+    return pages
+
+
+def collect(extra: list) -> tuple:
+    """({key: pixels}, {key: (group, name, level or None)}); key is group/file stem."""
+    images, names = {}, {}
+    for path in sorted(SPRITE_DIR.glob("*.png")):
+        match = SPRITE_NAME.match(path.stem)
+        if not match:
+            print(f"⚠️  Skipping {path.name}: not <type>_lvl<N>.png")
+            continue
+        key = f"buildings/{path.stem}"
+        images[key] = read_png(path)
+        names[key] = ("buildings", match["id"], match["level"])
+    for directory in extra:
+        for path in sorted(Path(directory).glob("*.png")):
+            key = f"{directory.name}/{path.stem}"
+            images[key] = read_png(path)
+            names[key] = (directory.name, path.stem, None)
+    return images, names
+
+
+def build(extra: list, output: Path, name: str, max_size: int, padding: int, bleed: int) -> dict:
+    images, names = collect(extra)
+    if not images:
+        raise ValueError(f"No sprites in {SPRITE_DIR}")
+    sizes = {key: (pixels.shape[1], pixels.shape[0]) for key, pixels in images.items()}
+    pages = pack(sizes, max_size, padding)
+
+    output.mkdir(parents=True, exist_ok=True)
+    manifest = {"format": ATLAS_FORMAT, "padding": padding, "bleed": bleed, "atlases": [], "buildings": {}}
+    for page, (width, height, placed) in enumerate(pages):
+        atlas = np.zeros((height, width, 4), dtype=np.uint8)
+        file = f"{name}_{page}.png"
+        for key, (x, y) in placed.items():
+            pixels = images[key]
+            h, w = pixels.shape[:2]
+            if bleed:
+                atlas[y - bleed:y + h + bleed, x - bleed:x + w + bleed] = np.pad(
+                    pixels, ((bleed, bleed), (bleed, bleed), (0, 0)), mode="edge")
+            else:
+                atlas[y:y + h, x:x + w] = pixels
+            group, sprite_name, level = names[key]
+            sprite = {
+                "atlas": file, "x": x, "y": y, "w": w, "h": h,
+                "uv": [x / width, y / height, (x + w) / width, (y + h) / height],
+            }
+            if level is None:
+                manifest.setdefault(group, {})[sprite_name] = sprite
+            else:
+                manifest["buildings"].setdefault(sprite_name, {})[level] = sprite
+        write_png(output / file, atlas)
+        manifest["atlases"].append({"file": file, "width": width, "height": height, "sprites": len(placed)})
+
+    # Drop pages left over from an earlier, larger build
+    for stale in output.glob(f"{name}_*.png"):
+        if stale.name not in {a["file"] for a in manifest["atlases"]}:
+            stale.unlink()
+    save_path(output / f"{name}.json", manifest)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack building sprites into power-of-two atlases")
+    parser.add_argument("--extra", type=Path, action="append", default=[],
+                        help="Another folder of PNGs to pack (repeatable), e.g. assets/icons")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help="Atlas directory")
+    parser.add_argument("--name", default=ATLAS_NAME, help="Atlas file name prefix")
+    parser.add_argument("--max-size", type=int, default=2048, help="Largest atlas side (power of two)")
+    parser.add_argument("--padding", type=int, default=2, help="Pixels around each sprite")
+    parser.add_argument("--bleed", type=int, default=2, help="Padding pixels filled with the sprite's edge")
+    args = parser.parse_args()
+
+    if args.max_size != _pow2(args.max_size):
+        print("❌ --max-size must be a power of two")
+        return 1
+    if not 0 <= args.bleed <= args.padding:
+        print("❌ --bleed must be between 0 and --padding")
+        return 1
+    missing = [d for d in args.extra if not d.is_dir()]
+    if missing:
+        print(f"❌ No such folder: {', '.join(str(d) for d in missing)}")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        manifest = build(args.extra, args.output, args.name, args.max_size, args.padding, args.bleed)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    output = args.output.resolve()
+    if output.is_relative_to(REPO_ROOT):
+        output = output.relative_to(REPO_ROOT)
+    sprites = sum(a["sprites"] for a in manifest["atlases"])
+    for atlas in manifest["atlases"]:
+        print(f"💾 {output / atlas['file']}: {atlas['width']}x{atlas['height']}, {atlas['sprites']} sprites")
+    print(f"✅ {sprites} sprites in {len(manifest['atlases'])} atlas(es), manifest {output / (args.name + '.json')} "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Fulfillment Matrix Compiler
+
+Compiles the craving system JSON into dense float32 .npy matrices that
+simulators and analysis tools can memory-map instead of re-parsing dicts:
+
+    commodity_fine.npy    commodities x fine dimensions  (fulfillment_vectors.json)
+    commodity_coarse.npy  commodities x coarse dimensions
+    building_fine.npy     buildings x fine dimensions    (occupant fulfillment)
+    trait_fine.npy        traits x fine dimensions       (cravingMultipliers.fine, 1.0 when unset)
+    class_fine.npy        classes x fine dimensions      (baseCravingVector.fine)
+    fine_coarse.npy       parent coarse index of each fine dimension (int32, -1 if none)
+    fine_weight.npy       aggregationWeight of each fine dimension
+
+index.json holds the id order of every axis (and id -> index maps are
+rebuilt from it on load), the matrix shapes and the SHA-256 of each source
+file. The build is skipped when the sources are unchanged.
+
+Usage:
+    python tools/python/compile_fulfillment_matrices.py
+    python tools/python/compile_fulfillment_matrices.py --version alpha --output build/matrices --force
+
+    from compile_fulfillment_matrices import load_matrices
+    m = load_matrices()                      # memory-mapped, read-only
+    m.commodity_fine[m.commodity_index["wheat"]]
+
+Requires NumPy.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from game_data import REPO_ROOT, load_path, resolve_data_dir
+
+DEFAULT_OUTPUT = REPO_ROOT / ".cache" / "matrices"
+
+# Bump when the output layout changes
+MATRIX_FORMAT = 1
+
+SOURCES = (
+    "dimension_definitions.json",
+    "fulfillment_vectors.json",
+    "character_traits.json",
+    "character_classes.json",
+)
+
+MATRICES = (
+    "commodity_fine", "commodity_coarse", "building_fine",
+    "trait_fine", "class_fine", "fine_coarse", "fine_weight",
+)
+
+
+def source_hashes(craving_dir: Path) -> dict:
+    return {name: hashlib.sha256((craving_dir / name).read_bytes()).hexdigest() for name in SOURCES}
+
+
+def compile_matrices(craving_dir: Path) -> tuple:
+    """Build every matrix and the id tables. Returns (arrays, ids)."""
+    dimensions = load_path(craving_dir / "dimension_definitions.json")
+    fulfillment = load_path(craving_dir / "fulfillment_vectors.json")
+    traits = load_path(craving_dir / "character_traits.json")
+    classes = load_path(craving_dir / "character_classes.json")
+
+    coarse = sorted(dimensions["coarseDimensions"], key=lambda d: d["index"])
+    fine = sorted(dimensions["fineDimensions"], key=lambda d: d["index"])
+    ids = {
+        "coarse": [d["id"] for d in coarse],
+        "fine": [d["id"] for d in fine],
+        "commodity": sorted(fulfillment.get("commodities", {})),
+        # Keys starting with "_" are notes, not buildings
+        "building": sorted(k for k, v in fulfillment.get("buildings", {}).items()
+                            if not k.startswith("_") and isinstance(v, dict)),
+        "trait": [t["id"] for t in traits.get("traits", [])],
+        "class": [c["id"] for c in classes.get("classes", [])],
+    }
+    fine_index = {fid: i for i, fid in enumerate(ids["fine"])}
+    coarse_index = {cid: i for i, cid in enumerate(ids["coarse"])}
+    F, C = len(ids["fine"]), len(ids["coarse"])
+
+    def fine_rows(entries: dict, keys: list) -> np.ndarray:
+        matrix = np.zeros((len(keys), F), dtype=np.float32)
+        for row, key in enumerate(keys):
+            vector = (entries[key].get("fulfillmentVector") or {}).get("fine") or {}
+            for fid, value in vector.items():
+                if fid in fine_index and value is not None:
+                    matrix[row, fine_index[fid]] = value
+        return matrix
+
+    def padded(vectors: list, width: int, fill: float) -> np.ndarray:
+        matrix = np.full((len(vectors), width), fill, dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            for col, value in enumerate((vector or [])[:width]):
+                if value is not None:
+                    matrix[row, col] = value
+        return matrix
+
+    commodities = fulfillment.get("commodities", {})
+    arrays = {
+        "commodity_fine": fine_rows(commodities, ids["commodity"]),
+        # Older entries carry 9 coarse values; the missing tail is zero
+        "commodity_coarse": padded([(commodities[c].get("fulfillmentVector") or {}).get("coarse")
+                                    for c in ids["commodity"]], C, 0.0),
+        "building_fine": fine_rows(fulfillment.get("buildings", {}), ids["building"]),
+        "trait_fine": padded([(t.get("cravingMultipliers") or {}).get("fine")
+                              for t in traits.get("traits", [])], F, 1.0),
+        "class_fine": padded([(c.get("baseCravingVector") or {}).get("fine")
+                              for c in classes.get("classes", [])], F, 0.0),
+        "fine_coarse": np.array([coarse_index.get(d.get("parentCoarse"), -1) for d in fine], dtype=np.int32),
+        "fine_weight": np.array([d.get("aggregationWeight", 1.0) for d in fine], dtype=np.float32),
+    }
+    return arrays, ids
+
+
+def build(version: Optional[str] = None, output: Path = DEFAULT_OUTPUT, force: bool = False) -> tuple:
+    """Compile into output/<version>/ unless it is already current.
+
+    Returns (output directory, True if rebuilt).
+    """
+    data_dir = resolve_data_dir(version)
+    craving_dir = data_dir / "craving_system"
+    out_dir = Path(output) / data_dir.name
+    hashes = source_hashes(craving_dir)
+
+    index_path = out_dir / "index.json"
+    if not force and index_path.exists():
+        index = load_path(index_path)
+        if (index.get("format") == MATRIX_FORMAT and index.get("sources") == hashes
+                and all((out_dir / f"{name}.npy").exists() for name in MATRICES)):
+            return out_dir, False
+
+    arrays, ids = compile_matrices(craving_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(out_dir / f"{name}.npy", array)
+    index = {
+        "format": MATRIX_FORMAT,
+        "version": data_dir.name,
+        "sources": hashes,
+        "ids": ids,
+        "shapes": {name: list(array.shape) for name, array in arrays.items()},
+    }
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return out_dir, True
+
+
+class FulfillmentMatrices:
+    """Compiled matrices plus id tables, as loaded by load_matrices."""
+
+    def __init__(self, directory: Path, mmap_mode: Optional[str] = "r"):
+        index = load_path(Path(directory) / "index.json")
+        self.directory = Path(directory)
+        self.sources = index["sources"]
+        self.ids = index["ids"]
+        # fine_ids/fine_index, commodity_ids/commodity_index, ...
+        for axis, values in self.ids.items():
+            setattr(self, f"{axis}_ids", values)
+            setattr(self, f"{axis}_index", {v: i for i, v in enumerate(values)})
+        for name in MATRICES:
+            setattr(self, name, np.load(self.directory / f"{name}.npy", mmap_mode=mmap_mode))
+
+
+def load_matrices(version: Optional[str] = None, output: Path = DEFAULT_OUTPUT,
+                  mmap_mode: Optional[str] = "r") -> FulfillmentMatrices:
+    """Load compiled matrices, compiling first if missing or stale."""
+    out_dir, _ = build(version, output)
+    return FulfillmentMatrices(out_dir, mmap_mode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile fulfillment vectors into .npy matrices")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                        help="Output root; files go in <output>/<version>/")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if sources are unchanged")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    out_dir, rebuilt = build(args.version, args.output, args.force)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not rebuilt:
+        print(f"✅ {out_dir} is up to date ({elapsed:.1f} ms)")
+        return 0
+
+    index = load_path(out_dir / "index.json")
+    print(f"✅ Compiled {len(index['shapes'])} matrices into {out_dir} ({elapsed:.1f} ms)")
+    for name, shape in index["shapes"].items():
+        print(f"   {name:18s} {' x '.join(str(s) for s in shape)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
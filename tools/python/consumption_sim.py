@@ -0,0 +1,1127 @@
+#!/usr/bin/env python3
+"""
+Offline Consumption Simulator
+
+Runs the craving/allocation/satisfaction cycle outside the game, with every
+character's state held in dense NumPy arrays (N characters x F fine
+dimensions, F = 66 in the current dimension_definitions.json), so balance
+studies no longer have to run inside the prototype at 1x-5x speed.
+
+The model follows CharacterV3 and AllocationEngineV2.AllocateCycleV2 with
+all fine cravings active each cycle:
+
+    1. cravings grow by baseCravings per cycle, capped at max(50x base, 50)
+    2. durables/permanents owned by a character apply their vector passively
+    3. characters are ranked by policy priority (need_based: weighted sum of
+       current cravings, plus fairness penalty)
+    4. each craving with value > 1.0 requests the best available commodity
+       for which that dimension is primary (>= 50% of its max value) and
+       whose quality the character's class accepts; the units needed to
+       drain it are granted in priority order until stock runs out
+    5. fulfillment reduces cravings and raises fine satisfaction (x0.5),
+       scaled by quality and the per-character fatigue multiplier
+    6. met/unmet streaks scale gains and penalties (difficulty settings)
+    7. fine satisfaction decays with unfulfilled cravings; emigration rolls
+
+Allocation is batched: instead of walking characters one at a time, each
+round resolves every character's request for a commodity at once with a
+cumulative sum over the priority order. Where one character's craving
+outruns the best commodity, the next round offers the next-best one.
+Substitution chains and slot timing are not modelled.
+
+Between consumption events the state follows simple recurrences: cravings
+grow linearly up to their cap, unmet streaks lengthen by one, satisfaction
+loses a penalty that is linear up to bufferDays and geometric after, and
+fatigue only expires with the cooldown. Simulation.fast_forward jumps such
+idle stretches in one vectorized step using the closed forms below
+(idle_cravings, idle_craving_sum, penalty_total), and steps cycle by cycle
+only when something could be consumed or someone could emigrate. The same
+functions serve as an analytic oracle for idle stretches observed in game.
+
+Usage:
+    python tools/python/consumption_sim.py --characters 10000 --cycles 1000
+    python tools/python/consumption_sim.py --supply supply.json --output run.npz
+    python tools/python/consumption_sim.py --per-capita 0 --cycles 5000 --fast-forward
+
+Requires NumPy.
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from game_data import REPO_ROOT, load_path, resolve_data_dir
+
+# Constants mirrored from code/consumption (CharacterV3, AllocationEngineV2, CommodityCache)
+CRAVING_THRESHOLD = 1.0
+MAX_CRAVING_MULTIPLIER = 50.0
+STARTING_CRAVING_CYCLES = 10
+PRIMARY_THRESHOLD = 0.5
+MIN_ALLOCATION_FATIGUE = 0.3
+DEFAULT_FATIGUE_RATE = 0.12
+SATISFACTION_GAIN_SCALE = 0.5
+SATISFACTION_DECAY_SCALE = 0.2
+SATISFACTION_MIN = -100.0
+SATISFACTION_MAX = 300.0
+CRITICAL_CRAVING = 80.0
+FAIRNESS_PENALTY_STEP = 50.0
+
+# CharacterV3.GetAverageSatisfaction averages these (not "utility")
+AVERAGE_SATISFACTION_DIMENSIONS = (
+    "biological", "safety", "touch", "psychological", "social_status",
+    "social_connection", "exotic_goods", "shiny_objects", "vice",
+)
+
+# CharacterV3.DEFAULT_DIFFICULTY_SETTINGS
+DIFFICULTY_SETTINGS = {
+    "easy": {"bufferDays": 7, "decayMultiplier": 0.5, "gainMultiplier": 1.5,
+             "decayExponent": 0.06, "gainLogScale": 25},
+    "normal": {"bufferDays": 5, "decayMultiplier": 1.0, "gainMultiplier": 1.0,
+               "decayExponent": 0.08, "gainLogScale": 20},
+    "hard": {"bufferDays": 3, "decayMultiplier": 1.5, "gainMultiplier": 0.7,
+             "decayExponent": 0.10, "gainLogScale": 15},
+    "brutal": {"bufferDays": 2, "decayMultiplier": 2.0, "gainMultiplier": 0.5,
+               "decayExponent": 0.12, "gainLogScale": 10},
+}
+
+# need_based/equality are the game's modes; the rest are the orderings
+# documented for the consumption prototype in code/mcp/Protocol.lua
+PRIORITY_MODES = (
+    "need_based", "equality", "highest_craving", "lowest_satisfaction",
+    "oldest_consumption", "round_robin",
+)
+
+# Characters in the first rationing block; each later block doubles
+RATION_BLOCK = 256
+
+
+class CravingData:
+    """Craving system data compiled into arrays (loaded once per run)."""
+
+    def __init__(self, data_dir: Path):
+        craving_dir = data_dir / "craving_system"
+        dimensions = load_path(craving_dir / "dimension_definitions.json")
+        fulfillment = load_path(craving_dir / "fulfillment_vectors.json")
+        classes = load_path(craving_dir / "character_classes.json")
+        traits = load_path(craving_dir / "character_traits.json")
+        fatigue = load_path(craving_dir / "commodity_fatigue_rates.json")
+        mechanics = load_path(data_dir / "consumption_mechanics.json")
+        self.data_dir = data_dir
+
+        # Dimensions
+        coarse = sorted(dimensions["coarseDimensions"], key=lambda d: d["index"])
+        fine = sorted(dimensions["fineDimensions"], key=lambda d: d["index"])
+        self.coarse_ids = [d["id"] for d in coarse]
+        self.fine_ids = [d["id"] for d in fine]
+        coarse_index = {cid: i for i, cid in enumerate(self.coarse_ids)}
+        self.fine_index = {fid: i for i, fid in enumerate(self.fine_ids)}
+        F, C = len(self.fine_ids), len(self.coarse_ids)
+
+        self.fine_coarse = np.array([coarse_index.get(d.get("parentCoarse"), -1) for d in fine])
+        weights = np.array([d.get("aggregationWeight", 1.0) for d in fine])
+        # Fine -> coarse weighted average (ComputeCoarseSatisfaction)
+        self.aggregate = np.zeros((F, C))
+        for f, c in enumerate(self.fine_coarse):
+            if c >= 0:
+                self.aggregate[f, c] = weights[f]
+        sums = self.aggregate.sum(axis=0)
+        self.aggregate /= np.where(sums > 0, sums, 1.0)
+        self.average_columns = np.array([coarse_index[c] for c in AVERAGE_SATISFACTION_DIMENSIONS
+                                         if c in coarse_index])
+
+        # Classes
+        generation = mechanics.get("characterGeneration", {})
+        decay_rates = mechanics.get("cravingDecayRates", {})
+        emigration = mechanics.get("consequenceThresholds", {}).get("emigration", {})
+        distribution = generation.get("classDistribution", {})
+        ranges = generation.get("startingSatisfactionRanges", {})
+        self.class_ids = [c["id"] for c in classes["classes"]]
+        K = len(self.class_ids)
+        self.class_base = np.zeros((K, F))
+        self.class_decay = np.ones((K, C))
+        self.start_low = np.full((K, C), np.nan)
+        self.start_high = np.full((K, C), np.nan)
+        self.class_share = np.zeros(K)
+        self.emigration_threshold = np.zeros(K)
+        self.emigration_cycles = np.zeros(K)
+        self.class_accepts = []
+        for k, cls in enumerate(classes["classes"]):
+            cid = cls["id"]
+            base = cls.get("baseCravingVector", {}).get("fine") or []
+            self.class_base[k, :len(base)] = np.array(base[:F], dtype=float)
+            for c, coarse_id in enumerate(self.coarse_ids):
+                rate = decay_rates.get(coarse_id)
+                if isinstance(rate, dict) and cid in rate:
+                    self.class_decay[k, c] = rate[cid]
+                if coarse_id in ranges.get(cid, {}):
+                    self.start_low[k, c], self.start_high[k, c] = ranges[cid][coarse_id]
+            self.class_share[k] = distribution.get(cid, 0.0)
+            self.emigration_threshold[k] = emigration.get("averageSatisfactionThreshold", {}).get(cid, 30)
+            self.emigration_cycles[k] = emigration.get("consecutiveLowSatisfactionCycles", {}).get(cid, 5)
+            self.class_accepts.append((
+                {q.lower() for q in cls.get("acceptedQualityTiers") or []},
+                {q.lower() for q in cls.get("rejectedQualityTiers") or []},
+            ))
+        self.emigration_enabled = emigration.get("enabled", False)
+        self.emigration_chance = emigration.get("emigrationChancePerCycle", 0.1)
+        self.critical_cravings_required = emigration.get("criticalCravingsRequired", 2)
+
+        # Traits: the generator draws from consumption_mechanics, multipliers
+        # come from character_traits (unknown traits or null entries are 1.0)
+        multipliers = {t["id"]: t.get("cravingMultipliers", {}).get("fine") or []
+                       for t in traits.get("traits", [])}
+        self.trait_ids = [t["id"] for t in generation.get("traits", {}).get("available", [])]
+        self.trait_mult = np.ones((len(self.trait_ids), F))
+        for t, tid in enumerate(self.trait_ids):
+            for f, value in enumerate(multipliers.get(tid, [])[:F]):
+                if value is not None:
+                    self.trait_mult[t, f] = value
+
+        # Commodities
+        commodities = fulfillment["commodities"]
+        self.commodity_ids = sorted(commodities)
+        M = len(self.commodity_ids)
+        self.points = np.zeros((M, F))
+        self.quality_mult = np.ones(M)
+        self.durable = np.zeros(M, dtype=bool)
+        self.permanent = np.zeros(M, dtype=bool)
+        self.duration = np.zeros(M)
+        self.effect_decay = np.zeros(M)
+        for m, cid in enumerate(self.commodity_ids):
+            data = commodities[cid]
+            for fid, value in (data.get("fulfillmentVector", {}).get("fine") or {}).items():
+                if fid in self.fine_index and value and value > 0:
+                    self.points[m, self.fine_index[fid]] = value
+            self.quality_mult[m] = (data.get("qualityMultipliers") or {}).get("basic", 1.0)
+            durability = data.get("durability", "consumable")
+            self.durable[m] = durability == "durable"
+            self.permanent[m] = durability == "permanent"
+            # A durable without durationCycles never wears out, as in CharacterV3
+            self.duration[m] = data.get("durationCycles") or np.inf
+            self.effect_decay[m] = data.get("effectDecayRate") or 0
+        self.owned_kind = self.durable | self.permanent
+        top = self.points.max(axis=1, keepdims=True)
+        self.primary = (self.points > 0) & (self.points >= top * PRIMARY_THRESHOLD)
+
+        # Fatigue (commodity_fatigue_rates.json)
+        rates = fatigue.get("commodities", {})
+        self.fatigue_rate = np.full(M, DEFAULT_FATIGUE_RATE)
+        self.fatigue_mod = np.ones((len(self.trait_ids), M))
+        trait_pos = {tid: t for t, tid in enumerate(self.trait_ids)}
+        for m, cid in enumerate(self.commodity_ids):
+            entry = rates.get(cid)
+            if not isinstance(entry, dict):
+                continue
+            self.fatigue_rate[m] = entry.get("baseFatigueRate", DEFAULT_FATIGUE_RATE)
+            for tid, modifier in (entry.get("fatigueModifiers") or {}).items():
+                if tid in trait_pos:
+                    self.fatigue_mod[trait_pos[tid], m] = modifier
+        returns = mechanics.get("commodityDiminishingReturns", {})
+        self.cooldown = returns.get("varietyCooldownSlots", 4)
+        self.min_fatigue = returns.get("minMultiplier", 0.25)
+        self.other_decay_after = returns.get("otherCommodityDecaySlots", 2)
+        self.other_decay_rate = returns.get("otherCommodityDecayRate", 1)
+
+        # Priority weights per fine dimension (missing coarse weights are 1.0)
+        weights = mechanics.get("priorityCalculation", {}).get("cravingPriorityWeights", {})
+        self.dimension_priorities = {cid: weights.get(cid, 1.0) for cid in self.coarse_ids}
+
+    def accepts(self, quality: str) -> np.ndarray:
+        """Per-class acceptance of a quality tier (CharacterV3:AcceptsQuality)."""
+        quality = quality.lower()
+        result = np.ones(len(self.class_ids), dtype=bool)
+        for k, (accepted, rejected) in enumerate(self.class_accepts):
+            if quality in rejected or (accepted and quality not in accepted):
+                result[k] = False
+        return result
+
+    def supply_vector(self, supply: dict) -> np.ndarray:
+        """Convert {commodity: units per cycle} to an array over commodity_ids."""
+        index = {cid: m for m, cid in enumerate(self.commodity_ids)}
+        vector = np.zeros(len(self.commodity_ids))
+        for cid, units in supply.items():
+            if cid not in index:
+                raise KeyError(f"Unknown commodity in supply: {cid}")
+            vector[index[cid]] = units
+        return vector
+
+
+@dataclass
+class Policy:
+    """Allocation policy (the game's allocationPolicy plus sweepable knobs).
+
+    fairness_weight scales the fairness penalty added to priority;
+    1.0 matches fairnessEnabled in the game. per_capita_cap limits the
+    units any character receives per cycle. With allow_partial=False a
+    request is granted in full or not at all.
+    """
+
+    priority_mode: str = "need_based"
+    fairness_weight: float = 0.0
+    per_capita_cap: Optional[float] = None
+    allow_partial: bool = True
+    dimension_priorities: Optional[dict] = None
+
+    def __post_init__(self):
+        if self.priority_mode not in PRIORITY_MODES:
+            raise ValueError(f"Unknown priority mode: {self.priority_mode}")
+
+
+@dataclass
+class Population:
+    """Identity arrays for N generated characters."""
+
+    class_index: np.ndarray
+    traits: np.ndarray
+    base_cravings: np.ndarray
+    satisfaction: np.ndarray
+    seed: Optional[int] = None
+
+    @classmethod
+    def generate(cls, data: CravingData, count: int, seed: Optional[int] = None,
+                 class_shares: Optional[dict] = None, trait_count: int = 2,
+                 classes: Optional[list] = None) -> "Population":
+        """Draw a reproducible population the way CharacterV3:New does.
+
+        classes fixes the class id of the first len(classes) characters;
+        the rest are drawn from class_shares.
+        """
+        rng = np.random.default_rng(seed)
+        shares = data.class_share.copy()
+        if class_shares:
+            shares = np.array([class_shares.get(cid, 0.0) for cid in data.class_ids])
+        shares = shares / shares.sum()
+        fixed = [data.class_ids.index(cid) for cid in (classes or [])[:count]]
+        drawn = rng.choice(len(data.class_ids), size=count - len(fixed), p=shares)
+        # Grouped by class so the simulator can work on contiguous slices
+        class_index = np.sort(np.concatenate([np.array(fixed, dtype=drawn.dtype), drawn]))
+
+        T = len(data.trait_ids)
+        trait_count = min(trait_count, T)
+        traits = np.argsort(rng.random((count, T)), axis=1)[:, :trait_count]
+        base = data.class_base[class_index] * data.trait_mult[traits].prod(axis=1)
+
+        # GenerateStartingSatisfactionFine: parent coarse range +/- 10
+        low = data.start_low[class_index][:, data.fine_coarse]
+        high = data.start_high[class_index][:, data.fine_coarse]
+        missing = np.isnan(low)
+        low = np.where(missing, 50, low)
+        high = np.where(missing, 50, high)
+        sat = np.floor(low + rng.random(low.shape) * (high - low + 1))
+        sat += rng.integers(-10, 11, size=sat.shape)
+        sat = np.clip(sat, SATISFACTION_MIN, SATISFACTION_MAX)
+        return cls(class_index, traits, base, sat, seed)
+
+    def __len__(self) -> int:
+        return len(self.class_index)
+
+
+@dataclass
+class History:
+    """Per-cycle town metrics recorded by Simulation.run."""
+
+    columns: dict = field(default_factory=dict)
+
+    def append(self, row: dict):
+        for key, value in row.items():
+            self.columns.setdefault(key, []).append(value)
+
+    def arrays(self) -> dict:
+        return {key: np.asarray(values) for key, values in self.columns.items()}
+
+    def save(self, path: Path):
+        """Write as .npz, .csv or .json depending on the suffix."""
+        arrays = self.arrays()
+        if path.suffix == ".npz":
+            np.savez_compressed(path, **arrays)
+        elif path.suffix == ".csv":
+            keys = list(arrays)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(",".join(keys) + "\n")
+                for row in zip(*(arrays[k] for k in keys)):
+                    f.write(",".join(f"{v:.6g}" if isinstance(v, float) else str(v) for v in row) + "\n")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({k: v.tolist() for k, v in arrays.items()}, f)
+
+
+def gini(values: np.ndarray) -> float:
+    """Gini coefficient of non-negative values (0 = equal, 1 = unequal)."""
+    values = np.sort(np.clip(values, 0, None))
+    n = len(values)
+    total = values.sum()
+    if n == 0 or total <= 0:
+        return 0.0
+    ranks = np.arange(1, n + 1)
+    return float(((2 * ranks - n - 1) * values).sum() / (n * total))
+
+
+def idle_cravings(cravings: np.ndarray, base: np.ndarray, cap: np.ndarray, cycles) -> np.ndarray:
+    """Cravings after `cycles` cycles with nothing consumed: min(c + n * base, cap)."""
+    return np.minimum(cravings + np.asarray(cycles) * base, cap)
+
+
+def idle_craving_sum(cravings: np.ndarray, base: np.ndarray, cap: np.ndarray, cycles) -> np.ndarray:
+    """Sum over the next `cycles` idle cycles of each cycle's grown cravings.
+
+    The arithmetic series c + k * base runs until the cap is reached; the
+    remaining cycles each contribute the cap.
+    """
+    c = np.asarray(cravings, dtype=float)
+    b = np.asarray(base, dtype=float)
+    n = np.asarray(cycles, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        below = np.where(b > 0, np.ceil((cap - c) / b) - 1, np.inf)
+    below = np.clip(below, 0, n)
+    return below * c + b * below * (below + 1) / 2 + (n - below) * cap
+
+
+def first_cycle_above(cravings: np.ndarray, base: np.ndarray, threshold: float = CRAVING_THRESHOLD) -> np.ndarray:
+    """First idle cycle (1-based) whose grown craving exceeds threshold; inf if never."""
+    c = np.asarray(cravings, dtype=float)
+    b = np.asarray(base, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = np.where(b > 0, np.floor((threshold - c) / b) + 1, np.inf)
+    return np.where(c > threshold, 1.0, first)
+
+
+def penalty_total(days, settings: dict) -> np.ndarray:
+    """Sum of the unmet-craving penalties for streak days 1..days.
+
+    Day d costs 0.5 + 0.5 d / bufferDays up to the buffer, then
+    min(10, decayMultiplier * exp((d - bufferDays) * decayExponent)).
+    """
+    buffer = settings["bufferDays"]
+    exponent = settings["decayExponent"]
+    multiplier = settings["decayMultiplier"]
+    d = np.asarray(days, dtype=float)
+    early = np.minimum(d, buffer)
+    total = 0.5 * early + 0.25 * early * (early + 1) / buffer
+    late = np.maximum(d - buffer, 0)
+    if multiplier >= 10:
+        return total + 10.0 * late
+    if exponent <= 0:
+        return total + multiplier * late
+    uncapped = np.minimum(late, np.floor(np.log(10.0 / multiplier) / exponent))
+    ratio = np.exp(exponent)
+    total += multiplier * ratio * np.expm1(exponent * uncapped) / (ratio - 1)
+    return total + 10.0 * (late - uncapped)
+
+
+class Simulation:
+    """Batched consumption cycle over a whole population.
+
+    State is float32. Per-commodity state (fatigue, owned durables) is
+    stored commodity-major so the few commodities in play each round are
+    contiguous rows.
+    """
+
+    def __init__(self, data: CravingData, population: Population, policy: Policy = None,
+                 supply: Optional[np.ndarray] = None, difficulty: str = "normal",
+                 quality: str = "basic", rounds: int = 3, seed: Optional[int] = None):
+        self.data = data
+        self.population = population
+        self.policy = policy or Policy()
+        self.rounds = rounds
+        self.difficulty = DIFFICULTY_SETTINGS[difficulty]
+        self.rng = np.random.default_rng(seed if seed is not None else population.seed)
+
+        N, F, M = len(population), len(data.fine_ids), len(data.commodity_ids)
+        f32 = np.float32
+        self.supply = supply if supply is not None else np.zeros(M)
+        self.inventory = np.zeros(M)
+        self.cycle = 0
+
+        cls = population.class_index
+        # Contiguous class slices (Population.generate groups characters by class)
+        bounds = np.searchsorted(cls, np.arange(len(data.class_ids) + 1))
+        self.class_slices = [(k, slice(bounds[k], bounds[k + 1]))
+                             for k in range(len(data.class_ids)) if bounds[k] < bounds[k + 1]]
+
+        self.base = population.base_cravings.astype(f32)
+        self.cap = np.maximum(self.base * MAX_CRAVING_MULTIPLIER, 50.0).astype(f32)
+        self.cravings = self.base * STARTING_CRAVING_CYCLES
+        self.sat_fine = population.satisfaction.astype(f32)
+        self.decay = (data.class_decay[cls][:, data.fine_coarse] * SATISFACTION_DECAY_SCALE).astype(f32)
+        self.decay_slope = self.decay / f32(50.0)
+        self.aggregate = data.aggregate.astype(f32)
+        self.points = data.points.astype(f32)
+        self.active = np.ones(N, dtype=bool)
+        self.streak = np.zeros((N, F), dtype=np.int16)   # >0 met cycles, <0 unmet cycles
+        self.penalty_by_streak = self._streak_penalties()
+        self.gain_by_streak = self._streak_gains()
+        self.fairness = np.zeros(N)
+        self.low_cycles = np.zeros(N, dtype=np.int32)
+        self.last_consumed = np.full(N, -1, dtype=np.int64)
+
+        # What each class may be offered at the assumed quality tier
+        accepts = data.accepts(quality)
+        self.class_offer = data.primary[None, :, :] & accepts[:, None, None]
+
+        # Fatigue state (commodity-major) and per-character fatigue rates
+        traits = population.traits
+        self.fatigue_rate = (data.fatigue_rate[:, None] *
+                             data.fatigue_mod[traits].prod(axis=1).T).astype(f32)   # M x N
+        self.fatigue_count = np.zeros((M, N), dtype=np.int16)
+        self.fatigue_last = np.full((M, N), -10**6, dtype=np.int32)
+        # fatigue_multiplier of every pair, updated where consumption, decay
+        # or the cooldown changes it. First consumptions per cycle, as flat
+        # commodity * N + character indices: [(cycle, indices)] for the
+        # cycles still within the cooldown, and this cycle's so far
+        self.fatigue_mult = np.ones((M, N), dtype=f32)
+        self.recent_hits = []
+        self.hits_now = []
+
+        # Durable/permanent effects (commodity-major)
+        self.owned_cols = np.flatnonzero(data.owned_kind & (data.points.sum(axis=1) > 0))
+        self.owned_pos = np.full(M, -1)
+        self.owned_pos[self.owned_cols] = np.arange(len(self.owned_cols))
+        self.effectiveness = np.zeros((len(self.owned_cols), N), dtype=f32)
+        self.remaining = np.zeros((len(self.owned_cols), N), dtype=f32)
+        self.owned_points = self.points[self.owned_cols]
+        self.owned_decay = data.effect_decay[self.owned_cols].astype(f32)[:, None]
+
+        weights = self.policy.dimension_priorities or data.dimension_priorities
+        self.priority_weights = np.array([weights.get(data.coarse_ids[c], 1.0) if c >= 0 else 1.0
+                                          for c in data.fine_coarse], dtype=f32)
+
+    # -- state helpers -------------------------------------------------------
+
+    def coarse_satisfaction(self) -> np.ndarray:
+        return self.sat_fine @ self.aggregate
+
+    def average_satisfaction(self) -> np.ndarray:
+        return self.coarse_satisfaction()[:, self.data.average_columns].mean(axis=1)
+
+    def fatigue_multiplier(self, cols: np.ndarray, cycle: Optional[int] = None) -> np.ndarray:
+        """CharacterV3:CalculateCommodityMultiplier for cols x characters.
+
+        cycle defaults to the current one; a later cycle gives the multiplier
+        after an idle stretch, since only the cooldown changes it meanwhile.
+        """
+        data = self.data
+        since = (self.cycle if cycle is None else cycle) - self.fatigue_last[cols]
+        mult = np.exp(-self.fatigue_count[cols] * self.fatigue_rate[cols])
+        np.maximum(mult, data.min_fatigue, out=mult)
+        # mult <= 1, so this resets it wherever the cooldown has passed
+        np.maximum(mult, since > data.cooldown, out=mult)
+        return mult
+
+    def _priority(self) -> np.ndarray:
+        policy = self.policy
+        mode = policy.priority_mode
+        if mode == "need_based":
+            priority = (self.cravings @ self.priority_weights).astype(float)
+        elif mode == "equality":
+            priority = 100 + self.rng.integers(0, 11, size=len(self.active)).astype(float)
+        elif mode == "highest_craving":
+            priority = self.cravings.max(axis=1).astype(float)
+        elif mode == "lowest_satisfaction":
+            priority = -self.average_satisfaction().astype(float)
+        elif mode == "oldest_consumption":
+            priority = (self.cycle - self.last_consumed).astype(float)
+        else:  # round_robin
+            n = len(self.active)
+            priority = -((np.arange(n) + self.cycle) % n).astype(float)
+        if policy.fairness_weight:
+            priority += policy.fairness_weight * self.fairness
+        return priority
+
+    # -- cycle ---------------------------------------------------------------
+
+    def step(self) -> dict:
+        """Advance one cycle and return its town metrics."""
+        N, F = self.cravings.shape
+        active = self.active
+
+        self.inventory += self.supply
+        np.minimum(self.cravings + self.base, self.cap, out=self.cravings)
+        self._expire_fatigue()
+        self._apply_owned_effects()
+
+        # Priority order over active characters
+        priority = self._priority()
+        order = np.flatnonzero(active)
+        order = order[np.argsort(-priority[order], kind="stable")]
+
+        needed = self.cravings > CRAVING_THRESHOLD
+        needed &= active[:, None]
+        reduction = np.zeros((N, F), dtype=np.float32)
+        budget = None
+        if self.policy.per_capita_cap is not None:
+            budget = np.full(N, float(self.policy.per_capita_cap))
+        units_total = 0.0
+
+        for _ in range(self.rounds):
+            units = self._allocation_round(order, reduction, budget)
+            if not units:
+                break
+            units_total += units
+        consumed = reduction.any(axis=1)
+
+        # Streaks, gains and penalties (CharacterV3 Layer 8)
+        met = reduction > 0
+        unmet = needed & ~met
+        self._update_streaks(met, unmet)
+        self._apply_streak_effects(reduction, unmet)
+
+        # Fairness penalty: reset by success, +50 per failure after the last success
+        any_met = met.any(axis=1)
+        last_met = np.where(any_met, F - 1 - np.argmax(met[:, ::-1], axis=1), -1)
+        failures_after = (unmet & (np.arange(F)[None, :] > last_met[:, None])).sum(axis=1)
+        self.fairness = np.where(any_met, 0.0, self.fairness) + FAIRNESS_PENALTY_STEP * failures_after
+        self.last_consumed[consumed] = self.cycle
+
+        self._decay_other_fatigue(consumed)
+        self._end_cycle_hits()
+
+        # UpdateSatisfaction: decay accelerates with unfulfilled cravings
+        decay = self.cravings * self.decay_slope
+        decay += self.decay
+        decay[~active] = 0
+        self.sat_fine -= decay
+        np.clip(self.sat_fine, SATISFACTION_MIN, SATISFACTION_MAX, out=self.sat_fine)
+
+        average = self.average_satisfaction()
+        emigrated = self._check_emigration(average)
+        self.cycle += 1
+
+        alive = average[self.active].astype(float)
+        return {
+            "cycle": self.cycle,
+            "population": int(self.active.sum()),
+            "emigrated": int(emigrated),
+            "mean_satisfaction": float(alive.mean()) if alive.size else 0.0,
+            "min_satisfaction": float(alive.min()) if alive.size else 0.0,
+            "max_satisfaction": float(alive.max()) if alive.size else 0.0,
+            "gini": gini(alive),
+            "units_consumed": float(units_total),
+            "unmet_cravings": int(unmet.sum()),
+            "fulfilled_cravings": int((needed & met).sum()),
+        }
+
+    def _allocation_round(self, order: np.ndarray, reduction: np.ndarray,
+                          budget: Optional[np.ndarray]) -> float:
+        """One batched pass: every open craving requests its best commodity.
+
+        Adds the craving reduction to `reduction` and returns units granted.
+        """
+        data = self.data
+        N = len(self.active)
+        available = self.inventory >= 1
+        if not available.any():
+            return 0.0
+
+        # Best commodity per class and fine dimension (CommodityCache order)
+        offer = self.class_offer & available[None, :, None]
+        scored = np.where(offer, data.points[None, :, :], 0.0)
+        best = scored.argmax(axis=1)                          # K x F
+        best_points = np.take_along_axis(scored, best[:, None, :], axis=1)[:, 0, :]
+        cols = np.unique(best[best_points > 0])
+        if cols.size == 0:
+            return 0.0
+        col_of = np.searchsorted(cols, best)
+
+        # Units each character wants of each commodity: the largest need among
+        # the dimensions it serves (consuming them also drains the smaller ones)
+        demand = np.zeros((cols.size, N), dtype=np.float32)
+        cravings_t = self.cravings.T
+        for k, rows in self.class_slices:
+            points = best_points[k]
+            dims = np.flatnonzero(points > 0)
+            if not dims.size:
+                continue
+            dims = dims[np.argsort(col_of[k, dims], kind="stable")]
+            groups = col_of[k, dims]
+            bounds = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1], True])
+            crave = cravings_t[dims, rows]                    # dims x class rows
+            per_dim = np.ceil(crave / np.maximum(points[dims], 1.0).astype(np.float32)[:, None])
+            per_dim *= crave > CRAVING_THRESHOLD
+            starts, sizes = bounds[:-1], np.diff(bounds)
+            single = starts[sizes == 1]
+            demand[groups[single], rows] = per_dim[single]
+            for start, end in zip(starts[sizes > 1], bounds[1:][sizes > 1]):
+                np.max(per_dim[start:end], axis=0, out=demand[groups[start], rows])
+
+        fatigue = self.fatigue_mult[cols]
+        demand *= fatigue >= MIN_ALLOCATION_FATIGUE
+        positions = self.owned_pos[cols]
+        owned = positions >= 0
+        if owned.any():
+            holds = self.effectiveness[positions[owned]] > 0
+            demand[owned] = np.minimum(demand[owned], ~holds)
+
+        if budget is not None:
+            # Per-capita cap: fill requests in commodity order until the
+            # character's remaining budget runs out
+            before = np.cumsum(demand, axis=0) - demand
+            demand = np.clip(budget[None, :].astype(np.float32) - before, 0, demand)
+
+        stock = np.floor(self.inventory[cols]).astype(np.float32)
+        hit_c, hit_r, units = self._ration(demand, order, stock)
+        if not units.size:
+            return 0.0
+        grant = np.zeros_like(demand)
+        grant[hit_c, hit_r] = units
+        granted = grant.sum(axis=1)
+        self.inventory[cols] -= granted
+        if budget is not None:
+            budget -= grant.sum(axis=0)
+
+        # FulfillCraving for all grants at once
+        m = cols[hit_c]
+        effective = grant
+        effective[hit_c, hit_r] = units * fatigue[hit_c, hit_r] * data.quality_mult[m].astype(np.float32)
+        gained = effective.T @ self.points[cols]
+        self.cravings -= gained
+        np.maximum(self.cravings, 0, out=self.cravings)
+        reduction += gained
+
+        # Fatigue history for consumed commodities
+        since = self.cycle - self.fatigue_last[m, hit_r]
+        self.fatigue_count[m, hit_r] = np.where(since <= data.cooldown, self.fatigue_count[m, hit_r] + 1, 1)
+        self.fatigue_last[m, hit_r] = self.cycle
+        self.fatigue_mult[m, hit_r] = self._fatigue_at(m, hit_r)
+        first = since > 0
+        self.hits_now.append(m[first] * N + hit_r[first])
+
+        # Newly acquired durables/permanents
+        acquired = owned[hit_c]
+        if acquired.any():
+            m, who = m[acquired], hit_r[acquired]
+            self.effectiveness[self.owned_pos[m], who] = 1.0
+            self.remaining[self.owned_pos[m], who] = np.where(data.durable[m], data.duration[m], np.inf)
+
+        return float(granted.sum())
+
+    def _ration(self, demand: np.ndarray, order: np.ndarray, stock: np.ndarray) -> tuple:
+        """Grant each commodity's stock down the priority order.
+
+        Everyone before the running total passes the stock is served in
+        full, the one it passes on gets the remainder (if partial grants are
+        allowed). Returns (commodity rows, characters, units) of the grants.
+        Works through the order in growing blocks and drops a commodity once
+        its stock is spent, so a scarce commodity never scans the whole town.
+        """
+        hit_c, hit_r, units = [], [], []
+        # Commodities that cannot run out, whatever the float32 rounding of
+        # the running total, serve every request as it stands
+        plenty = (demand.sum(axis=1, dtype=np.float64) * (1 + order.size * 2.0 ** -23) <= stock)
+        if plenty.any():
+            rows = np.flatnonzero(plenty)
+            c, r = np.divmod(np.flatnonzero(demand[rows] > 0), demand.shape[1])
+            in_order = self.active[r]                   # order holds the active characters
+            c, r = c[in_order], r[in_order]
+            hit_c.append(rows[c])
+            hit_r.append(r)
+            units.append(demand[rows[c], r])
+
+        rows = np.flatnonzero((stock > 0) & ~plenty)
+        total = np.zeros(len(stock), dtype=np.float32)
+        start, size = 0, RATION_BLOCK
+        while rows.size and start < order.size:
+            who = order[start:start + size]
+            requested = demand[rows[:, None], who]
+            cumulative = requested.copy()
+            cumulative[:, 0] += total[rows]
+            np.cumsum(cumulative, axis=1, out=cumulative)
+            limit = stock[rows, None]
+            if self.policy.allow_partial:
+                grant = np.minimum(np.maximum(limit - (cumulative - requested), 0), requested)
+            else:
+                grant = np.where(cumulative <= limit, requested, 0)
+            c, r = np.divmod(np.flatnonzero(grant > 0), who.size)
+            hit_c.append(rows[c])
+            hit_r.append(who[r])
+            units.append(grant[c, r])
+            total[rows] = cumulative[:, -1]
+            rows = rows[total[rows] < stock[rows]]
+            start += size
+            size *= 2
+        if not hit_c:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+        return np.concatenate(hit_c), np.concatenate(hit_r), np.concatenate(units)
+
+    def _fatigue_at(self, m: np.ndarray, who: np.ndarray) -> np.ndarray:
+        """fatigue_multiplier for single (commodity, character) pairs."""
+        data = self.data
+        since = self.cycle - self.fatigue_last[m, who]
+        mult = np.exp(-self.fatigue_count[m, who] * self.fatigue_rate[m, who])
+        np.maximum(mult, data.min_fatigue, out=mult)
+        np.maximum(mult, since > data.cooldown, out=mult)
+        return mult
+
+    def _consumed_since(self, cycle: int) -> tuple:
+        """(commodities, characters) last consumed at or after `cycle`, once each."""
+        last = self.fatigue_last.ravel()
+        hits = [hits[last[hits] == c] for c, hits in self.recent_hits if c >= cycle]
+        hits += self.hits_now
+        if not hits:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        return np.divmod(np.concatenate(hits), len(self.active))
+
+    def _expire_fatigue(self):
+        """Reset fatigue_mult where the cooldown has passed since the last consumption."""
+        horizon = self.cycle - self.data.cooldown
+        last = self.fatigue_last.ravel()
+        for cycle, hits in self.recent_hits:
+            if cycle < horizon:
+                self.fatigue_mult.ravel()[hits[last[hits] == cycle]] = 1.0
+        self.recent_hits = [(cycle, hits) for cycle, hits in self.recent_hits if cycle >= horizon]
+
+    def _end_cycle_hits(self):
+        if self.hits_now:
+            self.recent_hits.append((self.cycle, np.concatenate(self.hits_now)))
+            self.hits_now = []
+
+    def _apply_owned_effects(self):
+        """UpdateActiveEffects + ApplyActiveEffectsSatisfaction, once per cycle."""
+        held_rows = np.flatnonzero((self.effectiveness > 0).any(axis=1))
+        if not held_rows.size:
+            return
+        eff = self.effectiveness[held_rows]
+        held = eff > 0
+        eff = np.maximum(0.1, eff * (1 - self.owned_decay[held_rows]))
+        eff *= held
+        remaining = self.remaining[held_rows] - held
+        eff *= remaining > 0
+        self.effectiveness[held_rows] = eff
+        self.remaining[held_rows] = remaining
+
+        gain = eff.T @ self.owned_points[held_rows]
+        self.cravings -= gain
+        np.maximum(self.cravings, 0, out=self.cravings)
+        gain *= SATISFACTION_GAIN_SCALE
+        self.sat_fine += gain
+        np.minimum(self.sat_fine, SATISFACTION_MAX, out=self.sat_fine)
+
+    def _decay_other_fatigue(self, consumed: np.ndarray):
+        """UpdateCommodityHistory's decay of other commodities, once per cycle.
+
+        Only pairs within the cooldown are visited: past it the count is no
+        longer read, and the next consumption restarts it.
+        """
+        if not consumed.any():
+            return
+        m, who = self._consumed_since(self.cycle - self.data.cooldown)
+        since = self.cycle - self.fatigue_last[m, who]
+        count = self.fatigue_count[m, who]
+        stale = (since >= self.data.other_decay_after) & consumed[who] & (count > 0)
+        m, who = m[stale], who[stale]
+        self.fatigue_count[m, who] = np.maximum(0, count[stale] - self.data.other_decay_rate)
+        self.fatigue_mult[m, who] = self._fatigue_at(m, who)
+
+    def _update_streaks(self, met: np.ndarray, unmet: np.ndarray):
+        # Met cycles extend a positive streak or restart it at 1, unmet ones
+        # likewise at -1; the step is added where each applies
+        s = self.streak
+        grow = np.maximum(s, 0) + 1
+        grow -= s
+        sink = np.minimum(s, 0) - 1
+        sink -= s
+        s += grow * met + sink * unmet
+
+    def _apply_streak_effects(self, reduction: np.ndarray, unmet: np.ndarray):
+        """Satisfaction gain with streak bonus, and streak-scaled penalties."""
+        boost = reduction * np.float32(SATISFACTION_GAIN_SCALE)
+        long_met = np.flatnonzero(self.streak > self.difficulty["bufferDays"])
+        if long_met.size:
+            boost.ravel()[long_met] *= self.gain_by_streak[self.streak.ravel()[long_met]]
+        self.sat_fine += boost
+
+        if unmet.any():
+            penalty = np.take(self.penalty_by_streak, self.streak.view(np.uint16))
+            penalty *= unmet
+            self.sat_fine -= penalty
+        np.clip(self.sat_fine, SATISFACTION_MIN, SATISFACTION_MAX, out=self.sat_fine)
+
+    def _streak_gains(self) -> np.ndarray:
+        """Gain multiplier for a met craving, indexed by its (positive) streak."""
+        settings = self.difficulty
+        days = np.maximum(np.arange(1 << 15) - settings["bufferDays"], 0)
+        return 1.0 + np.log1p(days / settings["gainLogScale"]) * settings["gainMultiplier"]
+
+    def _streak_penalties(self) -> np.ndarray:
+        """Penalty for an unmet craving, indexed by its streak read as uint16."""
+        settings = self.difficulty
+        buffer = settings["bufferDays"]
+        days = -np.arange(1 << 16).astype(np.int16).astype(np.float32)
+        with np.errstate(over="ignore"):    # capped at 10 anyway
+            return np.where(
+                days <= buffer,
+                0.5 + (days / buffer) * 0.5,
+                np.minimum(10.0, np.exp(np.maximum(days - buffer, 0) * settings["decayExponent"])
+                           * settings["decayMultiplier"]))
+
+    def _check_emigration(self, average: np.ndarray) -> int:
+        data = self.data
+        if not data.emigration_enabled:
+            return 0
+        cls = self.population.class_index
+        low = average < data.emigration_threshold[cls]
+        self.low_cycles = np.where(low, self.low_cycles + 1, 0)
+        candidates = self.active & (self.low_cycles >= data.emigration_cycles[cls])
+        rolls = self.rng.random(len(average)) < data.emigration_chance
+        leaving = np.zeros_like(candidates)
+        rows = np.flatnonzero(candidates)
+        if rows.size:
+            coarse_cravings = self.cravings[rows] @ self.aggregate
+            critical = (coarse_cravings > CRITICAL_CRAVING).sum(axis=1)
+            leaving[rows] = (critical >= data.critical_cravings_required) & rolls[rows]
+        self.active &= ~leaving
+        return int(leaving.sum())
+
+    # -- fast-forward ----------------------------------------------------------
+
+    def idle_horizon(self, limit: int) -> int:
+        """How many of the next cycles (up to limit) certainly consume nothing.
+
+        Nothing is consumed while no commodity offered to a class with
+        active characters has a unit in stock. Owned durables change
+        cravings every cycle, so holding any ends the horizon.
+        """
+        if (self.effectiveness > 0).any():
+            return 0
+        present = [k for k, rows in self.class_slices if self.active[rows].any()]
+        if not present:
+            return limit
+        offered = self.class_offer[present].any(axis=(0, 2))
+        stock = self.inventory[offered]
+        if (stock >= 1).any():
+            return 0
+        supply = self.supply[offered]
+        growing = supply > 0
+        if not growing.any():
+            return limit
+        first = np.ceil((1 - stock[growing]) / supply[growing]).min()
+        return int(min(limit, max(first - 1, 0)))
+
+    def predict_idle(self, cycles) -> dict:
+        """State after `cycles` cycles in which nothing is consumed.
+
+        cycles is a count or one count per character. Nothing is modified;
+        emigration is not applied (see fast_forward). Matches stepping up to
+        float32 rounding.
+        """
+        N = len(self.active)
+        n = np.broadcast_to(np.asarray(cycles, dtype=np.int64), (N,))[:, None]
+        active = self.active[:, None]
+
+        cravings = idle_cravings(self.cravings, self.base, self.cap, n).astype(np.float32)
+
+        # Needed cravings go unmet from their first cycle above the threshold
+        first = first_cycle_above(self.cravings, self.base)
+        unmet = np.where(active, np.clip(n - first + 1, 0, n), 0).astype(np.int64)
+        s0 = self.streak.astype(np.int64)
+        start = np.where(s0 < 0, -s0, 0)
+        streak = np.where(unmet > 0, -(start + unmet), s0)
+        penalty = penalty_total(start + unmet, self.difficulty) - penalty_total(start, self.difficulty)
+
+        decay = self.decay_slope * idle_craving_sum(self.cravings, self.base, self.cap, n) + self.decay * n
+        loss = np.where(active, penalty + decay, 0)
+        # Satisfaction only falls, so clipping once equals clipping every cycle
+        sat_fine = np.maximum(self.sat_fine - loss, SATISFACTION_MIN).astype(np.float32)
+
+        return {
+            "cravings": cravings,
+            "sat_fine": sat_fine,
+            "streak": np.maximum(streak, np.iinfo(np.int16).min).astype(np.int16),
+            "fairness": self.fairness + FAIRNESS_PENALTY_STEP * unmet.sum(axis=1),
+            "unmet_cravings": int(unmet.sum()),
+        }
+
+    def _idle_average(self, cycles) -> np.ndarray:
+        sat = self.predict_idle(cycles)["sat_fine"]
+        return (sat @ self.aggregate)[:, self.data.average_columns].mean(axis=1)
+
+    def _first_idle_cycle(self, condition, limit: int) -> np.ndarray:
+        """Per character, the first cycle in 1..limit where a monotone condition holds (limit + 1 if none)."""
+        N = len(self.active)
+        lo = np.ones(N, dtype=np.int64)
+        hi = np.full(N, limit + 1, dtype=np.int64)
+        while (lo < hi).any():
+            mid = (lo + hi) // 2
+            hit = condition(np.minimum(mid, limit)) & (mid <= limit)
+            hi = np.where(hit, mid, hi)
+            lo = np.where(hit, lo, mid + 1)
+            lo = np.minimum(lo, hi)
+        return lo
+
+    def _emigration_plan(self, limit: int) -> tuple:
+        """Plan an idle jump around emigration.
+
+        Returns the cycles before anyone may emigrate, the first low cycle
+        of each character and the characters that may already leave next
+        cycle. During an idle stretch satisfaction only falls and cravings
+        only grow, so "below the threshold" and "enough critical cravings"
+        stay true once reached and can be bisected.
+        """
+        data = self.data
+        N = len(self.active)
+        if not data.emigration_enabled or limit <= 0:
+            return limit, np.full(N, limit + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        cls = self.population.class_index
+        threshold = data.emigration_threshold[cls]
+        low_at = self._first_idle_cycle(lambda k: self._idle_average(k) < threshold, limit)
+        critical_at = self._first_idle_cycle(
+            lambda k: ((idle_cravings(self.cravings, self.base, self.cap, k[:, None]) @ self.aggregate)
+                       > CRITICAL_CRAVING).sum(axis=1) >= data.critical_cravings_required, limit)
+        carried = np.where(low_at == 1, self.low_cycles, 0)
+        candidate_at = low_at + np.maximum(data.emigration_cycles[cls] - carried, 1) - 1
+        leave_at = np.where(self.active, np.maximum(candidate_at, critical_at), limit + 1)
+        horizon = int(min(limit, leave_at.min() - 1))
+        return horizon, low_at, np.flatnonzero(leave_at <= 1)
+
+    def _advance_rng(self, cycles: int):
+        """Consume the random numbers `cycles` steps would have drawn."""
+        N = len(self.active)
+        draws = N if self.data.emigration_enabled else 0
+        if self.policy.priority_mode == "equality":
+            for _ in range(cycles):
+                self.rng.integers(0, 11, size=N)
+                if draws:
+                    self.rng.random(draws)
+        elif draws:
+            advance = getattr(self.rng.bit_generator, "advance", None)
+            if advance is not None:
+                advance(cycles * draws)
+            else:
+                for _ in range(cycles):
+                    self.rng.random(draws)
+
+    def _jump(self, cycles: int, low_at: np.ndarray) -> dict:
+        state = self.predict_idle(cycles)
+        self.cravings = state["cravings"]
+        self.sat_fine = state["sat_fine"]
+        self.streak = state["streak"]
+        self.fairness = state["fairness"]
+        if self.data.emigration_enabled:
+            low_now = low_at <= cycles
+            self.low_cycles = np.where(
+                low_now, np.where(low_at == 1, self.low_cycles + cycles, cycles - low_at + 1), 0
+            ).astype(self.low_cycles.dtype)
+        self.inventory += cycles * self.supply
+        self._advance_rng(cycles)
+        self.cycle += cycles
+
+        alive = self.average_satisfaction()[self.active].astype(float)
+        return {
+            "cycle": self.cycle,
+            "population": int(self.active.sum()),
+            "emigrated": 0,
+            "mean_satisfaction": float(alive.mean()) if alive.size else 0.0,
+            "min_satisfaction": float(alive.min()) if alive.size else 0.0,
+            "max_satisfaction": float(alive.max()) if alive.size else 0.0,
+            "gini": gini(alive),
+            "units_consumed": 0.0,
+            "unmet_cravings": state["unmet_cravings"],
+            "fulfilled_cravings": 0,
+        }
+
+    def fast_forward(self, cycles: int) -> History:
+        """Advance `cycles` cycles, jumping idle stretches in closed form.
+
+        Records one row per step or jump; a jump's row carries the unmet
+        cravings of every cycle it covers.
+        """
+        history = History()
+        end = self.cycle + cycles
+        # Characters able to emigrate stay able until they leave (while idle),
+        # so the plan is not redone until they are gone
+        leaving = np.zeros(0, dtype=np.int64)
+        while self.cycle < end:
+            horizon = 0
+            if not self.active[leaving].any():
+                horizon = self.idle_horizon(end - self.cycle)
+                if horizon > 0:
+                    horizon, low_at, leaving = self._emigration_plan(horizon)
+            if horizon > 0:
+                history.append(self._jump(horizon, low_at))
+            else:
+                history.append(self.step())
+        return history
+
+    def run(self, cycles: int, progress_every: int = 0) -> History:
+        history = History()
+        for i in range(cycles):
+            row = self.step()
+            history.append(row)
+            if progress_every and (i + 1) % progress_every == 0:
+                print(f"  cycle {row['cycle']:5d}  pop {row['population']:6d}  "
+                      f"mean {row['mean_satisfaction']:7.2f}  gini {row['gini']:.3f}  "
+                      f"units {row['units_consumed']:9.0f}")
+        return history
+
+
+def default_supply(data: CravingData, characters: int, per_capita: float) -> np.ndarray:
+    """Same per-capita amount of every commodity that fulfills something."""
+    useful = data.points.sum(axis=1) > 0
+    return np.where(useful, np.floor(per_capita * characters), 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized offline consumption simulator")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    parser.add_argument("--characters", type=int, default=1000, help="Population size")
+    parser.add_argument("--cycles", type=int, default=100, help="Cycles to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for population and rolls")
+    parser.add_argument("--supply", type=Path,
+                        help="JSON {commodity: units per cycle}; default is --per-capita of everything")
+    parser.add_argument("--per-capita", type=float, default=0.05,
+                        help="Units per character per cycle of each commodity when --supply is not given")
+    parser.add_argument("--priority-mode", choices=PRIORITY_MODES, default="need_based")
+    parser.add_argument("--fairness-weight", type=float, default=0.0)
+    parser.add_argument("--per-capita-cap", type=float, help="Max units per character per cycle")
+    parser.add_argument("--no-partial", action="store_true", help="Grant requests in full or not at all")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_SETTINGS), default="normal")
+    parser.add_argument("--quality", default="basic",
+                        help="Quality tier assumed for all commodities (the engine defaults to basic)")
+    parser.add_argument("--progress", type=int, default=0, help="Print metrics every N cycles")
+    parser.add_argument("--fast-forward", action="store_true",
+                        help="Jump idle stretches in closed form (one history row per step or jump)")
+    parser.add_argument("--output", type=Path, help="Write per-cycle history (.npz, .csv or .json)")
+    args = parser.parse_args()
+
+    data_dir = resolve_data_dir(args.version)
+    print(f"📂 Loading craving data from {data_dir.relative_to(REPO_ROOT)}")
+    data = CravingData(data_dir)
+    print(f"   {len(data.fine_ids)} fine / {len(data.coarse_ids)} coarse dimensions, "
+          f"{len(data.commodity_ids)} commodities, {len(data.class_ids)} classes")
+
+    if args.supply:
+        supply = data.supply_vector(load_path(args.supply))
+    else:
+        supply = default_supply(data, args.characters, args.per_capita)
+
+    policy = Policy(args.priority_mode, args.fairness_weight, args.per_capita_cap, not args.no_partial)
+    population = Population.generate(data, args.characters, seed=args.seed)
+    sim = Simulation(data, population, policy, supply, args.difficulty, args.quality)
+
+    print(f"🏃 Simulating {args.characters} characters for {args.cycles} cycles...")
+    start = time.perf_counter()
+    if args.fast_forward:
+        history = sim.fast_forward(args.cycles)
+    else:
+        history = sim.run(args.cycles, args.progress)
+    elapsed = time.perf_counter() - start
+
+    final = {k: v[-1] for k, v in history.arrays().items()}
+    print(f"\n✅ Done in {elapsed:.2f}s ({elapsed / max(args.cycles, 1) * 1000:.1f} ms/cycle)")
+    print(f"   Population:        {final['population']} ({args.characters - final['population']} emigrated)")
+    print(f"   Mean satisfaction: {final['mean_satisfaction']:.2f}")
+    print(f"   Min / max:         {final['min_satisfaction']:.2f} / {final['max_satisfaction']:.2f}")
+    print(f"   Gini:              {final['gini']:.3f}")
+
+    if args.output:
+        history.save(args.output)
+        print(f"💾 History written to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
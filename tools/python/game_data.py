@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Shared Game Data Access
+
+One place for the Python tools to find and read game data. Knows the
+data/versions.json layout (data/<version>/... via each version's
+dataPath, the active version by default) and keeps every parsed file in
+memory for the life of the process, so chained tools and notebooks parse
+each JSON file once:
+
+- load() parses a file on first use and returns the same object after
+  that (treat it as read-only; mutable=True returns a private copy)
+- each access stats the file; when size or mtime changed the file is
+  re-read, and only re-parsed if its SHA-256 differs
+- derived() memoizes anything computed from a file (indexes, arrays)
+  and drops it together with the parsed file
+- save() writes atomically (temporary file + rename), optionally after
+  one backup copy, and refreshes the memo
+- when a version has a bundle (build_data_bundle.py), the first access to
+  one of its files decodes the bundle once and takes every file whose size
+  and mtime still match the manifest from it
+
+Usage:
+    from game_data import load, index, resolve_data_dir
+    recipes = load("building_recipes.json")["recipes"]           # active version
+    buildings = index("building_types.json", "buildingTypes", version="base")
+    buildings["farm"]["workCategories"]
+
+    python tools/python/game_data.py                # list versions and data files
+    python tools/python/game_data.py --version base
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DATA_ROOT = REPO_ROOT / "data"
+VERSIONS_FILE = DATA_ROOT / "versions.json"
+
+# Written by build_data_bundle.py into each version directory
+BUNDLE_FILE = "bundle.json"
+BUNDLE_MANIFEST = "bundle.manifest.json"
+BUNDLE_FORMAT = 1
+
+_UNSET = object()
+
+
+class _Entry:
+    """A parsed file plus what was derived from it."""
+
+    __slots__ = ("path", "stat", "sha256", "_raw", "data", "derived")
+
+    def __init__(self, path: Path, stat: tuple, raw: Optional[bytes] = None,
+                 data=_UNSET, sha256: Optional[str] = None):
+        self.path = path
+        self.stat = stat
+        self._raw = raw
+        self.sha256 = sha256 or hashlib.sha256(raw).hexdigest()
+        self.data = json.loads(raw) if data is _UNSET else data
+        self.derived = {}
+
+    @property
+    def raw(self) -> bytes:
+        # Entries taken from a bundle read their bytes only when asked
+        if self._raw is None:
+            self._raw = self.path.read_bytes()
+        return self._raw
+
+
+_files: dict = {}
+_bundle_dirs: set = set()
+
+
+def _stat(path: Path) -> tuple:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _seed_from_bundle(path: Path):
+    """On first access under a version directory, take its fresh files from the bundle."""
+    if DATA_ROOT not in path.parents:
+        return
+    for directory in path.parents:
+        if directory in _bundle_dirs or directory == DATA_ROOT:
+            return
+        _bundle_dirs.add(directory)
+        manifest_path = directory / BUNDLE_MANIFEST
+        if not manifest_path.exists() or not (directory / BUNDLE_FILE).exists():
+            continue
+        manifest = json.loads(manifest_path.read_bytes())
+        if manifest.get("format") != BUNDLE_FORMAT:
+            return
+        fresh = {}
+        for rel, source in manifest.get("sources", {}).items():
+            source_path = directory / rel
+            try:
+                stat = _stat(source_path)
+            except OSError:
+                continue
+            if stat == (source["size"], source["mtime_ns"]) and source_path not in _files:
+                fresh[rel] = (source_path, stat, source["sha256"])
+        if fresh:
+            files = json.loads((directory / BUNDLE_FILE).read_bytes()).get("files", {})
+            for rel, (source_path, stat, sha) in fresh.items():
+                if rel in files:
+                    _files[source_path] = _Entry(source_path, stat, data=files[rel], sha256=sha)
+        return
+
+
+def _entry(path: Path) -> _Entry:
+    path = Path(path).resolve()
+    if path not in _files:
+        _seed_from_bundle(path)
+    stat = _stat(path)
+    entry = _files.get(path)
+    if entry is not None and entry.stat == stat:
+        return entry
+    raw = path.read_bytes()
+    if entry is not None and hashlib.sha256(raw).hexdigest() == entry.sha256:
+        # Touched but unchanged: keep the parsed data and derived forms
+        entry.stat = stat
+        return entry
+    entry = _Entry(path, stat, raw)
+    _files[path] = entry
+    return entry
+
+
+# -- versions -------------------------------------------------------------------
+
+def versions() -> dict:
+    """data/versions.json (memoized like any other file)."""
+    return _entry(VERSIONS_FILE).data
+
+
+def active_version() -> str:
+    return versions().get("activeVersion", "alpha")
+
+
+def version_ids() -> list:
+    return [entry["id"] for entry in versions().get("versions", [])]
+
+
+def resolve_data_dir(version: Optional[str] = None) -> Path:
+    """Return the data directory for a version listed in data/versions.json."""
+    version = version or active_version()
+    for entry in versions().get("versions", []):
+        if entry.get("id") == version:
+            return REPO_ROOT / entry.get("dataPath", f"data/{version}")
+    return DATA_ROOT / version
+
+
+def data_path(name: str, version: Optional[str] = None) -> Path:
+    """Path of a data file (e.g. "craving_system/commodity_cache.json") in a version."""
+    return resolve_data_dir(version) / name
+
+
+# -- loading --------------------------------------------------------------------
+
+def load_path(path: Path, mutable: bool = False):
+    """Parsed JSON at path, memoized; mutable=True returns a private copy."""
+    entry = _entry(path)
+    if mutable:
+        # Re-parsing the cached bytes is faster than deepcopy for these files
+        return json.loads(entry.raw)
+    return entry.data
+
+
+def load(name: str, version: Optional[str] = None, mutable: bool = False):
+    """Parsed data file of a version (the active one by default)."""
+    return load_path(data_path(name, version), mutable)
+
+
+def file_hash(name: str, version: Optional[str] = None) -> str:
+    """SHA-256 of a data file's current contents."""
+    return _entry(data_path(name, version)).sha256
+
+
+def derived(path: Path, key, builder: Callable):
+    """builder(parsed data), computed once per content of the file at path."""
+    entry = _entry(path)
+    if key not in entry.derived:
+        entry.derived[key] = builder(entry.data)
+    return entry.derived[key]
+
+
+def index(name: str, collection: str, key: str = "id", version: Optional[str] = None) -> dict:
+    """{item[key]: item} over a file's list (e.g. building_types.json "buildingTypes")."""
+    return derived(data_path(name, version), ("index", collection, key),
+                   lambda data: {item[key]: item for item in data.get(collection, []) if key in item})
+
+
+def group(name: str, collection: str, key: str, version: Optional[str] = None) -> dict:
+    """{item[key]: [items]} (e.g. recipes grouped by "buildingType")."""
+    def build(data):
+        groups = {}
+        for item in data.get(collection, []):
+            groups.setdefault(item.get(key), []).append(item)
+        return groups
+    return derived(data_path(name, version), ("group", collection, key), build)
+
+
+def invalidate(path: Optional[Path] = None):
+    """Forget one file (or everything) so the next access re-reads it."""
+    if path is None:
+        _files.clear()
+        _bundle_dirs.clear()
+    else:
+        _files.pop(Path(path).resolve(), None)
+
+
+# -- saving ---------------------------------------------------------------------
+
+def save_path(path: Path, data, indent: int = 2, backup: Optional[Path] = None) -> Path:
+    """Write JSON atomically; copy the current file to backup first if given."""
+    path = Path(path)
+    if backup is not None and path.exists():
+        shutil.copy2(path, backup)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+    invalidate(path)
+    return path
+
+
+def save(name: str, data, version: Optional[str] = None, indent: int = 2,
+         backup: Optional[Path] = None) -> Path:
+    return save_path(data_path(name, version), data, indent, backup)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List game data versions and files")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    args = parser.parse_args()
+
+    print(f"📂 {VERSIONS_FILE.relative_to(REPO_ROOT)}: active version '{active_version()}'")
+    for vid in version_ids():
+        print(f"   {'*' if vid == active_version() else ' '} {vid:8s} {resolve_data_dir(vid).relative_to(REPO_ROOT)}")
+
+    data_dir = resolve_data_dir(args.version)
+    if not data_dir.is_dir():
+        print(f"❌ No data directory {data_dir}")
+        return 1
+    print(f"\n{data_dir.relative_to(REPO_ROOT)}:")
+    for path in sorted(data_dir.rglob("*.json")):
+        print(f"   {str(path.relative_to(data_dir)):45s} {path.stat().st_size / 1024:8.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,41 @@
 #!/usr/bin/env python3
-"""Generate simple 64x64 top-down sprites for each building type."""
+"""Generate simple 64x64 top-down sprites for each building type.
+
+Only building types whose entry in building_types.json or whose renderer
+changed since the last run are redrawn (see CACHE_PATH); many stale types
+are drawn across a process pool.
+
+Usage:
+    python tools/python/generate_building_sprites.py
+    python tools/python/generate_building_sprites.py --force     # redraw everything
+"""
 from __future__ import annotations
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import inspect
 import json
 import math
+import os
 from pathlib import Path
 import struct
+import sys
+import time
 import zlib
 
+import numpy as np
+
+from game_data import REPO_ROOT, load, load_path, save_path
+
 SIZE = 64
-DATA_PATH = Path("data/base/building_types.json")
+DATA_VERSION = "base"
 OUTPUT_DIR = Path("assets/buildings")
+# Hash of each building entry and its renderer, and the stats of the PNGs last written from it
+CACHE_PATH = REPO_ROOT / ".cache" / "sprite_cache.json"
+# Fewer stale building types than this are drawn without a process pool
+PARALLEL_MIN = 16
 
 
 def clamp_byte(value: float) -> int:
@@ -22,89 +47,94 @@ def with_alpha(rgb, alpha=255):
     return clamp_byte(r), clamp_byte(g), clamp_byte(b), clamp_byte(alpha)
 
 
+def _tone(color, result):
+    """Return result as a color tuple if color was one, else as a uint8 array."""
+    result = np.clip(np.rint(result), 0, 255).astype(np.uint8)
+    return tuple(int(c) for c in result) if isinstance(color, tuple) else result
+
+
 def lighten(color, amount):
-    r, g, b, a = color
-    return (
-        clamp_byte(r + (255 - r) * amount),
-        clamp_byte(g + (255 - g) * amount),
-        clamp_byte(b + (255 - b) * amount),
-        a,
-    )
+    """Move RGB toward white; color is an RGBA tuple or an (..., 4) array."""
+    rgba = np.asarray(color, dtype=np.float64)
+    out = rgba.copy()
+    out[..., :3] += (255 - rgba[..., :3]) * amount
+    return _tone(color, out)
 
 
 def darken(color, amount):
-    r, g, b, a = color
-    return (
-        clamp_byte(r * (1 - amount)),
-        clamp_byte(g * (1 - amount)),
-        clamp_byte(b * (1 - amount)),
-        a,
-    )
+    rgba = np.asarray(color, dtype=np.float64)
+    out = rgba.copy()
+    out[..., :3] *= 1 - amount
+    return _tone(color, out)
 
 
 def mix(color_a, color_b, t):
-    r1, g1, b1, a1 = color_a
-    r2, g2, b2, a2 = color_b
-    return (
-        clamp_byte(r1 * (1 - t) + r2 * t),
-        clamp_byte(g1 * (1 - t) + g2 * t),
-        clamp_byte(b1 * (1 - t) + b2 * t),
-        clamp_byte(a1 * (1 - t) + a2 * t),
-    )
+    a = np.asarray(color_a, dtype=np.float64)
+    b = np.asarray(color_b, dtype=np.float64)
+    return _tone(color_a, a * (1 - t) + b * t)
+
+
+def _rgba(color):
+    if not (isinstance(color, tuple) and len(color) == 4):
+        raise TypeError(f"Color must be RGBA tuple, got {color}")
+    return color
+
+
+@lru_cache(maxsize=None)
+def _grid(size):
+    return np.ogrid[:size, :size]
 
 
 class Canvas:
+    """size x size x 4 uint8 RGBA pixels; shapes are drawn as slice or mask fills."""
+
     def __init__(self, size=SIZE, background=(0, 0, 0, 0)):
         self.size = size
-        self.pixels = [[background for _ in range(size)] for _ in range(size)]
+        self.pixels = np.empty((size, size, 4), dtype=np.uint8)
+        self.pixels[:] = _rgba(background)
+        self._ys, self._xs = _grid(size)
 
     def fill(self, color):
-        if not (isinstance(color, tuple) and len(color) == 4):
-            raise TypeError(f"Color must be RGBA tuple, got {color}")
-        for y in range(self.size):
-            row = self.pixels[y]
-            for x in range(self.size):
-                row[x] = color
+        self.pixels[:] = _rgba(color)
 
     def set_pixel(self, x, y, color):
         if 0 <= x < self.size and 0 <= y < self.size:
-            if not (isinstance(color, tuple) and len(color) == 4):
-                raise TypeError(f"Color must be RGBA tuple, got {color}")
-            self.pixels[y][x] = color
+            self.pixels[y, x] = _rgba(color)
 
     def fill_rect(self, x0, y0, x1, y1, color):
-        if not (isinstance(color, tuple) and len(color) == 4):
-            raise TypeError(f"Color must be RGBA tuple, got {color}")
-        for y in range(max(0, y0), min(self.size, y1)):
-            row = self.pixels[y]
-            for x in range(max(0, x0), min(self.size, x1)):
-                row[x] = color
+        color = _rgba(color)
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.size, x1), min(self.size, y1)
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = color
 
     def stroke_rect(self, x0, y0, x1, y1, color):
-        for x in range(x0, x1):
-            self.set_pixel(x, y0, color)
-            self.set_pixel(x, y1 - 1, color)
-        for y in range(y0, y1):
-            self.set_pixel(x0, y, color)
-            self.set_pixel(x1 - 1, y, color)
+        if x0 < x1:
+            self.fill_rect(x0, y0, x1, y0 + 1, color)
+            self.fill_rect(x0, y1 - 1, x1, y1, color)
+        if y0 < y1:
+            self.fill_rect(x0, y0, x0 + 1, y1, color)
+            self.fill_rect(x1 - 1, y0, x1, y1, color)
+
+    def _fill_disc(self, cx, cy, radius, color, inner2=None):
+        """Pixels of the bounding box within radius (and at least inner2 away, squared)."""
+        color = _rgba(color)
+        y0, y1 = max(0, int(cy - radius)), min(self.size, int(cy + radius) + 1)
+        x0, x1 = max(0, int(cx - radius)), min(self.size, int(cx + radius) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        dist2 = (self._xs[:, x0:x1] - cx) ** 2 + (self._ys[y0:y1] - cy) ** 2
+        mask = dist2 <= radius * radius
+        if inner2 is not None:
+            mask &= dist2 >= inner2
+        self.pixels[y0:y1, x0:x1][mask] = color
 
     def draw_circle(self, cx, cy, radius, color):
-        r2 = radius * radius
-        for y in range(int(cy - radius), int(cy + radius) + 1):
-            for x in range(int(cx - radius), int(cx + radius) + 1):
-                if (x - cx) * (x - cx) + (y - cy) * (y - cy) <= r2:
-                    self.set_pixel(x, y, color)
+        self._fill_disc(cx, cy, radius, color)
 
     def draw_ring(self, cx, cy, radius, thickness, color):
-        r_outer = radius
         r_inner = max(0, radius - thickness)
-        outer2 = r_outer * r_outer
-        inner2 = r_inner * r_inner
-        for y in range(int(cy - r_outer), int(cy + r_outer) + 1):
-            for x in range(int(cx - r_outer), int(cx + r_outer) + 1):
-                dist2 = (x - cx) * (x - cx) + (y - cy) * (y - cy)
-                if inner2 <= dist2 <= outer2:
-                    self.set_pixel(x, y, color)
+        self._fill_disc(cx, cy, radius, color, inner2=r_inner * r_inner)
 
     def draw_line(self, x0, y0, x1, y1, color):
         dx = abs(x1 - x0)
@@ -126,14 +156,12 @@ class Canvas:
 
 
 def write_png(path: Path, pixels):
-    height = len(pixels)
-    width = len(pixels[0]) if pixels else 0
-    raw = bytearray()
-    for row in pixels:
-        raw.append(0)
-        for r, g, b, a in row:
-            raw.extend((r, g, b, a))
-    compressor = zlib.compress(bytes(raw))
+    pixels = np.asarray(pixels, dtype=np.uint8)
+    height, width = pixels.shape[:2]
+    # Filter byte 0 (none) before each row
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 4)
+    compressor = zlib.compress(raw.tobytes())
 
     def chunk(tag, data):
         return (
@@ -575,29 +603,125 @@ def render_generic(canvas, palette, data, level_info):
                     )
 
 
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def renderer_hashes():
+    """Hash of each renderer's source together with everything else in this file.
+
+    Editing one render_* function only changes the hash of the buildings it
+    draws; any other edit (Canvas, palettes, borders, PNG writer) changes all.
+    """
+    shared = Path(__file__).read_text(encoding="utf-8")
+    sources = {}
+    for renderer in set(RENDERERS.values()) | {render_generic}:
+        sources[renderer.__name__] = inspect.getsource(renderer)
+        shared = shared.replace(sources[renderer.__name__], "")
+    shared_hash = _sha(shared)
+    return {name: _sha(shared_hash + source) for name, source in sources.items()}
+
+
+def entry_hash(entry, renderer_hash):
+    return _sha(renderer_hash + json.dumps(entry, sort_keys=True))
+
+
+def sprite_paths(entry):
+    levels = entry.get("upgradeLevels") or [{"level": 0}]
+    return [OUTPUT_DIR / f"{entry['id']}_lvl{level_info.get('level', 0)}.png" for level_info in levels]
+
+
+def render_entry(entry):
+    """Draw and write every upgrade level of one building; returns the paths written."""
+    base_rgb = tuple(clamp_byte(c * 255) for c in entry.get("color", [0.5, 0.5, 0.5]))
+    base = with_alpha(base_rgb)
+    palette = palette_for(base)
+    renderer = RENDERERS.get(entry["id"], render_generic)
+    levels = entry.get("upgradeLevels") or [{"level": 0}]
+    written = []
+    for level_info, out_path in zip(levels, sprite_paths(entry)):
+        canvas = Canvas(SIZE, palette["light"])
+        renderer(canvas, palette, entry, level_info)
+        add_tile_border(canvas, palette, level_info)
+        write_png(out_path, canvas.pixels)
+        written.append(out_path)
+    return written
+
+
+def _stat(path):
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def is_current(entry, digest, cached):
+    """True if the cache saw these outputs written from an entry with this hash."""
+    if not cached or cached.get("hash") != digest:
+        return False
+    outputs = cached.get("outputs", {})
+    paths = sprite_paths(entry)
+    if len(outputs) != len(paths):
+        return False
+    for path in paths:
+        if not path.exists() or outputs.get(path.name) != _stat(path):
+            return False
+    return True
+
+
+def load_cache():
+    if CACHE_PATH.exists():
+        cache = load_path(CACHE_PATH, mutable=True)
+        if cache.get("outputDir") == str(OUTPUT_DIR.resolve()):
+            return cache
+    return {"outputDir": str(OUTPUT_DIR.resolve()), "sprites": {}}
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate building sprites from building_types.json")
+    parser.add_argument("--force", action="store_true", help="Redraw every sprite, ignoring the cache")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    data = json.loads(DATA_PATH.read_text())
-    missing = []
+    data = load("building_types.json", version=DATA_VERSION)
+    cache = load_cache()
+    hashes = renderer_hashes()
+
+    stale = []
     for entry in data["buildingTypes"]:
-        base_rgb = tuple(clamp_byte(c * 255) for c in entry.get("color", [0.5, 0.5, 0.5]))
-        base = with_alpha(base_rgb)
-        palette = palette_for(base)
         renderer = RENDERERS.get(entry["id"], render_generic)
-        levels = entry.get("upgradeLevels") or [{"level": 0}]
-        for level_info in levels:
-            canvas = Canvas(SIZE, palette["light"])
-            renderer(canvas, palette, entry, level_info)
-            add_tile_border(canvas, palette, level_info)
-            suffix = f"lvl{level_info.get('level', 0)}"
-            out_path = OUTPUT_DIR / f"{entry['id']}_{suffix}.png"
-            write_png(out_path, canvas.pixels)
+        digest = entry_hash(entry, hashes[renderer.__name__])
+        if args.force or not is_current(entry, digest, cache["sprites"].get(entry["id"])):
+            stale.append((entry, digest))
+
+    # Starting a pool costs more than drawing a few buildings
+    if len(stale) >= PARALLEL_MIN and args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(render_entry, [entry for entry, _ in stale]))
+    else:
+        results = [render_entry(entry) for entry, _ in stale]
+
+    missing = []
+    for (entry, digest), written in zip(stale, results):
+        renderer = RENDERERS.get(entry["id"], render_generic)
+        for out_path in written:
             print(f"Generated {out_path} via {renderer.__name__}")
-            if renderer is render_generic and entry["id"] not in missing:
-                missing.append(entry["id"])
+        if renderer is render_generic:
+            missing.append(entry["id"])
+        cache["sprites"][entry["id"]] = {
+            "hash": digest,
+            "outputs": {path.name: _stat(path) for path in written},
+        }
     if missing:
         print("Used fallback art for:", ", ".join(missing))
+    if stale:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        save_path(CACHE_PATH, cache)
+    sprites = sum(len(written) for written in results)
+    print(f"{sprites} sprites drawn for {len(stale)} building types, "
+          f"{len(data['buildingTypes']) - len(stale)} unchanged ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
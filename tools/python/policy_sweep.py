@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Allocation Policy Sweep
+
+Evaluates a full grid of allocation policies offline with the consumption
+simulator (consumption_sim.py), spreading the runs across a process pool:
+
+    priority_mode x fairness_weight x per_capita_cap x allow_partial x seed
+
+Every configuration with the same seed starts from the same generated
+population and the same random rolls, so differences between rows come
+from the policy alone. Each worker loads the craving data once and keeps
+the populations it has generated.
+
+With --output, results are written one row per (configuration, seed)
+as columns: .npz, .csv or .json, depending on the output suffix.
+
+Usage:
+    python tools/python/policy_sweep.py
+    python tools/python/policy_sweep.py --characters 2000 --cycles 300 --seeds 0,1,2
+    python tools/python/policy_sweep.py --fairness-weights 0,0.5,1 --per-capita-caps none,3,6 \\
+        --partial both --workers 8 --output sweep.csv
+
+Requires NumPy.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+from consumption_sim import (
+    DIFFICULTY_SETTINGS,
+    PRIORITY_MODES,
+    CravingData,
+    History,
+    Policy,
+    Population,
+    Simulation,
+    default_supply,
+)
+from game_data import REPO_ROOT, resolve_data_dir
+
+# Per-process state, filled by _init_worker
+_WORKER = {}
+
+
+def _init_worker(data_dir: str, characters: int, per_capita: float):
+    data = CravingData(Path(data_dir))
+    _WORKER["data"] = data
+    _WORKER["characters"] = characters
+    _WORKER["supply"] = default_supply(data, characters, per_capita)
+    _WORKER["populations"] = {}
+
+
+def _population(seed: int) -> Population:
+    populations = _WORKER["populations"]
+    if seed not in populations:
+        populations[seed] = Population.generate(_WORKER["data"], _WORKER["characters"], seed=seed)
+    return populations[seed]
+
+
+def run_config(config: dict, cycles: int, difficulty: str, quality: str) -> dict:
+    """Simulate one configuration in a worker and return its result row."""
+    start = time.perf_counter()
+    policy = Policy(config["priority_mode"], config["fairness_weight"],
+                    config["per_capita_cap"], config["allow_partial"])
+    sim = Simulation(_WORKER["data"], _population(config["seed"]), policy,
+                     _WORKER["supply"], difficulty, quality)
+    history = sim.run(cycles).arrays()
+
+    row = dict(config)
+    # NaN keeps the column numeric when there is no cap
+    row["per_capita_cap"] = float("nan") if config["per_capita_cap"] is None else config["per_capita_cap"]
+    row["population"] = int(history["population"][-1])
+    row["emigrated"] = int(history["emigrated"].sum())
+    for key in ("gini", "mean_satisfaction", "min_satisfaction", "max_satisfaction"):
+        row[key] = float(history[key][-1])
+    row["avg_mean_satisfaction"] = float(history["mean_satisfaction"].mean())
+    row["units_consumed"] = float(history["units_consumed"].sum())
+    row["unmet_cravings"] = int(history["unmet_cravings"].sum())
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+def build_grid(modes: list, fairness_weights: list, caps: list, partial: list, seeds: list) -> list:
+    return [
+        {
+            "priority_mode": mode,
+            "fairness_weight": weight,
+            "per_capita_cap": cap,
+            "allow_partial": allow,
+            "seed": seed,
+        }
+        for mode, weight, cap, allow, seed in itertools.product(modes, fairness_weights, caps, partial, seeds)
+    ]
+
+
+def _float_list(text: str) -> list:
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def _cap_list(text: str) -> list:
+    return [None if v.strip().lower() == "none" else float(v) for v in text.split(",") if v.strip()]
+
+
+def _int_list(text: str) -> list:
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
+def _mode_list(text: str) -> list:
+    modes = [v.strip() for v in text.split(",") if v.strip()]
+    unknown = [m for m in modes if m not in PRIORITY_MODES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown priority mode(s): {', '.join(unknown)}")
+    return modes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel allocation policy sweep")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    parser.add_argument("--characters", type=int, default=1000, help="Population size")
+    parser.add_argument("--cycles", type=int, default=200, help="Cycles per configuration")
+    parser.add_argument("--per-capita", type=float, default=0.05,
+                        help="Units per character per cycle of each commodity")
+    parser.add_argument("--priority-modes", type=_mode_list, default=list(PRIORITY_MODES),
+                        help="Comma-separated priority modes (default: all)")
+    parser.add_argument("--fairness-weights", type=_float_list, default=[0.0, 0.5, 1.0, 2.0])
+    parser.add_argument("--per-capita-caps", type=_cap_list, default=[None, 2.0, 5.0, 10.0],
+                        help="Comma-separated caps; 'none' for uncapped")
+    parser.add_argument("--partial", choices=["both", "yes", "no"], default="both",
+                        help="allow_partial values to sweep")
+    parser.add_argument("--seeds", type=_int_list, default=[0], help="Comma-separated population seeds")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_SETTINGS), default="normal")
+    parser.add_argument("--quality", default="basic")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--output", type=Path, help="Write results (.npz, .csv or .json)")
+    args = parser.parse_args()
+
+    partial = {"both": [True, False], "yes": [True], "no": [False]}[args.partial]
+    grid = build_grid(args.priority_modes, args.fairness_weights, args.per_capita_caps,
+                      partial, args.seeds)
+    data_dir = resolve_data_dir(args.version)
+
+    print(f"📂 Craving data: {data_dir.relative_to(REPO_ROOT)}")
+    print(f"🧮 {len(grid)} runs ({args.characters} characters x {args.cycles} cycles) "
+          f"on {args.workers} workers")
+
+    start = time.perf_counter()
+    rows: list[Optional[dict]] = [None] * len(grid)
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(str(data_dir), args.characters, args.per_capita),
+    ) as pool:
+        futures = {
+            pool.submit(run_config, config, args.cycles, args.difficulty, args.quality): i
+            for i, config in enumerate(grid)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            rows[futures[future]] = future.result()
+            if done % max(1, len(grid) // 20) == 0 or done == len(grid):
+                print(f"  {done}/{len(grid)} done ({time.perf_counter() - start:.1f}s)")
+
+    # Rows stay in grid order regardless of completion order
+    if args.output:
+        results = History()
+        for row in rows:
+            results.append(row)
+        results.save(args.output)
+
+    best = max(rows, key=lambda r: (r["mean_satisfaction"], -r["gini"]))
+    fairest = min(rows, key=lambda r: (r["gini"], -r["mean_satisfaction"]))
+    print(f"\n✅ Sweep finished in {time.perf_counter() - start:.1f}s")
+    print(f"   Highest mean satisfaction: {best['mean_satisfaction']:.2f} "
+          f"(gini {best['gini']:.3f}) - {_describe(best)}")
+    print(f"   Lowest gini:               {fairest['gini']:.3f} "
+          f"(mean {fairest['mean_satisfaction']:.2f}) - {_describe(fairest)}")
+    if args.output:
+        print(f"💾 Results written to {args.output}")
+
+
+def _describe(row: dict) -> str:
+    cap = "none" if row["per_capita_cap"] != row["per_capita_cap"] else f"{row['per_capita_cap']:g}"
+    return (f"{row['priority_mode']}, fairness {row['fairness_weight']:g}, cap {cap}, "
+            f"partial {'yes' if row['allow_partial'] else 'no'}, seed {row['seed']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
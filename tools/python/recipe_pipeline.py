@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Recipe Transform Pipeline
+
+Rebalances building_recipes.json in every data version with one command.
+Each version's recipes are loaded once, run through an ordered chain of
+in-memory transforms, diffed against the file as loaded and written back
+atomically (one timestamped backup per file):
+
+1. caps       - production times over 30 min are pulled into the building
+                category's range from CATEGORY_RULES and inputs/outputs
+                scaled by its factors (recipes over the cap only)
+2. overrides  - RECIPE_OVERRIDES by recipe name (absolute times and
+                quantities, so repeating a run never compounds them)
+3. multiplier - every production time x N (0.2 = 5x faster)
+4. drop       - remove fields from every recipe
+
+Replaces tools/rebalance_recipes.py (caps + overrides) and
+tools/apply_production_multiplier.py (multiplier).
+
+Usage:
+    python tools/python/recipe_pipeline.py --rebalance --dry-run       # preview caps + overrides
+    python tools/python/recipe_pipeline.py --rebalance                 # all versions
+    python tools/python/recipe_pipeline.py --multiplier 0.2 --versions alpha
+    python tools/python/recipe_pipeline.py --drop notes --versions base --no-backup
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from game_data import REPO_ROOT, data_path, load_path, save_path, version_ids
+
+RECIPES_FILE = "building_recipes.json"
+CHANGELOG = REPO_ROOT / "docs" / "balance_changelog.md"
+
+MAX_TIME = 1800  # 30 minutes max
+
+# Category-specific rules: target time range and the fraction of the
+# original inputs/outputs kept when a recipe's time is scaled down
+CATEGORY_RULES = {
+    # Already handled orchards manually, skip them
+    "orchard": {"skip": True},
+
+    # Farms: fast production (5-15 min)
+    "farm": {"min_time": 300, "max_time": 900, "output_factor": 0.25, "input_factor": 0.25},
+
+    # Mining: medium-slow (15-30 min)
+    "mine": {"min_time": 900, "max_time": 1800, "output_factor": 0.20, "input_factor": 1.0},
+
+    # Hunting/Animal: slow (25-30 min)
+    "hunting_lodge": {"min_time": 900, "max_time": 1500, "output_factor": 0.25, "input_factor": 1.0},
+
+    # Brewing/Distillery/Winery: medium (15-25 min)
+    "bar": {"min_time": 600, "max_time": 1200, "output_factor": 0.25, "input_factor": 0.25},
+    "distillery": {"min_time": 900, "max_time": 1500, "output_factor": 0.25, "input_factor": 0.25},
+    "winery": {"min_time": 1200, "max_time": 1800, "output_factor": 0.25, "input_factor": 0.25},
+
+    # Dairy: medium (15-25 min)
+    "dairy": {"min_time": 600, "max_time": 1200, "output_factor": 0.30, "input_factor": 0.30},
+
+    # Forge/Smelting: medium (12-25 min)
+    "forge": {"min_time": 720, "max_time": 1500, "output_factor": 0.30, "input_factor": 0.30},
+
+    # Preservery: medium (10-20 min)
+    "preservery": {"min_time": 600, "max_time": 1200, "output_factor": 0.30, "input_factor": 0.30},
+
+    # Charcoal: medium (15-20 min)
+    "charcoal_kiln": {"min_time": 900, "max_time": 1200, "output_factor": 0.25, "input_factor": 0.25},
+
+    # Tannery: medium (10-25 min)
+    "tannery": {"min_time": 600, "max_time": 1500, "output_factor": 0.35, "input_factor": 0.35},
+
+    # Scriptorium/Art: slow luxury (20-30 min)
+    "scriptorium": {"min_time": 1200, "max_time": 1800, "output_factor": 0.30, "input_factor": 0.30},
+    "art_workshop": {"min_time": 1200, "max_time": 1800, "output_factor": 0.30, "input_factor": 0.30},
+
+    # Stonecutters: slow (20-30 min)
+    "stonecutters": {"min_time": 1200, "max_time": 1800, "output_factor": 0.30, "input_factor": 0.30},
+
+    # Jewelry: slow luxury (25-30 min)
+    "jewelry_workshop": {"min_time": 1500, "max_time": 1800, "output_factor": 0.30, "input_factor": 0.30},
+
+    # Weaving: slow luxury (20-30 min)
+    "weaving_workshop": {"min_time": 1200, "max_time": 1800, "output_factor": 0.30, "input_factor": 0.30},
+
+    # Tailor (specialty): medium (15-25 min)
+    "tailor": {"min_time": 900, "max_time": 1500, "output_factor": 0.35, "input_factor": 0.35},
+
+    # Restaurant: fast (5-15 min)
+    "restaurant": {"min_time": 300, "max_time": 900, "output_factor": 0.35, "input_factor": 0.35},
+
+    # Apiary: slow (25-30 min)
+    "apiary": {"min_time": 1500, "max_time": 1800, "output_factor": 0.15, "input_factor": 0.15},
+
+    # Brickyard: medium (15-25 min) - cap at 1800
+    "brickyard": {"min_time": 900, "max_time": 1500, "output_factor": 0.40, "input_factor": 0.40},
+
+    # Furniture: medium (15-25 min) - cap at 1800
+    "furniture_shop": {"min_time": 900, "max_time": 1500, "output_factor": 0.50, "input_factor": 0.50},
+
+    # Tailor shop: fast-medium (8-25 min)
+    "tailor_shop": {"min_time": 480, "max_time": 1500, "output_factor": 0.50, "input_factor": 0.50},
+
+    # Textile: fast-medium (5-15 min)
+    "textile_mill": {"min_time": 300, "max_time": 900, "output_factor": 0.50, "input_factor": 0.50},
+}
+
+# Specific recipe overrides for critical balancing
+RECIPE_OVERRIDES = {
+    # Critical food chain - keep bakery fast with good output
+    "Bread Baking": {"time": 120, "outputs": {"bread": 10}},  # 2 min, 8 -> 10 bread
+    "Pav Baking": {"time": 180},
+    "Meal Preparation": {"time": 180},
+
+    # Goat and honey are special animal products
+    "Goat Raising": {"time": 1800, "outputs": {"goat": 2}, "inputs": {"goat": 1}},
+    "Honey Production": {"time": 1800, "outputs": {"honey": 5, "beeswax": 2}, "inputs": {}},
+
+    # Wine/Cider - luxury drinks
+    "Wine Making": {"time": 1500, "outputs": {"wine": 8}, "inputs": {"grapes": 25}},
+    "Cider Making": {"time": 1200, "outputs": {"cider": 10}, "inputs": {"apple": 20}},
+
+    # Crown and tapestry are ultra-luxury
+    "Crown Crafting": {"time": 1800},
+    "Tapestry Weaving": {"time": 1800},
+}
+
+# A transform edits one recipe dict in place
+Transform = Callable[[dict], None]
+
+
+def scale_time(old_time, building_type, rules: dict = CATEGORY_RULES, max_time: int = MAX_TIME):
+    """New production time for a recipe over the cap, by building category."""
+    if old_time <= max_time:
+        return old_time  # Already within limit
+
+    category = rules.get(building_type, {})
+    if category.get("skip"):
+        return old_time
+
+    low = category.get("min_time", 600)
+    high = category.get("max_time", max_time)
+
+    # Higher original times land closer to the top of the range
+    if old_time > 86400:  # More than 1 day
+        return high
+    elif old_time > 10800:  # More than 3 hours
+        return int(low + (high - low) * 0.9)
+    elif old_time > 7200:  # More than 2 hours
+        return int(low + (high - low) * 0.7)
+    elif old_time > 3600:  # More than 1 hour
+        return int(low + (high - low) * 0.5)
+    else:  # Between 30 min and 1 hour
+        return int(low + (high - low) * 0.3)
+
+
+def _scaled(quantities: dict, factor: float) -> dict:
+    return {k: max(1, int(v * factor)) for k, v in quantities.items()}
+
+
+def _set_time(recipe: dict, new_time: int):
+    """Set productionTime and note the change, as the rebalance always did."""
+    old_time = recipe.get("productionTime", 0)
+    recipe["productionTime"] = new_time
+    minutes, seconds = divmod(new_time, 60)
+    time_str = f"{minutes} min" if seconds == 0 else f"{minutes}m {seconds}s"
+    recipe["notes"] = f"{time_str}. Rebalanced from {old_time}s. {recipe.get('notes', '')[:50]}..."
+
+
+def cap_times(rules: dict = CATEGORY_RULES, max_time: int = MAX_TIME, exclude=()) -> Transform:
+    """Pull production times over max_time into their category's range."""
+    exclude = set(exclude)
+
+    def transform(recipe: dict):
+        old_time = recipe.get("productionTime", 0)
+        category = rules.get(recipe.get("buildingType", ""), {})
+        if old_time <= max_time or category.get("skip") or recipe.get("recipeName") in exclude:
+            return
+        _set_time(recipe, scale_time(old_time, recipe.get("buildingType", ""), rules, max_time))
+        recipe["outputs"] = _scaled(recipe.get("outputs", {}), category.get("output_factor", 0.30))
+        inputs = _scaled(recipe.get("inputs", {}), category.get("input_factor", 0.30))
+        if inputs:
+            recipe["inputs"] = inputs
+    return transform
+
+
+def apply_overrides(overrides: dict = RECIPE_OVERRIDES) -> Transform:
+    """Apply per-recipe overrides (absolute values, so applying twice is a no-op)."""
+    def transform(recipe: dict):
+        override = overrides.get(recipe.get("recipeName", ""))
+        if not override:
+            return
+        old_time = recipe.get("productionTime", 0)
+        new_time = override.get("time", old_time)
+        if "outputs" in override:
+            recipe["outputs"] = dict(override["outputs"])
+        if override.get("inputs"):
+            recipe["inputs"] = dict(override["inputs"])
+        if new_time != old_time:
+            _set_time(recipe, new_time)
+    return transform
+
+
+def scale_all_times(multiplier: float) -> Transform:
+    """Multiply every production time, rounded to the second."""
+    def transform(recipe: dict):
+        if "productionTime" in recipe:
+            recipe["productionTime"] = round(recipe["productionTime"] * multiplier)
+    return transform
+
+
+def drop_fields(fields) -> Transform:
+    fields = tuple(fields)
+
+    def transform(recipe: dict):
+        for field in fields:
+            recipe.pop(field, None)
+    return transform
+
+
+def build_chain(caps: bool = False, overrides: bool = False, multiplier: Optional[float] = None,
+                drop=()) -> list:
+    """[(name, transform)] in pipeline order."""
+    chain = []
+    if caps:
+        # An overridden recipe gets its override instead of the category rule
+        chain.append(("caps", cap_times(exclude=RECIPE_OVERRIDES if overrides else ())))
+    if overrides:
+        chain.append(("overrides", apply_overrides()))
+    if multiplier is not None and multiplier != 1.0:
+        chain.append((f"x{multiplier}", scale_all_times(multiplier)))
+    if drop:
+        chain.append((f"drop {','.join(drop)}", drop_fields(drop)))
+    return chain
+
+
+# -- diff ------------------------------------------------------------------------
+
+def _recipe_key(recipe: dict, position: int) -> tuple:
+    return recipe.get("buildingType", ""), recipe.get("recipeName") or recipe.get("name") or f"#{position}"
+
+
+def diff_values(old, new, path: str = "") -> list:
+    """[(path, old, new)] for every leaf that differs; missing sides are None."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [k for k in new if k not in old]:
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes.append((sub, old[key], None))
+            elif key not in old:
+                changes.append((sub, None, new[key]))
+            else:
+                changes.extend(diff_values(old[key], new[key], sub))
+        return changes
+    return [] if old == new else [(path, old, new)]
+
+
+def diff_recipes(old: list, new: list) -> dict:
+    """{(buildingType, recipeName): [(path, old, new)]} for recipes that changed."""
+    before = {_recipe_key(r, i): r for i, r in enumerate(old)}
+    after = {_recipe_key(r, i): r for i, r in enumerate(new)}
+    changes = {}
+    for key in list(before) + [k for k in after if k not in before]:
+        fields = diff_values(before.get(key, {}), after.get(key, {}))
+        if fields:
+            changes[key] = fields
+    return changes
+
+
+def _show(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, str) and len(value) > 40:
+        return repr(value[:37] + "...")
+    return repr(value) if isinstance(value, str) else str(value)
+
+
+# -- pipeline --------------------------------------------------------------------
+
+def run(chain: list, versions: list) -> dict:
+    """Transform every version in memory: {version: (path, original, transformed, diff)}."""
+    results = {}
+    for version in versions:
+        path = data_path(RECIPES_FILE, version)
+        original = load_path(path)
+        data = load_path(path, mutable=True)
+        for recipe in data.get("recipes", []):
+            for _, transform in chain:
+                transform(recipe)
+        results[version] = (path, original, data,
+                            diff_recipes(original.get("recipes", []), data.get("recipes", [])))
+    return results
+
+
+def write(results: dict, backup: bool = True) -> list:
+    """Save every changed version atomically; returns [(path, backup path or None)]."""
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    written = []
+    for path, _, data, changes in results.values():
+        if not changes:
+            continue
+        backup_path = path.with_name(f"{path.stem}.backup.{stamp}.json") if backup else None
+        save_path(path, data, backup=backup_path)
+        written.append((path, backup_path))
+    return written
+
+
+def log_change(chain: list, results: dict, written: list):
+    """Append an entry to docs/balance_changelog.md (kept in its CRLF line endings)."""
+    if not CHANGELOG.exists():
+        return
+    backups = {path: backup for path, backup in written}
+    lines = ["", f"## {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+             f"**Change**: Recipe pipeline: {', '.join(name for name, _ in chain)}"]
+    for path, _, _, changes in results.values():
+        if path in backups:
+            lines.append(f"**File**: {path.relative_to(REPO_ROOT)} ({len(changes)} recipes modified, "
+                         f"backup: {backups[path].name if backups[path] else 'none'})")
+    with open(CHANGELOG, "a", encoding="utf-8", newline="") as f:
+        f.write("\r\n".join(lines) + "\r\n\r\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebalance building_recipes.json across data versions")
+    parser.add_argument("--versions", help="Comma-separated versions from data/versions.json (default: all)")
+    parser.add_argument("--rebalance", action="store_true", help="Same as --caps --overrides")
+    parser.add_argument("--caps", action="store_true", help="Cap production times by CATEGORY_RULES")
+    parser.add_argument("--overrides", action="store_true", help="Apply RECIPE_OVERRIDES")
+    parser.add_argument("--multiplier", type=float,
+                        help="Multiply production times (0.2 = 5x faster, 2.0 = 2x slower)")
+    parser.add_argument("--drop", action="append", default=[], metavar="FIELD",
+                        help="Remove a field from every recipe (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Show the diff without writing")
+    parser.add_argument("--no-backup", action="store_true", help="Skip the backup copy")
+    parser.add_argument("--limit", type=int, default=40, help="Changed recipes shown per version (default: 40)")
+    args = parser.parse_args()
+
+    chain = build_chain(args.caps or args.rebalance, args.overrides or args.rebalance,
+                        args.multiplier, args.drop)
+    if not chain:
+        parser.error("choose at least one transform (--rebalance, --caps, --overrides, --multiplier, --drop)")
+    versions = [v.strip() for v in args.versions.split(",")] if args.versions else version_ids()
+    for version in versions:
+        if not data_path(RECIPES_FILE, version).exists():
+            print(f"❌ No {RECIPES_FILE} for version '{version}'")
+            return 1
+
+    results = run(chain, versions)
+    print(f"🔧 Pipeline: {' -> '.join(name for name, _ in chain)}")
+    for version, (path, original, _, changes) in results.items():
+        print(f"\n📂 {path.relative_to(REPO_ROOT)}: {len(changes)}/{len(original.get('recipes', []))} recipes changed")
+        for (building, name), fields in list(changes.items())[:args.limit]:
+            print(f"   ~ {building}/{name}")
+            for field, old, new in fields:
+                print(f"       {field:24s} {_show(old)} → {_show(new)}")
+        if len(changes) > args.limit:
+            print(f"   ... and {len(changes) - args.limit} more")
+
+    if args.dry_run:
+        print("\n⚠️  DRY RUN - No files modified. Remove --dry-run to apply changes.")
+        return 0
+    written = write(results, backup=not args.no_backup)
+    if not written:
+        print("\n✅ Nothing to change")
+        return 0
+    for path, backup_path in written:
+        print(f"💾 Saved {path.relative_to(REPO_ROOT)}" + (f" (backup: {backup_path.name})" if backup_path else ""))
+    log_change(chain, results, written)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Save File Inspector
+
+Streams SaveManager.lua save files (save_slot_N.json, quicksave.json,
+autosave.json) without loading the whole document: the file is read in
+chunks and each element of a section - one citizen, one building - is
+decoded on its own and dropped, so memory stays at about one chunk plus
+the largest element however big the town is.
+
+- summary (default): per save, the version, town, day and population, and
+  for every top-level section its element count and size on disk
+- export (--section): one row per element of a section - citizens,
+  buildings, immigrationQueue, eventLog... or per entry of an object
+  section such as inventory (columns key, value) - with the chosen
+  --fields, across any number of saves, written in batches to
+
+      .csv      one line per row
+      .npz      one array per column; numbers as float64 (NaN when
+                missing or not a number), anything else as int32 codes plus a
+                <column>__labels array
+      .parquet  if pyarrow is installed
+
+Fields are dotted paths into an element ("economics.wealth"); a trailing
+"#" gives the length of a list or object ("workers#"); lists and objects
+are written as compact JSON. Every row starts with the save's file name
+and the --meta top-level values (default: dayNumber, cycleNumber).
+
+Usage:
+    python tools/python/save_inspector.py ~/.local/share/love/cravetown/save_slot_1.json
+    python tools/python/save_inspector.py soak/*.json --section citizens --output citizens.npz
+    python tools/python/save_inspector.py soak/*.json --section buildings \\
+        --fields id,typeId,ownerId,workers#,housingCapacity,occupants# --output buildings.csv
+    python tools/python/save_inspector.py autosave.json --section inventory --output inventory.parquet
+
+Requires NumPy (for .npz); Parquet output needs pyarrow.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import math
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+BATCH_SIZE = 4096
+
+DEFAULT_FIELDS = {
+    "citizens": ["id", "name", "age", "vocation", "emergentClass", "economics.wealth",
+                 "economics.incomePerCycle", "economics.expensesPerCycle", "satisfaction",
+                 "housingId", "workplaceId", "productivity", "isProtesting", "hasEmigrated",
+                 "consecutiveFailures", "ownedPlotIds#", "relationships#"],
+    "buildings": ["id", "typeId", "x", "y", "ownerId", "landPlotId", "isPaused", "priority",
+                  "workers#", "isHousing", "housingCapacity", "rentPerOccupant", "occupants#"],
+    "immigrationQueue": ["name", "age", "class", "vocation", "wealth", "expiryDay"],
+    "inventory": ["key", "value"],
+}
+DEFAULT_META = ["dayNumber", "cycleNumber"]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = ",]} \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class SaveReader:
+    """Pull parser over a save file's top-level object.
+
+    Values are decoded with the C json decoder on the buffered text;
+    sections that are not wanted are decoded element by element and
+    discarded.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._file = None
+        self._text = ""
+        self._pos = 0
+        self._base = 0  # file offset of _text[0]
+        self._eof = False
+
+    # -- buffer --------------------------------------------------------------
+
+    def _open(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, "r", encoding="utf-8")
+        self._text, self._pos, self._base, self._eof = "", 0, 0, False
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _more(self) -> bool:
+        """Read another chunk, dropping what has been consumed."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._base += self._pos
+        self._text = self._text[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def offset(self) -> int:
+        return self._base + self._pos
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            if self._pos < len(self._text):
+                char = self._text[self._pos]
+                if char not in " \t\n\r":
+                    return char
+                self._pos = _WHITESPACE.match(self._text, self._pos).end()
+            elif not self._more():
+                raise ValueError(f"{self.path}: unexpected end of file")
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f"{self.path}: expected {' or '.join(chars)} at offset {self.offset()}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def _decode(self):
+        """Decode the next value; grows the buffer until the value is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+                continue
+            # A number cut by the end of the buffer ("12" of "12.5e3") may go on in the next chunk
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and (end == len(self._text) or self._text[end] not in _DELIMITERS) and self._more()):
+                continue
+            self._pos = end
+            return value
+
+    def _skip(self):
+        """Consume the next value, decoding a container one member at a time."""
+        opening = self._peek()
+        if opening not in "[{":
+            self._decode()
+            return
+        self._pos += 1
+        for _ in self._members("]" if opening == "[" else "}"):
+            if opening == "{":
+                self._decode()
+                self._expect(":")
+            self._decode()
+
+    def _members(self, close: str) -> Iterator[None]:
+        """Advance through the comma-separated members of an open array or object."""
+        if self._peek() == close:
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self._expect("," + close) == close:
+                return
+
+    # -- top level -----------------------------------------------------------
+
+    def _sections(self) -> Iterator[str]:
+        """Key of each top-level member, positioned at its value."""
+        self._open()
+        self._expect("{")
+        for _ in self._members("}"):
+            key = self._decode()
+            self._expect(":")
+            self._peek()
+            start = self.offset()
+            yield key
+            if self.offset() == start:
+                self._skip()
+
+    def stream(self, section: str) -> Iterator:
+        """Elements of a top-level array, or (key, value) pairs of a top-level object."""
+        try:
+            for key in self._sections():
+                if key != section:
+                    continue
+                opening = self._expect("[{")
+                if opening == "[":
+                    for _ in self._members("]"):
+                        yield self._decode()
+                else:
+                    for _ in self._members("}"):
+                        name = self._decode()
+                        self._expect(":")
+                        yield name, self._decode()
+                return
+        finally:
+            self.close()
+
+    def scalars(self, keys: Optional[set] = None) -> dict:
+        """Top-level values that are not arrays or objects (only keys, if given)."""
+        values = {}
+        try:
+            for key in self._sections():
+                if self._peek() not in "[{" and (keys is None or key in keys):
+                    values[key] = self._decode()
+                    if keys is not None and len(values) == len(keys):
+                        break
+        finally:
+            self.close()
+        return values
+
+    def summary(self) -> dict:
+        """{key: (kind, count or value, bytes)} for every top-level member."""
+        result = {}
+        try:
+            for key in self._sections():
+                start = self.offset()
+                opening = self._peek()
+                if opening not in "[{":
+                    value = self._decode()
+                    result[key] = ("value", value, self.offset() - start)
+                    continue
+                self._pos += 1
+                count = 0
+                for _ in self._members("]" if opening == "[" else "}"):
+                    if opening == "{":
+                        self._decode()
+                        self._expect(":")
+                    self._decode()
+                    count += 1
+                result[key] = ("array" if opening == "[" else "object", count, self.offset() - start)
+        finally:
+            self.close()
+        return result
+
+
+def compile_field(spec: str):
+    """Getter for a dotted field path; a trailing "#" takes the length."""
+    length = spec.endswith("#")
+    parts = spec.rstrip("#").split(".")
+
+    def get(element):
+        value = element
+        for part in parts:
+            if isinstance(value, dict):
+                value = value.get(part)
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                return None
+        if length:
+            return len(value) if isinstance(value, (list, dict)) else None
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, separators=(",", ":"))
+        return value
+
+    return get
+
+
+def element_row(element) -> object:
+    """Object-section entries become {"key", "value"} (merged when the value is an object)."""
+    if isinstance(element, tuple):
+        key, value = element
+        return {"key": key, **value} if isinstance(value, dict) else {"key": key, "value": value}
+    return element
+
+
+# -- writers ------------------------------------------------------------------
+
+
+class CsvWriter:
+    def __init__(self, path: Path, columns: list):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: list):
+        self._writer.writerows(["" if v is None else v for v in row] for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class NpzWriter:
+    """Spills each column to a temporary file per batch; the arrays are assembled at close."""
+
+    def __init__(self, path: Path, columns: list):
+        self.path = path
+        self.columns = columns
+        self._tmp = tempfile.TemporaryDirectory(prefix="save_inspector_")
+        self._files = [open(Path(self._tmp.name) / f"{i}.bin", "wb") for i in range(len(columns))]
+        self._numeric = [None] * len(columns)  # decided by the column's first non-null value
+        self._pending = [0] * len(columns)  # nulls seen before that
+        self._labels = [{} for _ in columns]
+
+    def write(self, rows: list):
+        for i, values in enumerate(zip(*rows)):
+            if self._numeric[i] is None:
+                first = next((v for v in values if v is not None), None)
+                if first is None:
+                    self._pending[i] += len(values)
+                    continue
+                self._numeric[i] = isinstance(first, (int, float))
+                values = (None,) * self._pending[i] + values
+            if self._numeric[i]:
+                array = np.full(len(values), math.nan)
+                for j, v in enumerate(values):
+                    if isinstance(v, (int, float)):
+                        array[j] = v
+                array.tofile(self._files[i])
+            else:
+                labels = self._labels[i]
+                codes = [-1 if v is None else labels.setdefault(str(v), len(labels)) for v in values]
+                np.array(codes, dtype=np.int32).tofile(self._files[i])
+
+    def close(self):
+        for f in self._files:
+            f.close()
+        arrays = {}
+        for i, column in enumerate(self.columns):
+            path = Path(self._tmp.name) / f"{i}.bin"
+            if self._numeric[i] is None:
+                arrays[column] = np.full(self._pending[i], math.nan)
+            elif self._numeric[i]:
+                arrays[column] = np.fromfile(path, dtype=np.float64)
+            else:
+                arrays[column] = np.fromfile(path, dtype=np.int32)
+                arrays[f"{column}__labels"] = np.array(list(self._labels[i]) or [""], dtype=str)
+        np.savez_compressed(self.path, **arrays)
+        self._tmp.cleanup()
+
+
+class ParquetWriter:
+    def __init__(self, path: Path, columns: list):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.columns = columns
+        self._writer = None
+
+    def write(self, rows: list):
+        table = self._pa.Table.from_pylist([dict(zip(self.columns, row)) for row in rows],
+                                           schema=self._writer.schema if self._writer else None)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+WRITERS = {".csv": CsvWriter, ".npz": NpzWriter, ".parquet": ParquetWriter}
+
+
+def export(paths: list, section: str, fields: list, meta: list, output: Path,
+           batch_size: int = BATCH_SIZE, chunk_size: int = CHUNK_SIZE) -> int:
+    """Write one row per element of section across saves; returns the row count."""
+    getters = [compile_field(f) for f in fields]
+    writer = WRITERS[output.suffix](output, ["save"] + meta + fields)
+    rows, total = [], 0
+    try:
+        for path in paths:
+            reader = SaveReader(path, chunk_size)
+            values = reader.scalars(set(meta)) if meta else {}
+            prefix = [path.name] + [values.get(key) for key in meta]
+            for element in reader.stream(section):
+                element = element_row(element)
+                rows.append(prefix + [get(element) for get in getters])
+                if len(rows) >= batch_size:
+                    writer.write(rows)
+                    total += len(rows)
+                    rows = []
+        if rows:
+            writer.write(rows)
+            total += len(rows)
+    finally:
+        writer.close()
+    return total
+
+
+def _name_list(text: str) -> list:
+    return [v.strip() for v in text.split(",") if v.strip()]
+
+
+def _expand_paths(patterns: list) -> list:
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(Path(p) for p in matches)
+    return paths
+
+
+def _size(n: int) -> str:
+    return f"{n / 1024 / 1024:.1f} MB" if n >= 1024 * 1024 else f"{n / 1024:.1f} KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream SaveManager save files; summarize or export a section")
+    parser.add_argument("saves", nargs="+", help="Save files or glob patterns")
+    parser.add_argument("--section", help="Top-level section to export (citizens, buildings, inventory, ...)")
+    parser.add_argument("--fields", type=_name_list, help="Comma-separated field paths (default: per section)")
+    parser.add_argument("--meta", type=_name_list, default=DEFAULT_META,
+                        help="Top-level values added to every row (default: dayNumber,cycleNumber)")
+    parser.add_argument("--output", type=Path, help="Export file (.csv, .npz or .parquet)")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="Rows per write")
+    args = parser.parse_args()
+
+    paths = _expand_paths(args.saves)
+    missing = [p for p in paths if not p.is_file()]
+    if missing or not paths:
+        print(f"❌ No such save file: {', '.join(str(p) for p in missing) or ', '.join(args.saves)}")
+        return 1
+
+    start = time.perf_counter()
+    if args.section is None:
+        for path in paths:
+            summary = SaveReader(path).summary()
+            scalars = {key: value for key, (kind, value, _) in summary.items() if kind == "value"}
+            print(f"📂 {path}: {_size(path.stat().st_size)}, version {scalars.get('version', '?')}, "
+                  f"{scalars.get('townName', '?')}, day {scalars.get('dayNumber', '?')}, "
+                  f"population {scalars.get('population', '?')}")
+            for key, (kind, value, size) in sorted(summary.items(), key=lambda item: -item[1][2]):
+                if kind != "value":
+                    print(f"   {key:20s} {kind:6s} {value:8d} entries  {_size(size):>10s}")
+        print(f"\n✅ {len(paths)} save(s) in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    if args.output is None or args.output.suffix not in WRITERS:
+        print(f"❌ --output must end in one of {', '.join(WRITERS)}")
+        return 1
+    if args.output.suffix == ".parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("❌ Parquet output needs pyarrow (pip install pyarrow); use .npz or .csv")
+            return 1
+    fields = args.fields or DEFAULT_FIELDS.get(args.section)
+    if not fields:
+        print(f"❌ No default fields for {args.section}; pass --fields")
+        return 1
+
+    total = export(paths, args.section, fields, args.meta, args.output, args.batch)
+    print(f"💾 {total} {args.section} rows from {len(paths)} save(s) written to {args.output} "
+          f"({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
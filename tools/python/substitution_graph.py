@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Compiled Substitution Graph
+
+Compiles substitution_rules.json into an indexed graph so "what can stand
+in for wheat given the current inventory" is a lookup instead of a walk
+over nested dicts (AllocationEngineV2.FindBestSubstitute):
+
+- every commodity gets an index; each primary's substitutes (across all
+  hierarchy categories) are stored as contiguous arrays ranked by
+  efficiency, ties keeping rule order (the game's strict ">")
+- each primary also has a bitmask of its substitutes, and the inventory
+  is held as a bitmask of commodities in stock, so "is any substitute
+  available" is a single AND
+- best() memoizes its answer per primary; when the inventory changes only
+  the primaries whose substitute mask covers a commodity that entered or
+  left the stock are dropped from the memo
+- best_batch() scores one primary's substitutes for many characters at
+  once with the game's fatigue and distance boost:
+      score = efficiency x substitute multiplier x distance boost
+      boost = 1 + (1 - primary multiplier) x (1 - distance) x 0.5
+              (only when the primary is fatigued)
+- desperation substitutes (desperationSubstitution.rules) are compiled
+  the same way per coarse dimension; the game's flat 0.8 desperation
+  penalty does not change their order
+
+Usage:
+    python tools/python/substitution_graph.py wheat
+    python tools/python/substitution_graph.py wheat --available rice,maize,bread
+
+    from substitution_graph import SubstitutionGraph
+    graph = SubstitutionGraph.load()
+    graph.set_inventory({"rice": 4, "maize": 0})
+    graph.best("wheat")            # ("rice", 0.95, 0.1)
+
+Requires NumPy.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from game_data import REPO_ROOT, load_path, resolve_data_dir
+
+# AllocationEngineV2.FindBestSubstitute constants
+DISTANCE_BOOST_FACTOR = 0.5
+DEFAULT_DISTANCE = 0.5
+DESPERATION_DISTANCE = 0.8
+
+
+class SubstitutionGraph:
+    """Ranked substitute lists in CSR form with an inventory-aware memo.
+
+    For primary index p, its substitutes are
+    substitutes[offsets[p]:offsets[p + 1]] (commodity indices), with the
+    matching efficiency, distance and category arrays, best first.
+    """
+
+    def __init__(self, rules: dict):
+        hierarchies = rules.get("substitutionHierarchies") or {}
+        desperation = rules.get("desperationSubstitution") or {}
+
+        edges = {}
+        for category, members in hierarchies.items():
+            for primary, entry in members.items():
+                for rule in (entry or {}).get("substitutes", []):
+                    edges.setdefault(primary, []).append((
+                        rule["commodity"], rule.get("efficiency", 1.0),
+                        rule.get("distance", DEFAULT_DISTANCE), category))
+        desperate = {}
+        if desperation.get("enabled", False):
+            for coarse, entry in (desperation.get("rules") or {}).items():
+                desperate[coarse] = [(rule["commodity"], rule.get("efficiency", 1.0),
+                                      rule.get("distance", DESPERATION_DISTANCE), coarse)
+                                     for rule in (entry or {}).get("desperateSubstitutes", [])]
+        self.desperation_threshold = desperation.get("criticalThreshold", 20)
+
+        names = set(edges)
+        for rule_list in list(edges.values()) + list(desperate.values()):
+            names.update(rule[0] for rule in rule_list)
+        self.commodity_ids = sorted(names)
+        self.index = {cid: i for i, cid in enumerate(self.commodity_ids)}
+        self.categories = sorted(hierarchies)
+
+        self.primaries = self._compile([edges.get(cid, []) for cid in self.commodity_ids])
+        self.coarse_ids = sorted(desperate)
+        self.coarse_index = {cid: i for i, cid in enumerate(self.coarse_ids)}
+        self.desperate = self._compile([desperate[cid] for cid in self.coarse_ids])
+
+        self._available = 0
+        self._memo = {}
+        self._desperate_memo = {}
+
+    def _compile(self, rule_lists: list) -> dict:
+        """Rank each list and pack them into CSR arrays plus bitmasks."""
+        offsets = [0]
+        substitutes, efficiency, distance, category, masks = [], [], [], [], []
+        for rules in rule_lists:
+            ranked = sorted(enumerate(rules), key=lambda r: (-r[1][1], r[0]))
+            mask = 0
+            for _, (commodity, eff, dist, cat) in ranked:
+                substitutes.append(self.index[commodity])
+                efficiency.append(eff)
+                distance.append(dist)
+                category.append(cat)
+                mask |= 1 << self.index[commodity]
+            masks.append(mask)
+            offsets.append(len(substitutes))
+        return {
+            "offsets": np.array(offsets, dtype=np.int64),
+            "substitutes": np.array(substitutes, dtype=np.int32),
+            "efficiency": np.array(efficiency, dtype=np.float32),
+            "distance": np.array(distance, dtype=np.float32),
+            "category": category,
+            "masks": masks,
+        }
+
+    @classmethod
+    def load(cls, version: Optional[str] = None, data_dir: Optional[Path] = None) -> "SubstitutionGraph":
+        data_dir = Path(data_dir) if data_dir else resolve_data_dir(version)
+        return cls(load_path(data_dir / "substitution_rules.json"))
+
+    # -- inventory -----------------------------------------------------------
+
+    def availability_mask(self, inventory) -> int:
+        """Bitmask of graph commodities in stock.
+
+        inventory is {commodity: units} or a boolean/count array over
+        commodity_ids.
+        """
+        if isinstance(inventory, dict):
+            mask = 0
+            for cid, units in inventory.items():
+                i = self.index.get(cid)
+                if i is not None and units and units > 0:
+                    mask |= 1 << i
+            return mask
+        present = np.flatnonzero(np.asarray(inventory) > 0)
+        return sum(1 << int(i) for i in present)
+
+    def set_inventory(self, inventory) -> bool:
+        """Record what is in stock; returns True if membership changed.
+
+        Counts going up or down without crossing zero keep every memo.
+        """
+        mask = inventory if isinstance(inventory, int) else self.availability_mask(inventory)
+        changed = mask ^ self._available
+        if not changed:
+            return False
+        self._available = mask
+        for memo, table in ((self._memo, self.primaries), (self._desperate_memo, self.desperate)):
+            for key in [k for k in memo if table["masks"][k] & changed]:
+                del memo[key]
+        return True
+
+    def available(self) -> np.ndarray:
+        """Current availability as a boolean array over commodity_ids."""
+        mask = self._available
+        return np.array([(mask >> i) & 1 for i in range(len(self.commodity_ids))], dtype=bool)
+
+    # -- lookups -------------------------------------------------------------
+
+    def ranked(self, primary: str) -> list:
+        """All substitutes of primary, best first, ignoring inventory."""
+        return self._rows(self.primaries, self.index.get(primary))
+
+    def ranked_desperate(self, coarse: str) -> list:
+        return self._rows(self.desperate, self.coarse_index.get(coarse))
+
+    def _rows(self, table: dict, key: Optional[int]) -> list:
+        if key is None:
+            return []
+        start, end = table["offsets"][key], table["offsets"][key + 1]
+        return [
+            {"commodity": self.commodity_ids[table["substitutes"][j]],
+             "efficiency": float(table["efficiency"][j]),
+             "distance": float(table["distance"][j]),
+             "category": table["category"][j]}
+            for j in range(start, end)
+        ]
+
+    def best(self, primary: str) -> Optional[tuple]:
+        """Best substitute in stock for an unfatigued character: (commodity, efficiency, distance)."""
+        return self._best(self.primaries, self._memo, self.index.get(primary))
+
+    def best_desperate(self, coarse: str) -> Optional[tuple]:
+        """Best desperation substitute in stock for a coarse dimension."""
+        return self._best(self.desperate, self._desperate_memo, self.coarse_index.get(coarse))
+
+    def _best(self, table: dict, memo: dict, key: Optional[int]) -> Optional[tuple]:
+        if key is None:
+            return None
+        if key in memo:
+            return memo[key]
+        result = None
+        if table["masks"][key] & self._available:
+            available = self._available
+            for j in range(table["offsets"][key], table["offsets"][key + 1]):
+                s = int(table["substitutes"][j])
+                if (available >> s) & 1:
+                    result = (self.commodity_ids[s], float(table["efficiency"][j]), float(table["distance"][j]))
+                    break
+        memo[key] = result
+        return result
+
+    def best_batch(self, primary: str, primary_multiplier: np.ndarray,
+                   substitute_multiplier: Optional[np.ndarray] = None,
+                   allowed: Optional[np.ndarray] = None) -> tuple:
+        """Best in-stock substitute of primary for N characters at once.
+
+        primary_multiplier: (N,) fatigue multiplier of the primary.
+        substitute_multiplier: (N, S) multipliers of primary's S ranked
+        substitutes (1.0 when omitted). allowed: (S,) or (N, S) mask for
+        quality/durable checks the caller has made.
+
+        Returns (commodity index or -1, score), both (N,).
+        """
+        p = self.index.get(primary)
+        pm = np.asarray(primary_multiplier, dtype=np.float32)
+        if p is None or not self.primaries["masks"][p] & self._available:
+            return np.full(pm.shape, -1, dtype=np.int32), np.zeros(pm.shape, dtype=np.float32)
+        table = self.primaries
+        start, end = table["offsets"][p], table["offsets"][p + 1]
+        subs = table["substitutes"][start:end]
+        eff = table["efficiency"][start:end]
+        dist = table["distance"][start:end]
+
+        boost = np.where(pm[:, None] < 1.0,
+                         1.0 + (1.0 - pm[:, None]) * (1.0 - dist[None, :]) * DISTANCE_BOOST_FACTOR, 1.0)
+        score = eff[None, :] * boost
+        if substitute_multiplier is not None:
+            score = score * substitute_multiplier
+        ok = np.array([(self._available >> int(s)) & 1 for s in subs], dtype=bool)[None, :]
+        if allowed is not None:
+            ok = ok & allowed
+        score = np.where(ok, score, 0.0).astype(np.float32)
+        # First maximum keeps the ranked order on ties, as the game's strict ">"
+        pick = score.argmax(axis=1)
+        best_score = np.take_along_axis(score, pick[:, None], axis=1)[:, 0]
+        chosen = np.where(best_score > 0, subs[pick], -1).astype(np.int32)
+        return chosen, best_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the compiled substitution graph")
+    parser.add_argument("commodity", help="Primary commodity (or coarse dimension with --desperate)")
+    parser.add_argument("--available", help="Comma-separated commodities in stock (default: all)")
+    parser.add_argument("--desperate", action="store_true", help="Look up desperation substitutes")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    args = parser.parse_args()
+
+    data_dir = resolve_data_dir(args.version)
+    graph = SubstitutionGraph.load(data_dir=data_dir)
+    print(f"📂 {data_dir.relative_to(REPO_ROOT)}/substitution_rules.json: {len(graph.commodity_ids)} commodities, "
+          f"{len(graph.primaries['substitutes'])} substitution edges")
+
+    if args.available is None:
+        graph.set_inventory({cid: 1 for cid in graph.commodity_ids})
+    else:
+        graph.set_inventory({cid.strip(): 1 for cid in args.available.split(",") if cid.strip()})
+
+    ranked = graph.ranked_desperate(args.commodity) if args.desperate else graph.ranked(args.commodity)
+    if not ranked:
+        print(f"❌ No substitutes for {args.commodity}")
+        return 1
+    stock = graph.available()
+    for rule in ranked:
+        mark = "✅" if stock[graph.index[rule["commodity"]]] else "  "
+        print(f"  {mark} {rule['commodity']:20s} efficiency {rule['efficiency']:.2f}  "
+              f"distance {rule['distance']:.2f}  ({rule['category']})")
+    best = graph.best_desperate(args.commodity) if args.desperate else graph.best(args.commodity)
+    print(f"Best available: {best[0] if best else 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
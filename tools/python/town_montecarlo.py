@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Starting Town Monte Carlo
+
+Plays every starting template forward offline for K days on every
+location, across many seeds, and reports how often each opening survives
+and how it fares. All runs are spread across a process pool.
+
+    town x location x difficulty x seed
+
+Towns are the specialty towns in data/starting_towns/starting_towns.json
+and, by id, the starter setups of data/<version>/starting_locations.json.
+A town brings its buildings (with recipes and assigned workers), citizens
+and starting inventory; the location brings its productionModifiers.
+
+Each day is 6 cycles (time slots). Per cycle:
+
+    1. production: every station with a recipe and at least one worker
+       advances by 50 s x modifier / productionTime while its inputs are
+       in stock (AlphaWorld:UpdateBuildingProduction); on completion the
+       inputs are consumed and the outputs added to the town inventory
+    2. consumption: the citizens' cravings are served from the same
+       inventory by the consumption simulator (consumption_sim.py)
+
+Production is deterministic; the seed draws the citizens' traits and
+starting satisfaction and the emigration rolls.
+
+A run survives if it still has at least --survival-share of its starting
+population after the last day. The summary prints, per town and
+location, the survival rate and mean satisfaction and shortage counts
+with 95% confidence intervals across seeds; --output also writes one row
+per run (.npz, .csv or .json).
+
+Usage:
+    python tools/python/town_montecarlo.py
+    python tools/python/town_montecarlo.py --days 30 --seeds 50 --towns vada_pav_mumbai,poha_indore
+    python tools/python/town_montecarlo.py --towns all --locations river_valley,mining_hills \\
+        --difficulties easy,hard --workers 8 --output towns.csv
+
+Requires NumPy.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from consumption_sim import (
+    DIFFICULTY_SETTINGS,
+    PRIORITY_MODES,
+    CravingData,
+    History,
+    Policy,
+    Population,
+    Simulation,
+)
+from game_data import REPO_ROOT, load_path, resolve_data_dir
+
+STARTING_TOWNS = REPO_ROOT / "data" / "starting_towns" / "starting_towns.json"
+
+CYCLES_PER_DAY = 6
+# Production seconds per time slot at 1x (300 s per day)
+SECONDS_PER_CYCLE = 300 / CYCLES_PER_DAY
+
+# A building's primary work category (first listed) -> productionModifiers key
+MODIFIER_KEYS = {
+    "Agriculture": "farming",
+    "Horticulture": "farming",
+    "Animal Husbandry": "animal_husbandry",
+    "Mining": "mining",
+    "Forestry": "lumber",
+    "Lumber Processing": "lumber",
+    "Woodworking": "woodworking",
+    "Hunting": "hunting",
+}
+
+# Two-sided 95% Student t quantiles by degrees of freedom; 1.96 beyond 30
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+# Per-process state, filled by _init_worker
+_WORKER = {}
+
+
+def load_templates(data_dir: Path) -> dict:
+    """Specialty towns and location starter setups as {id: template}.
+
+    A template lists its buildings as {typeId, recipe, workers}, with
+    recipe None for housing or when no recipe applies, plus citizen
+    classes, starting inventory and initial population.
+    """
+    recipes = load_path(data_dir / "building_recipes.json").get("recipes", [])
+    by_name = {(r["buildingType"], r["recipeName"]): r for r in recipes}
+    first = {}
+    for r in recipes:
+        first.setdefault(r["buildingType"], r)
+
+    def buildings(entries: list, citizens: list, named: bool) -> list:
+        result = []
+        for config in entries:
+            if named:
+                recipe = by_name.get((config["typeId"], config.get("recipeName")))
+            else:
+                # autoAssignRecipe takes the first recipe for the building type
+                recipe = first.get(config["typeId"]) if config.get("autoAssignRecipe") else None
+            result.append({"typeId": config["typeId"], "recipe": recipe, "workers": 0})
+        for citizen in citizens:
+            index = citizen.get("workplaceIndex")
+            if index is not None and 0 <= index < len(result):
+                result[index]["workers"] += 1
+        return result
+
+    templates = {}
+    if STARTING_TOWNS.exists():
+        for town in load_path(STARTING_TOWNS).get("towns", []):
+            citizens = town.get("starterCitizens", [])
+            templates[town["id"]] = {
+                "id": town["id"],
+                "buildings": buildings(town.get("starterBuildings", []), citizens, True),
+                "classes": [c.get("class", "middle") for c in citizens],
+                "inventory": {i["commodityId"]: i["quantity"] for i in town.get("starterInventory", [])},
+                "population": (town.get("population") or {}).get("initialCount", len(citizens)),
+                "class_shares": None,
+            }
+    locations = load_path(data_dir / "starting_locations.json").get("locations", [])
+    for location in locations:
+        citizens = location.get("starterCitizens", [])
+        population = location.get("population") or {}
+        templates[location["id"]] = {
+            "id": location["id"],
+            "buildings": buildings(location.get("starterBuildings", []), citizens, False),
+            "classes": [c.get("class", "middle") for c in citizens],
+            "inventory": {i["commodityId"]: i["quantity"] for i in location.get("starterResources", [])},
+            "population": population.get("initialCount", len(citizens)),
+            "class_shares": population.get("classDistribution") or None,
+        }
+    return templates
+
+
+def load_modifiers(data_dir: Path) -> dict:
+    """{location id: productionModifiers}."""
+    locations = load_path(data_dir / "starting_locations.json").get("locations", [])
+    return {loc["id"]: loc.get("productionModifiers") or {} for loc in locations}
+
+
+def building_modifier(building_type: dict, modifiers: dict) -> float:
+    for category in building_type.get("workCategories", []):
+        key = MODIFIER_KEYS.get(category)
+        if key is not None:
+            return modifiers.get(key, 1.0)
+    return 1.0
+
+
+class Town:
+    """Production stations and inventory of one run.
+
+    The inventory array starts with the craving data's commodities so the
+    consumption simulator can share its first M entries as a view.
+    """
+
+    def __init__(self, data: CravingData, template: dict, modifiers: dict, building_types: dict):
+        self.ids = list(data.commodity_ids)
+        index = {cid: i for i, cid in enumerate(self.ids)}
+
+        def column(cid: str) -> int:
+            if cid not in index:
+                index[cid] = len(self.ids)
+                self.ids.append(cid)
+            return index[cid]
+
+        stations = []
+        for building in template["buildings"]:
+            recipe = building["recipe"]
+            if recipe is None:
+                continue
+            rate = SECONDS_PER_CYCLE * building_modifier(building_types.get(building["typeId"], {}), modifiers)
+            stations.append((
+                [(column(c), q) for c, q in (recipe.get("inputs") or {}).items()],
+                [(column(c), q) for c, q in (recipe.get("outputs") or {}).items()],
+                rate / (recipe.get("productionTime") or 10),
+                building["workers"] > 0,
+            ))
+        for cid in template["inventory"]:
+            column(cid)
+
+        self.stations = stations
+        self.progress = np.zeros(len(stations))
+        self.inventory = np.zeros(len(self.ids))
+        for cid, quantity in template["inventory"].items():
+            self.inventory[index[cid]] += quantity
+        self.index = index
+        # Commodities the town starts with or produces
+        self.tracked = np.array(sorted({index[cid] for cid in template["inventory"]} |
+                                       {c for _, outputs, _, _ in stations for c, _ in outputs}), dtype=int)
+
+    def produce(self) -> tuple:
+        """Advance one cycle. Returns (completions, no-material stations, no-worker stations)."""
+        inventory = self.inventory
+        completed = blocked = idle = 0
+        for s, (inputs, outputs, rate, staffed) in enumerate(self.stations):
+            if not staffed:
+                idle += 1
+                continue
+            if any(inventory[c] < q for c, q in inputs):
+                blocked += 1
+                continue
+            self.progress[s] += rate
+            # Short recipes can finish more than once per slot
+            while self.progress[s] >= 1 and all(inventory[c] >= q for c, q in inputs):
+                self.progress[s] -= 1
+                for c, q in inputs:
+                    inventory[c] -= q
+                for c, q in outputs:
+                    inventory[c] += q
+                completed += 1
+        return completed, blocked, idle
+
+
+def _init_worker(data_dir: str, templates: dict, modifiers: dict):
+    data_dir = Path(data_dir)
+    _WORKER["data"] = CravingData(data_dir)
+    _WORKER["templates"] = templates
+    _WORKER["modifiers"] = modifiers
+    types = load_path(data_dir / "building_types.json").get("buildingTypes", [])
+    _WORKER["building_types"] = {t["id"]: t for t in types}
+
+
+def run_town(config: dict, days: int, survival_share: float, policy: dict) -> dict:
+    """Simulate one (town, location, difficulty, seed) in a worker and return its result row."""
+    start = time.perf_counter()
+    data = _WORKER["data"]
+    template = _WORKER["templates"][config["town"]]
+    town = Town(data, template, _WORKER["modifiers"][config["location"]], _WORKER["building_types"])
+
+    population = Population.generate(data, max(template["population"], len(template["classes"])),
+                                     seed=config["seed"], class_shares=template["class_shares"],
+                                     classes=template["classes"])
+    M = len(data.commodity_ids)
+    sim = Simulation(data, population, Policy(**policy), np.zeros(M), config["difficulty"])
+    # Consumption draws straight from the town inventory
+    sim.inventory = town.inventory[:M]
+
+    initial = len(population)
+    threshold = survival_share * initial
+    completions = blocked = idle = unmet = fulfilled = 0
+    collapse_day = None
+    mean_satisfaction = []
+    for day in range(1, days + 1):
+        for _ in range(CYCLES_PER_DAY):
+            done, no_materials, no_worker = town.produce()
+            completions += done
+            blocked += no_materials
+            idle += no_worker
+            metrics = sim.step()
+            unmet += metrics["unmet_cravings"]
+            fulfilled += metrics["fulfilled_cravings"]
+            mean_satisfaction.append(metrics["mean_satisfaction"])
+        if collapse_day is None and metrics["population"] < threshold:
+            collapse_day = day
+
+    row = dict(config)
+    row["initial_population"] = initial
+    row["population"] = int(metrics["population"])
+    row["survived"] = int(metrics["population"] >= threshold)
+    row["collapse_day"] = collapse_day if collapse_day is not None else -1
+    row["mean_satisfaction"] = float(metrics["mean_satisfaction"])
+    row["min_satisfaction"] = float(metrics["min_satisfaction"])
+    row["avg_mean_satisfaction"] = float(np.mean(mean_satisfaction))
+    row["unmet_cravings"] = int(unmet)
+    row["fulfilled_cravings"] = int(fulfilled)
+    row["completions"] = int(completions)
+    row["blocked_no_materials"] = int(blocked)
+    row["blocked_no_worker"] = int(idle)
+    # Commodities the town started with or produces that ran out
+    row["stockouts"] = int((town.inventory[town.tracked] < 1).sum())
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+def mean_ci(values: list) -> tuple:
+    """Mean and half-width of its 95% confidence interval (t distribution)."""
+    n = len(values)
+    if n == 0:
+        return float("nan"), float("nan")
+    mean = sum(values) / n
+    if n == 1:
+        return mean, float("nan")
+    sd = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+    t = _T95[n - 2] if n - 1 <= len(_T95) else 1.96
+    return mean, t * sd / math.sqrt(n)
+
+
+def summarize(rows: list) -> list:
+    """One summary per (town, location, difficulty) across seeds."""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["town"], row["location"], row["difficulty"]), []).append(row)
+    summary = []
+    for (town, location, difficulty), group in groups.items():
+        entry = {"town": town, "location": location, "difficulty": difficulty, "runs": len(group)}
+        for key in ("survived", "mean_satisfaction", "unmet_cravings", "blocked_no_materials", "stockouts"):
+            entry[key], entry[f"{key}_ci"] = mean_ci([r[key] for r in group])
+        summary.append(entry)
+    return summary
+
+
+def build_grid(towns: list, locations: list, difficulties: list, seeds: list) -> list:
+    return [
+        {"town": town, "location": location, "difficulty": difficulty, "seed": seed}
+        for town, location, difficulty, seed in itertools.product(towns, locations, difficulties, seeds)
+    ]
+
+
+def _id_list(text: str) -> list:
+    return [v.strip() for v in text.split(",") if v.strip()]
+
+
+def _check_ids(names: list, known, kind: str) -> Optional[str]:
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        return f"Unknown {kind}: {', '.join(unknown)} (known: {', '.join(known)})"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel Monte Carlo runs of starting towns")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: active)")
+    parser.add_argument("--towns", default="specialty",
+                        help="Comma-separated town ids, 'specialty' (default) or 'all' "
+                             "(specialty towns plus location starter setups)")
+    parser.add_argument("--locations", default="all", help="Comma-separated location ids or 'all'")
+    parser.add_argument("--difficulties", type=_id_list, default=["normal"],
+                        help="Comma-separated difficulty settings")
+    parser.add_argument("--seeds", type=int, default=20, help="Seeds per combination")
+    parser.add_argument("--days", type=int, default=30, help="Days to simulate")
+    parser.add_argument("--survival-share", type=float, default=0.5,
+                        help="Share of the starting population a surviving town keeps")
+    parser.add_argument("--priority-mode", choices=PRIORITY_MODES, default="need_based")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--output", type=Path, help="Write per-run results (.npz, .csv or .json)")
+    args = parser.parse_args()
+
+    data_dir = resolve_data_dir(args.version)
+    templates = load_templates(data_dir)
+    modifiers = load_modifiers(data_dir)
+    specialty = [t for t in templates if t not in modifiers]
+    if args.towns == "specialty":
+        towns = specialty
+    elif args.towns == "all":
+        towns = list(templates)
+    else:
+        towns = _id_list(args.towns)
+    locations = list(modifiers) if args.locations == "all" else _id_list(args.locations)
+    for error in (_check_ids(towns, list(templates), "town"),
+                  _check_ids(locations, list(modifiers), "location"),
+                  _check_ids(args.difficulties, sorted(DIFFICULTY_SETTINGS), "difficulty")):
+        if error:
+            print(f"❌ {error}")
+            return 1
+
+    grid = build_grid(towns, locations, args.difficulties, list(range(args.seeds)))
+    policy = {"priority_mode": args.priority_mode}
+    print(f"📂 Data: {data_dir.relative_to(REPO_ROOT)}")
+    print(f"🏘️  {len(towns)} towns x {len(locations)} locations x {len(args.difficulties)} difficulties "
+          f"x {args.seeds} seeds = {len(grid)} runs of {args.days} days on {args.workers} workers")
+
+    start = time.perf_counter()
+    rows: list[Optional[dict]] = [None] * len(grid)
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(str(data_dir), templates, modifiers),
+    ) as pool:
+        futures = {
+            pool.submit(run_town, config, args.days, args.survival_share, policy): i
+            for i, config in enumerate(grid)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            rows[futures[future]] = future.result()
+            if done % max(1, len(grid) // 20) == 0 or done == len(grid):
+                print(f"  {done}/{len(grid)} done ({time.perf_counter() - start:.1f}s)")
+
+    # Rows stay in grid order regardless of completion order
+    if args.output:
+        results = History()
+        for row in rows:
+            results.append(row)
+        results.save(args.output)
+
+    print(f"\n✅ {len(grid)} runs finished in {time.perf_counter() - start:.1f}s (mean ± 95% CI)")
+    print(f"   {'town':20s} {'location':15s} {'difficulty':10s} {'survival':>15s} "
+          f"{'satisfaction':>17s} {'unmet/day':>15s} {'no-material':>15s}")
+    for entry in summarize(rows):
+        per_day = args.days or 1
+        print(f"   {entry['town']:20s} {entry['location']:15s} {entry['difficulty']:10s} "
+              f"{entry['survived'] * 100:6.1f}% ±{entry['survived_ci'] * 100:5.1f} "
+              f"{entry['mean_satisfaction']:8.2f} ±{entry['mean_satisfaction_ci']:6.2f} "
+              f"{entry['unmet_cravings'] / per_day:7.1f} ±{entry['unmet_cravings_ci'] / per_day:5.1f} "
+              f"{entry['blocked_no_materials']:7.1f} ±{entry['blocked_no_materials_ci']:5.1f}")
+    if args.output:
+        print(f"💾 Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
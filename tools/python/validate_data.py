@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Game Data Validator
+
+Checks every data version's JSON files before the game (DataLoader.lua)
+trips over them at runtime:
+
+- schemas for building_types.json (upgradeLevels, housingConfig), the
+  recipes, commodities, units, substitution rules and the craving system
+  files, compiled once into nested check functions
+- cross-references: recipe buildings and commodities, work categories,
+  housing classes and quality tiers, fulfillment vector dimensions,
+  parent dimensions, substitutes - each a lookup in an id set built
+  once per version
+- vector lengths against dimension_definitions.json (trait multipliers,
+  class base cravings, enablement modifiers, coarse fulfillment vectors)
+
+Errors are what the game cannot load or index (missing files or fields,
+wrong types, duplicate ids, non-positive production times, vectors
+longer than the dimension count). Warnings are what it tolerates with a
+default (unknown ids, short vectors filled with 1.0 or 0, null entries
+in the fine craving vectors CharacterV3 reads the same way); --strict
+counts them as errors. Files are read through game_data, so a tool that
+validates after saving only re-parses what changed.
+
+Usage:
+    python tools/python/validate_data.py                   # every version
+    python tools/python/validate_data.py --version alpha --strict
+    python tools/python/validate_data.py --quiet           # summary only
+
+Exit code 1 if any version has errors.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from game_data import REPO_ROOT, load_path, resolve_data_dir, version_ids
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Report:
+    """Issues found in one version."""
+
+    def __init__(self):
+        self.issues = []
+
+    def add(self, severity: str, path: str, message: str):
+        self.issues.append((severity, path, message))
+
+    def count(self, severity: str) -> int:
+        return sum(1 for issue in self.issues if issue[0] == severity)
+
+
+class Context:
+    """Id sets and dimension counts the compiled checks look up."""
+
+    def __init__(self, report: Report):
+        self.report = report
+        self.ids = {}        # kind -> set of ids; a missing kind skips its references
+        self.lengths = {}    # "fine"/"coarse" -> dimension count
+
+
+# -- schema nodes ----------------------------------------------------------------
+
+class Obj:
+    def __init__(self, required: Optional[dict] = None, optional: Optional[dict] = None):
+        self.required = required or {}
+        self.optional = optional or {}
+
+
+class List:
+    """A list of item; length compares to a dimension count; unique names an id field."""
+
+    def __init__(self, item="any", length: Optional[str] = None, unique: Optional[str] = None):
+        self.item = item
+        self.length = length
+        self.unique = unique
+
+
+class Map:
+    """A dict of value; keys may reference an id kind. Keys starting with "_" are notes."""
+
+    def __init__(self, value="any", keys: Optional[str] = None):
+        self.value = value
+        self.keys = keys
+
+
+class Ref:
+    """A string id that should exist in ctx.ids[kind]."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+
+class Nullable:
+    def __init__(self, node):
+        self.node = node
+
+
+class Defaulted:
+    """node, or null - which the game reads as default, so only a warning."""
+
+    def __init__(self, node, default):
+        self.node = node
+        self.default = default
+
+
+class Positive:
+    """A number > 0 (>= 0 with zero=True)."""
+
+    def __init__(self, zero: bool = False):
+        self.zero = zero
+
+
+Check = Callable[[object, str, Context], None]
+
+_TYPES = {
+    "str": (lambda v: isinstance(v, str), "a string"),
+    "int": (lambda v: isinstance(v, int) and not isinstance(v, bool), "an integer"),
+    "num": (lambda v: isinstance(v, (int, float)) and not isinstance(v, bool), "a number"),
+    "bool": (lambda v: isinstance(v, bool), "true/false"),
+    "list": (lambda v: isinstance(v, list), "a list"),
+    "dict": (lambda v: isinstance(v, dict), "an object"),
+}
+
+
+def compile_schema(node) -> Check:
+    """Turn a schema node into a check(value, path, ctx) function."""
+    if node == "any":
+        return lambda value, path, ctx: None
+
+    if isinstance(node, str):
+        test, expected = _TYPES[node]
+
+        def check_type(value, path, ctx):
+            if not test(value):
+                ctx.report.add(ERROR, path, f"expected {expected}, got {type(value).__name__}")
+        return check_type
+
+    if isinstance(node, Positive):
+        is_number = _TYPES["num"][0]
+        zero = node.zero
+
+        def check_positive(value, path, ctx):
+            if not is_number(value):
+                ctx.report.add(ERROR, path, f"expected a number, got {type(value).__name__}")
+            elif value < 0 or (value == 0 and not zero):
+                ctx.report.add(ERROR, path, f"must be {'>= 0' if zero else '> 0'}, got {value}")
+        return check_positive
+
+    if isinstance(node, Ref):
+        kind = node.kind
+
+        def check_ref(value, path, ctx):
+            if not isinstance(value, str):
+                ctx.report.add(ERROR, path, f"expected a {kind} id, got {type(value).__name__}")
+                return
+            known = ctx.ids.get(kind)
+            if known is not None and value not in known:
+                ctx.report.add(WARNING, path, f"unknown {kind} '{value}'")
+        return check_ref
+
+    if isinstance(node, Nullable):
+        inner = compile_schema(node.node)
+        return lambda value, path, ctx: None if value is None else inner(value, path, ctx)
+
+    if isinstance(node, Defaulted):
+        inner = compile_schema(node.node)
+        default = node.default
+
+        def check_defaulted(value, path, ctx):
+            if value is None:
+                ctx.report.add(WARNING, path, f"null, read as {default}")
+            else:
+                inner(value, path, ctx)
+        return check_defaulted
+
+    if isinstance(node, Obj):
+        required = [(key, compile_schema(sub)) for key, sub in node.required.items()]
+        optional = [(key, compile_schema(sub)) for key, sub in node.optional.items()]
+
+        def check_obj(value, path, ctx):
+            if not isinstance(value, dict):
+                ctx.report.add(ERROR, path, f"expected an object, got {type(value).__name__}")
+                return
+            for key, check in required:
+                if key in value:
+                    check(value[key], f"{path}.{key}", ctx)
+                else:
+                    ctx.report.add(ERROR, path, f"missing '{key}'")
+            for key, check in optional:
+                if key in value:
+                    check(value[key], f"{path}.{key}", ctx)
+        return check_obj
+
+    if isinstance(node, List):
+        item = compile_schema(node.item)
+        length, unique = node.length, node.unique
+
+        def check_list(value, path, ctx):
+            if not isinstance(value, list):
+                ctx.report.add(ERROR, path, f"expected a list, got {type(value).__name__}")
+                return
+            expected = ctx.lengths.get(length) if length else None
+            if expected is not None and len(value) != expected:
+                severity = ERROR if len(value) > expected else WARNING
+                ctx.report.add(severity, path, f"has {len(value)} entries, expected {expected} ({length} dimensions)")
+            seen = set()
+            for i, entry in enumerate(value):
+                # Entries with an id are named by it (buildingTypes[farm])
+                label = entry["id"] if isinstance(entry, dict) and isinstance(entry.get("id"), str) else i
+                item(entry, f"{path}[{label}]", ctx)
+                if unique and isinstance(entry, dict) and unique in entry:
+                    if entry[unique] in seen:
+                        ctx.report.add(ERROR, f"{path}[{i}]", f"duplicate {unique} '{entry[unique]}'")
+                    seen.add(entry[unique])
+        return check_list
+
+    if isinstance(node, Map):
+        value_check = compile_schema(node.value)
+        key_check = compile_schema(Ref(node.keys)) if node.keys else None
+
+        def check_map(value, path, ctx):
+            if not isinstance(value, dict):
+                ctx.report.add(ERROR, path, f"expected an object, got {type(value).__name__}")
+                return
+            for key, entry in value.items():
+                if key.startswith("_"):
+                    continue
+                sub = f"{path}.{key}"
+                if key_check is not None:
+                    key_check(key, sub, ctx)
+                value_check(entry, sub, ctx)
+        return check_map
+
+    raise TypeError(f"Unknown schema node: {node!r}")
+
+
+# -- schemas ---------------------------------------------------------------------
+
+QUANTITIES = Map(Positive(zero=True), keys="commodity")
+
+UPGRADE_LEVEL = Obj(
+    required={"level": "int", "stations": Positive(zero=True), "width": Positive(), "height": Positive()},
+    optional={"name": "str", "capacity": Positive(zero=True),
+              "constructionMaterials": QUANTITIES, "upgradeMaterials": QUANTITIES,
+              "storage": Map(Positive(zero=True))},
+)
+
+HOUSING_CONFIG = Obj(
+    required={"housingQuality": "num", "targetClasses": List(Ref("class")),
+              "acceptableClasses": List(Ref("class"))},
+    optional={"qualityTier": Ref("quality_tier"), "rentPerOccupant": Positive(zero=True),
+              "occupancyType": "str", "upgradeableTo": Nullable(Ref("building")),
+              "upgradeCost": Map(Positive(zero=True)), "unitsCount": Positive()},
+)
+
+BUILDING_TYPES = Obj(required={"buildingTypes": List(Obj(
+    required={"id": "str", "name": "str", "category": "str", "upgradeLevels": List(UPGRADE_LEVEL)},
+    optional={"label": "str", "color": List("num"), "workCategories": List(Ref("work_category")),
+              "workerEfficiency": Nullable(Map("num", keys="work_category")),
+              "housingConfig": HOUSING_CONFIG, "constructionCost": QUANTITIES,
+              "placementConstraints": Nullable("dict")},
+), unique="id")})
+
+RECIPES = Obj(required={"recipes": List(Obj(
+    required={"buildingType": Ref("building"), "recipeName": "str", "productionTime": Positive(),
+              "inputs": QUANTITIES, "outputs": QUANTITIES},
+    optional={"name": "str", "category": "str", "notes": "str"},
+))})
+
+COMMODITIES = Obj(required={"commodities": List(Obj(
+    required={"id": "str", "name": "str", "category": Ref("commodity_category")},
+    optional={"stackSize": Positive(), "baseValue": Positive(zero=True), "isRaw": "bool",
+              "quality": Ref("quality_tier"), "icon": "str", "description": "str"},
+), unique="id")})
+
+COMMODITY_CATEGORIES = Obj(required={"categories": List(Obj(required={"id": "str", "name": "str"}), unique="id")})
+
+WORK_CATEGORIES = Obj(required={"workCategories": List(Obj(required={"id": "str", "name": "str"}), unique="id")})
+
+UNITS = Obj(
+    required={"baseUnits": Map(Obj(required={"base": "str"}, optional={"display": List("str"),
+                                                                       "conversions": Map("num")})),
+              "commodityUnits": Map(Obj(required={"unit": "str"}), keys="commodity")},
+    optional={"personDayBaseline": Map("any")},
+)
+
+SUBSTITUTES = List(Obj(required={"commodity": Ref("commodity"), "efficiency": Positive()},
+                       optional={"distance": Positive(zero=True)}))
+
+SUBSTITUTION_RULES = Obj(
+    required={"substitutionHierarchies": Map(Map(Obj(optional={"substitutes": SUBSTITUTES}),
+                                                 keys="commodity"))},
+    optional={"desperationSubstitution": Obj(
+        optional={"enabled": "bool", "criticalThreshold": "num",
+                  "rules": Map(Obj(optional={"desperateSubstitutes": SUBSTITUTES}), keys="coarse")})},
+)
+
+DIMENSIONS = Obj(required={
+    "coarseDimensions": List(Obj(required={"id": "str", "index": "int", "name": "str"}), unique="id"),
+    "fineDimensions": List(Obj(required={"id": "str", "index": "int", "parentCoarse": Ref("coarse")},
+                               optional={"aggregationWeight": "num"}), unique="id"),
+})
+
+CHARACTER_CLASSES = Obj(required={"classes": List(Obj(
+    required={"id": "str", "name": "str",
+              "baseCravingVector": Obj(required={"fine": List(Defaulted("num", 0), length="fine")},
+                                       optional={"coarse": List("num", length="coarse")})},
+    optional={"allocationPriority": "int", "thresholds": Map("num"),
+              "acceptedQualityTiers": List(Ref("quality_tier")),
+              "rejectedQualityTiers": List(Ref("quality_tier"))},
+), unique="id")})
+
+CHARACTER_TRAITS = Obj(required={"traits": List(Obj(
+    required={"id": "str", "name": "str"},
+    optional={"cravingMultipliers": Obj(optional={"fine": List(Defaulted("num", 1.0), length="fine"),
+                                                  "coarse": List("num", length="coarse")})},
+), unique="id")})
+
+FULFILLMENT_VECTOR = Obj(optional={"fine": Map("num", keys="fine"), "coarse": List("num", length="coarse")})
+
+FULFILLMENT_VECTORS = Obj(
+    required={"commodities": Map(Obj(required={"fulfillmentVector": FULFILLMENT_VECTOR},
+                                     optional={"tags": List("str"), "durability": "str",
+                                               "qualityMultipliers": Map("num", keys="quality_tier")}),
+                                 keys="commodity")},
+    optional={"buildings": Map(Obj(optional={"fulfillmentVector": FULFILLMENT_VECTOR}), keys="building")},
+)
+
+FATIGUE_RATES = Obj(
+    required={"commodities": Map(Obj(required={"baseFatigueRate": "num"},
+                                      optional={"fatigueModifiers": Map("num", keys="trait")}),
+                                 keys="commodity")},
+    optional={"defaultFatigueRate": "num", "categoryDefaults": Map("num")},
+)
+
+ENABLEMENT_RULES = Obj(required={"rules": List(Obj(
+    required={"id": "str", "trigger": "dict", "effect": Obj(optional={"cravingModifier": Obj(
+        optional={"fine": List("num", length="fine"), "coarse": List("num", length="coarse")})})},
+), unique="id")})
+
+QUALITY_TIERS = Obj(required={"tiers": List(Obj(required={"id": "str", "order": "int"},
+                                                optional={"defaultMultiplier": "num"}), unique="id")})
+
+# (file, schema, required); compiled once at import
+FILES = [(name, compile_schema(schema), required) for name, schema, required in (
+    ("commodity_categories.json", COMMODITY_CATEGORIES, False),
+    ("commodities.json", COMMODITIES, True),
+    ("work_categories.json", WORK_CATEGORIES, False),
+    ("building_types.json", BUILDING_TYPES, True),
+    ("building_recipes.json", RECIPES, True),
+    ("units.json", UNITS, False),
+    ("substitution_rules.json", SUBSTITUTION_RULES, False),
+    ("craving_system/dimension_definitions.json", DIMENSIONS, True),
+    ("craving_system/quality_tiers.json", QUALITY_TIERS, False),
+    ("craving_system/character_classes.json", CHARACTER_CLASSES, True),
+    ("craving_system/character_traits.json", CHARACTER_TRAITS, True),
+    ("craving_system/fulfillment_vectors.json", FULFILLMENT_VECTORS, True),
+    ("craving_system/commodity_fatigue_rates.json", FATIGUE_RATES, False),
+    ("craving_system/enablement_rules.json", ENABLEMENT_RULES, False),
+)]
+
+# id kind -> (file, list key, fields whose values are accepted as ids)
+ID_TABLES = {
+    "commodity": ("commodities.json", "commodities", ("id",)),
+    "commodity_category": ("commodity_categories.json", "categories", ("id",)),
+    # Buildings list their work categories by name
+    "work_category": ("work_categories.json", "workCategories", ("id", "name")),
+    "building": ("building_types.json", "buildingTypes", ("id",)),
+    "coarse": ("craving_system/dimension_definitions.json", "coarseDimensions", ("id",)),
+    "fine": ("craving_system/dimension_definitions.json", "fineDimensions", ("id",)),
+    "class": ("craving_system/character_classes.json", "classes", ("id",)),
+    "trait": ("craving_system/character_traits.json", "traits", ("id",)),
+    "quality_tier": ("craving_system/quality_tiers.json", "tiers", ("id",)),
+}
+
+
+def _id_set(data: dict, key: str, fields: tuple) -> Optional[set]:
+    entries = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return None
+    return {entry[f] for entry in entries if isinstance(entry, dict) for f in fields
+            if isinstance(entry.get(f), str)}
+
+
+def _check_dimensions(data: dict, ctx: Context, path: str):
+    counts = data.get("dimensionCount") or {}
+    for kind in ("coarse", "fine"):
+        listed = ctx.lengths.get(kind)
+        if kind in counts and listed is not None and counts[kind] != listed:
+            ctx.report.add(ERROR, f"{path}.dimensionCount.{kind}",
+                           f"says {counts[kind]}, but {listed} {kind} dimensions are defined")
+
+
+def _check_fulfillment_ids(data: dict, ctx: Context, path: str):
+    for cid, entry in (data.get("commodities") or {}).items():
+        if isinstance(entry, dict) and "id" in entry and entry["id"] != cid:
+            ctx.report.add(ERROR, f"{path}.commodities.{cid}.id", f"'{entry['id']}' does not match its key")
+
+
+# Whole-file checks beyond the schema
+EXTRA_CHECKS = {
+    "craving_system/dimension_definitions.json": _check_dimensions,
+    "craving_system/fulfillment_vectors.json": _check_fulfillment_ids,
+}
+
+
+def validate_version(data_dir: Path) -> Report:
+    report = Report()
+    ctx = Context(report)
+    loaded = {}
+    for name, _, required in FILES:
+        path = data_dir / name
+        if not path.exists():
+            if required:
+                report.add(ERROR, name, "file is missing")
+            continue
+        try:
+            loaded[name] = load_path(path)
+        except ValueError as e:
+            report.add(ERROR, name, f"invalid JSON: {e}")
+
+    for kind, (name, key, fields) in ID_TABLES.items():
+        if name in loaded:
+            ids = _id_set(loaded[name], key, fields)
+            if ids is not None:
+                ctx.ids[kind] = ids
+    for kind in ("coarse", "fine"):
+        dims = loaded.get("craving_system/dimension_definitions.json", {})
+        entries = dims.get(f"{kind}Dimensions") if isinstance(dims, dict) else None
+        if isinstance(entries, list):
+            ctx.lengths[kind] = len(entries)
+
+    for name, check, _ in FILES:
+        if name in loaded:
+            check(loaded[name], name, ctx)
+            if name in EXTRA_CHECKS and isinstance(loaded[name], dict):
+                EXTRA_CHECKS[name](loaded[name], ctx, name)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate game data files against their schemas")
+    parser.add_argument("--version", help="Data version from data/versions.json (default: all)")
+    parser.add_argument("--strict", action="store_true", help="Count warnings as errors")
+    parser.add_argument("--quiet", action="store_true", help="Only print the per-version summary")
+    parser.add_argument("--limit", type=int, default=50, help="Issues shown per version (default: 50)")
+    args = parser.parse_args()
+
+    failed = False
+    for version in [args.version] if args.version else version_ids():
+        start = time.perf_counter()
+        data_dir = resolve_data_dir(version)
+        report = validate_version(data_dir)
+        elapsed = (time.perf_counter() - start) * 1000
+        if args.strict:
+            report.issues = [(ERROR, path, message) for _, path, message in report.issues]
+        errors, warnings = report.count(ERROR), report.count(WARNING)
+        failed |= errors > 0
+        mark = "❌" if errors else ("⚠️ " if warnings else "✅")
+        print(f"{mark} {data_dir.relative_to(REPO_ROOT)}: {errors} errors, {warnings} warnings ({elapsed:.0f} ms)")
+        if args.quiet:
+            continue
+        shown = sorted(report.issues, key=lambda issue: issue[0] != ERROR)[:args.limit]
+        for severity, path, message in shown:
+            print(f"   {'E' if severity == ERROR else 'W'} {path}: {message}")
+        if len(report.issues) > args.limit:
+            print(f"   ... and {len(report.issues) - args.limit} more")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())